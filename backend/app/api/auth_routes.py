@@ -3,7 +3,8 @@
 import os
 import logging
 from fastapi import APIRouter, Request, HTTPException, status
-import httpx
+
+from app import http_client
 
 auth_router = APIRouter(prefix="/auth")
 
@@ -53,18 +54,17 @@ async def refresh_token(request: Request):
         }
 
         # Make the token request to Dex
-        async with httpx.AsyncClient() as client:
-            response = await client.post(token_url, data=data)
+        response = await http_client.request("POST", token_url, data=data)
 
-            if response.status_code != 200:
-                logging.error(f"Failed to refresh token: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Failed to refresh token",
-                )
+        if response.status_code != 200:
+            logging.error(f"Failed to refresh token: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Failed to refresh token",
+            )
 
-            # Return the new tokens
-            return response.json()
+        # Return the new tokens
+        return response.json()
     except Exception as e:
         logging.error(f"Token refresh error: {str(e)}")
         raise HTTPException(
@@ -0,0 +1,196 @@
+import logging
+import os
+from datetime import date
+
+from fastapi import APIRouter, HTTPException
+
+from app.data_version import bump_data_version
+from app.database import get_db_connection
+from app.models import ChoreBatch
+from app.utils import log_actions
+
+router = APIRouter()
+
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "500"))
+
+CHORE_STATE_COLUMNS = (
+    "id", "name", "interval_days", "due_date", "done", "done_by", "archived", "owner_email", "is_private", "last_done",
+)
+
+# Taking every row lock up front, in id order, means two concurrent batches
+# cannot deadlock, and it tells us which chores exist in the same round trip
+LOCK_CHORES_SQL = "SELECT id FROM chores WHERE id = ANY(%(ids)s) ORDER BY id FOR UPDATE"
+
+SET_ARCHIVED_SQL = """
+    UPDATE chores c
+    SET archived = %(archived)s
+    FROM unnest(%(ids)s::int[]) AS t(id)
+    WHERE c.id = t.id
+"""
+
+# Set-based version of routes.MARK_DONE_SQL; rows are already locked
+BATCH_MARK_DONE_SQL = """
+    UPDATE chores c
+    SET done = TRUE,
+        done_by = previous.new_done_by,
+        due_date = %(today)s::date + c.interval_days,
+        last_done = %(today)s
+    FROM (
+        SELECT ch.id, ch.due_date, ch.last_done, t.done_by AS new_done_by
+        FROM chores ch
+        JOIN unnest(%(ids)s::int[], %(done_by)s::text[]) AS t(id, done_by) ON ch.id = t.id
+    ) previous
+    WHERE c.id = previous.id
+      AND c.last_done IS DISTINCT FROM %(today)s::date
+    RETURNING c.id, c.due_date, previous.due_date, previous.last_done
+"""
+
+BATCH_UPDATE_SQL = f"""
+    UPDATE chores c
+    SET name = previous.new_name,
+        interval_days = previous.new_interval_days,
+        due_date = previous.new_due_date
+    FROM (
+        SELECT {", ".join(f"ch.{column}" for column in CHORE_STATE_COLUMNS)},
+               t.name AS new_name, t.interval_days AS new_interval_days, t.due_date AS new_due_date
+        FROM chores ch
+        JOIN unnest(%(ids)s::int[], %(names)s::text[], %(interval_days)s::int[], %(due_dates)s::date[])
+            AS t(id, name, interval_days, due_date) ON ch.id = t.id
+    ) previous
+    WHERE c.id = previous.id
+    RETURNING {", ".join(f"previous.{column}" for column in CHORE_STATE_COLUMNS)}
+"""
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _validation_error(operation):
+    if operation.op == "mark_done" and not operation.done_by:
+        return "done_by is required"
+    if operation.op == "update":
+        if not operation.name or operation.interval_days is None or not operation.due_date:
+            return "name, interval_days and due_date are required"
+        try:
+            date.fromisoformat(operation.due_date)
+        except ValueError:
+            return "due_date must be an ISO date"
+    return None
+
+
+@router.post("/chores/batch")
+def batch_chores(batch: ChoreBatch):
+    """
+    Apply a list of mark_done, archive, unarchive and update operations in one
+    transaction.
+
+    Operations of the same kind run as a single set-based statement and all
+    audit rows are written with one INSERT. Each operation gets its own result
+    ("ok", "invalid", "not_found" or "conflict") in request order; a failing
+    operation does not stop the others. A chore may appear only once per batch,
+    since set-based statements do not preserve order between operations.
+    """
+    operations = batch.operations
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_OPERATIONS} operations per batch")
+
+    results = [
+        {"index": index, "op": operation.op, "chore_id": operation.chore_id, "status": "ok"}
+        for index, operation in enumerate(operations)
+    ]
+    pending = {}  # chore_id -> index of the operation to apply
+    for index, operation in enumerate(operations):
+        error = _validation_error(operation)
+        if error is not None:
+            results[index].update(status="invalid", detail=error)
+        elif operation.chore_id in pending:
+            results[index].update(status="conflict", detail="chore appears earlier in this batch")
+        else:
+            pending[operation.chore_id] = index
+
+    today = date.today()
+    audit_entries = []
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        if pending:
+            cur.execute(LOCK_CHORES_SQL, {"ids": list(pending)})
+            existing = {row[0] for row in cur.fetchall()}
+            for chore_id in set(pending) - existing:
+                results[pending.pop(chore_id)].update(status="not_found", detail="Chore not found")
+
+        by_op = {}
+        for index in pending.values():
+            by_op.setdefault(operations[index].op, []).append(index)
+
+        for op, archived, action_type in (("archive", True, "archived"), ("unarchive", False, "unarchived")):
+            indexes = by_op.get(op, [])
+            if indexes:
+                ids = [operations[index].chore_id for index in indexes]
+                cur.execute(SET_ARCHIVED_SQL, {"archived": archived, "ids": ids})
+                audit_entries.extend((chore_id, None, action_type, None) for chore_id in ids)
+
+        indexes = by_op.get("update", [])
+        if indexes:
+            updates = [operations[index] for index in indexes]
+            cur.execute(
+                BATCH_UPDATE_SQL,
+                {
+                    "ids": [operation.chore_id for operation in updates],
+                    "names": [operation.name for operation in updates],
+                    "interval_days": [operation.interval_days for operation in updates],
+                    "due_dates": [operation.due_date for operation in updates],
+                },
+            )
+            for row in cur.fetchall():
+                previous_state = {column: _iso(value) for column, value in zip(CHORE_STATE_COLUMNS, row)}
+                audit_entries.append((row[0], None, "updated", {"previous_state": previous_state}))
+
+        indexes = by_op.get("mark_done", [])
+        if indexes:
+            done = [operations[index] for index in indexes]
+            cur.execute(
+                BATCH_MARK_DONE_SQL,
+                {
+                    "ids": [operation.chore_id for operation in done],
+                    "done_by": [operation.done_by for operation in done],
+                    "today": today,
+                },
+            )
+            completed = {row[0]: row for row in cur.fetchall()}
+            for index in indexes:
+                operation = operations[index]
+                if operation.chore_id not in completed:
+                    results[index].update(status="conflict", detail="Chore already completed today")
+                    continue
+                _, new_due_date, previous_due_date, previous_last_done = completed[operation.chore_id]
+                results[index].update(new_due_date=_iso(new_due_date), last_done=today.isoformat())
+                audit_entries.append(
+                    (
+                        operation.chore_id,
+                        operation.done_by,
+                        "marked_done",
+                        {
+                            "chore_id": operation.chore_id,
+                            "new_due_date": _iso(new_due_date),
+                            "previous_due_date": _iso(previous_due_date),
+                            "previous_last_done": _iso(previous_last_done),
+                        },
+                    )
+                )
+
+        log_actions(audit_entries, conn)
+        conn.commit()
+        bump_data_version()
+    except Exception as e:
+        conn.rollback()
+        logging.error(f"Error applying chore batch: {e}")
+        raise HTTPException(status_code=500, detail="Failed to apply chore batch")
+    finally:
+        cur.close()
+        conn.close()
+
+    applied = sum(result["status"] == "ok" for result in results)
+    logging.info(f"Applied {applied} of {len(operations)} batched chore operations")
+    return {"applied": applied, "results": results}
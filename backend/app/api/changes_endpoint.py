@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+
+from app import changes
+from app.auth import verify_token
+
+router = APIRouter()
+
+# Subprotocol requested by frontend/src/socket.js; accepted when offered
+SUBPROTOCOL = "echo-protocol"
+
+
+async def _websocket_user(websocket: WebSocket, token: Optional[str]):
+    """
+    The subscriber's email: from a verified token query parameter if given
+    (browsers cannot set headers on a WebSocket), else the X-User-Email header
+    like the REST endpoints. None sees shared changes only.
+    """
+    if not token:
+        return websocket.headers.get("X-User-Email")
+    payload = await verify_token(token)
+    return payload.get("email")
+
+
+async def _send_messages(websocket: WebSocket, subscriber):
+    while True:
+        try:
+            message = await asyncio.wait_for(subscriber.queue.get(), timeout=changes.WS_HEARTBEAT_INTERVAL)
+        except asyncio.TimeoutError:
+            message = changes.HEARTBEAT
+        await websocket.send_text(message)
+
+
+@router.websocket("/ws")
+async def change_feed(websocket: WebSocket, token: Optional[str] = None):
+    """
+    Stream chore and log changes visible to the caller as JSON messages:
+    {"type": "chore" | "log", "action": ..., ...row fields}, plus "bulk" and
+    "resync" (refetch everything) and a "heartbeat" when idle. Clients may
+    send "ping" and get {"type": "pong"}. See app.changes.
+    """
+    try:
+        user_email = await _websocket_user(websocket, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    subprotocol = SUBPROTOCOL if SUBPROTOCOL in websocket.scope.get("subprotocols", []) else None
+    await websocket.accept(subprotocol=subprotocol)
+    hub = changes.get_change_hub()
+    subscriber = hub.subscribe(user_email)
+    sender = asyncio.create_task(_send_messages(websocket, subscriber))
+    try:
+        while True:
+            if (await websocket.receive_text()).strip().lower() == "ping":
+                subscriber.offer(changes.PONG)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logging.error(f"Change feed connection failed: {e}")
+    finally:
+        hub.unsubscribe(subscriber)
+        sender.cancel()
+        try:
+            await sender
+        except (asyncio.CancelledError, Exception):
+            pass
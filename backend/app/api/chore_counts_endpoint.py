@@ -1,15 +1,65 @@
 import logging
 from datetime import timedelta, date
 
-from fastapi import HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import Dict
 
-from app.database import get_db_connection
-from app.api.routes import api_router
+from app.async_database import async_db_connection
+from app.data_version import conditional_get
 
+router = APIRouter()
 
-@api_router.get("/chores/count")
-def get_chore_counts(request: Request) -> Dict[str, int]:
+# Bucket order matches the columns returned by CHORE_BUCKET_COUNTS_SQL
+CHORE_BUCKETS = ("all", "overdue", "today", "tomorrow", "thisWeek", "upcoming")
+
+# One COUNT per bucket, evaluated in a single pass over whatever chore rows are
+# selected (the dashboard, which scans the visible chores anyway)
+CHORE_BUCKET_COUNT_COLUMNS = """
+        COUNT(*),
+        COUNT(*) FILTER (WHERE due_date < %(today)s),
+        COUNT(*) FILTER (WHERE due_date = %(today)s),
+        COUNT(*) FILTER (WHERE due_date = %(tomorrow)s),
+        COUNT(*) FILTER (WHERE due_date > %(tomorrow)s AND due_date <= %(next_week)s),
+        COUNT(*) FILTER (WHERE due_date > %(next_week)s)
+"""
+
+# Every bucket as a range sum over the caller's rows in chore_due_counts
+# (the shared NULL scope plus their own private scope), which triggers keep in
+# step with chores; see migrations 0009 and 0010 and app.chore_counts. The cost depends on
+# the number of distinct due dates and uncompacted deltas, not on the number
+# of chores.
+CHORE_BUCKET_COUNTS_SQL = """
+    SELECT
+        COALESCE(SUM(chores), 0),
+        COALESCE(SUM(chores) FILTER (WHERE due_date < %(today)s), 0),
+        COALESCE(SUM(chores) FILTER (WHERE due_date = %(today)s), 0),
+        COALESCE(SUM(chores) FILTER (WHERE due_date = %(tomorrow)s), 0),
+        COALESCE(SUM(chores) FILTER (WHERE due_date > %(tomorrow)s AND due_date <= %(next_week)s), 0),
+        COALESCE(SUM(chores) FILTER (WHERE due_date > %(next_week)s), 0)
+    FROM chore_due_counts
+    WHERE scope IS NULL OR scope = %(user_email)s
+"""
+
+def chore_bucket_params(user_email, today=None):
+    """Query parameters for CHORE_BUCKET_COUNTS_SQL relative to today."""
+    today = today or date.today()
+    return {
+        "user_email": user_email,
+        "today": today,
+        "tomorrow": today + timedelta(days=1),
+        "next_week": today + timedelta(days=7),
+    }
+
+
+async def count_chore_buckets(cur, user_email, today=None) -> Dict[str, int]:
+    """Run the bucket aggregate on an open async cursor and return it keyed by bucket."""
+    await cur.execute(CHORE_BUCKET_COUNTS_SQL, chore_bucket_params(user_email, today))
+    row = await cur.fetchone()
+    return dict(zip(CHORE_BUCKETS, row))
+
+
+@router.get("/chores/count")
+async def get_chore_counts(request: Request, response: Response) -> Dict[str, int]:
     """
     Get total counts of chores in different categories:
     - all: All non-archived chores
@@ -18,63 +68,19 @@ def get_chore_counts(request: Request) -> Dict[str, int]:
     - tomorrow: Chores due tomorrow
     - thisWeek: Chores due in the next week (excluding today and tomorrow)
     - upcoming: Chores due beyond next week
+
+    Buckets are relative to today, so the ETag changes daily as well as with
+    the data.
     """
     user_email = request.headers.get("X-User-Email")
+    not_modified = conditional_get(request, response, user_email, date.today())
+    if not_modified:
+        return not_modified
 
-    # Get today's date for comparisons
-    today = date.today()
-    tomorrow = today + timedelta(days=1)
-    next_week = today + timedelta(days=7)
-
-    conn = get_db_connection()
-    cur = conn.cursor()
     try:
-        # Base query for all non-archived chores visible to the user
-        base_query = """
-            SELECT COUNT(*) 
-            FROM chores 
-            WHERE archived = FALSE 
-            AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %s))
-        """
-
-        # Total non-archived chores
-        cur.execute(base_query, (user_email,))
-        total_count = cur.fetchone()[0]
-
-        # Overdue chores
-        cur.execute(base_query + " AND due_date < %s", (user_email, today))
-        overdue_count = cur.fetchone()[0]
-
-        # Due today
-        cur.execute(base_query + " AND due_date = %s", (user_email, today))
-        today_count = cur.fetchone()[0]
-
-        # Due tomorrow
-        cur.execute(base_query + " AND due_date = %s", (user_email, tomorrow))
-        tomorrow_count = cur.fetchone()[0]
-
-        # Due this week (after tomorrow and up to a week from today)
-        cur.execute(
-            base_query + " AND due_date > %s AND due_date <= %s",
-            (user_email, tomorrow, next_week),
-        )
-        this_week_count = cur.fetchone()[0]
-
-        # Upcoming (beyond next week)
-        cur.execute(base_query + " AND due_date > %s", (user_email, next_week))
-        upcoming_count = cur.fetchone()[0]
-
-        return {
-            "all": total_count,
-            "overdue": overdue_count,
-            "today": today_count,
-            "tomorrow": tomorrow_count,
-            "thisWeek": this_week_count,
-            "upcoming": upcoming_count,
-        }
+        async with async_db_connection() as conn:
+            async with conn.cursor() as cur:
+                return await count_chore_buckets(cur, user_email)
     except Exception as e:
         logging.error(f"Error getting chore counts: {e}")
         raise HTTPException(status_code=500, detail="Failed to get chore counts")
-    finally:
-        cur.close()
-        conn.close()
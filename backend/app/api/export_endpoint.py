@@ -0,0 +1,235 @@
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import weakref
+import zlib
+from datetime import date, datetime
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.database import get_unpooled_connection
+
+router = APIRouter()
+
+# Rows pulled from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+# Streaming exports run on their own connections; cap how many are open at once
+EXPORT_MAX_CONCURRENT = int(os.getenv("EXPORT_MAX_CONCURRENT", "4"))
+# A stalled export's transaction is ended by the server after these (milliseconds)
+EXPORT_STATEMENT_TIMEOUT_MS = int(os.getenv("EXPORT_STATEMENT_TIMEOUT_MS", "300000"))
+EXPORT_IDLE_TIMEOUT_MS = int(os.getenv("EXPORT_IDLE_TIMEOUT_MS", "60000"))
+
+_export_slots = threading.BoundedSemaphore(EXPORT_MAX_CONCURRENT)
+
+CHORE_EXPORT_COLUMNS = (
+    "id", "name", "interval_days", "due_date", "done", "done_by", "archived", "owner_email", "is_private", "last_done",
+)
+LOG_EXPORT_COLUMNS = ("id", "chore_id", "done_by", "done_at", "action_details", "action_type")
+
+CHORE_EXPORT_SQL = f"""
+    SELECT {", ".join(CHORE_EXPORT_COLUMNS)}
+    FROM chores
+    WHERE is_private = FALSE OR (is_private = TRUE AND owner_email = %(user_email)s)
+    ORDER BY id
+"""
+
+# Same visibility rule as GET /api/logs
+LOG_EXPORT_SQL = """
+    SELECT l.id, l.chore_id, l.done_by, l.done_at, l.action_details, l.action_type
+    FROM chore_logs l
+    LEFT JOIN chores c ON l.chore_id = c.id
+    WHERE c.id IS NULL
+       OR c.is_private = FALSE
+       OR (c.is_private = TRUE AND c.owner_email = %(user_email)s)
+    ORDER BY l.done_at DESC, l.id DESC
+"""
+
+EXPORT_DATASETS = {
+    "chores": (CHORE_EXPORT_SQL, CHORE_EXPORT_COLUMNS),
+    "logs": (LOG_EXPORT_SQL, LOG_EXPORT_COLUMNS),
+}
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_export_batches(conn, user_email, datasets, batch_size=EXPORT_BATCH_SIZE, on_batch=None):
+    """
+    Yield (dataset, columns, rows) batches read through a server-side cursor.
+
+    Only one batch per dataset is held in memory at a time, so memory use does
+    not grow with the number of exported rows. on_batch, if given, is called
+    with the row count of each batch.
+    """
+    for dataset in datasets:
+        query, columns = EXPORT_DATASETS[dataset]
+        cur = conn.cursor(name=f"export_{dataset}")
+        cur.itersize = batch_size
+        try:
+            cur.execute(query, {"user_email": user_email})
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                if on_batch is not None:
+                    on_batch(len(rows))
+                yield dataset, columns, rows
+        finally:
+            cur.close()
+
+
+def encode_ndjson(batches):
+    """One JSON object per line, tagged with its dataset under "type"."""
+    for dataset, columns, rows in batches:
+        yield "".join(
+            json.dumps({"type": dataset[:-1], **dict(zip(columns, row))}, default=_json_default) + "\n"
+            for row in rows
+        ).encode()
+
+
+def encode_csv(batches):
+    """CSV with a header row; action_details is written as a JSON string."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header_written = False
+    for _, columns, rows in batches:
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        for row in rows:
+            writer.writerow(
+                json.dumps(value, default=_json_default) if isinstance(value, (dict, list))
+                else value.isoformat() if isinstance(value, (datetime, date))
+                else value
+                for value in row
+            )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def gzip_chunks(chunks):
+    """Compress a byte stream into a single gzip member chunk by chunk."""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(
+    conn, user_email, dataset="all", fmt="ndjson", compress=False, batch_size=EXPORT_BATCH_SIZE, on_batch=None
+):
+    """Encoded export bytes for one dataset ("chores", "logs") or both ("all", NDJSON only)."""
+    datasets = tuple(EXPORT_DATASETS) if dataset == "all" else (dataset,)
+    batches = iter_export_batches(conn, user_email, datasets, batch_size, on_batch)
+    chunks = encode_csv(batches) if fmt == "csv" else encode_ndjson(batches)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def _open_export_connection():
+    """
+    An unpooled connection for one streaming export, so a slow download
+    never holds a pool slot. The server cancels a FETCH running longer than
+    EXPORT_STATEMENT_TIMEOUT_MS and drops the session when the client leaves
+    the transaction idle for EXPORT_IDLE_TIMEOUT_MS.
+    """
+    return get_unpooled_connection(
+        options=(
+            f"-c statement_timeout={EXPORT_STATEMENT_TIMEOUT_MS}"
+            f" -c idle_in_transaction_session_timeout={EXPORT_IDLE_TIMEOUT_MS}"
+        )
+    )
+
+
+class _ExportRelease:
+    """Closes an export's connection and frees its slot; only the first call does anything."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._lock = threading.Lock()
+        self._released = False
+
+    def __call__(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        try:
+            self._conn.close()
+        finally:
+            _export_slots.release()
+
+
+def _stream_and_release(release, chunks, user_email):
+    try:
+        yield from chunks
+        logging.info(f"Streaming export completed for user: {user_email}")
+    except Exception as e:
+        # Headers are already sent, so the client sees a truncated body
+        logging.error(f"Error during streaming export: {e}")
+        raise
+    finally:
+        release()
+
+
+@router.get("/export/stream")
+def stream_export(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    dataset: Literal["all", "chores", "logs"] = "all",
+    gzip: bool = False,
+):
+    """
+    Stream the current user's chores and/or logs as NDJSON or CSV.
+
+    Rows are read through server-side cursors in EXPORT_BATCH_SIZE batches and
+    written out as they arrive, so memory stays flat no matter how much
+    history is exported. NDJSON lines carry a "type" of "chore" or "log"; CSV
+    holds a single dataset, so it needs dataset=chores or dataset=logs. With
+    gzip=true the body is a .gz file.
+
+    Each export uses its own unpooled connection; at most
+    EXPORT_MAX_CONCURRENT run at once and further requests get a 503.
+    """
+    user_email = request.headers.get("X-User-Email")
+    if format == "csv" and dataset == "all":
+        raise HTTPException(status_code=400, detail="CSV export needs dataset=chores or dataset=logs")
+
+    if not _export_slots.acquire(blocking=False):
+        logging.warning(f"Rejecting export for user: {user_email}, {EXPORT_MAX_CONCURRENT} already running")
+        raise HTTPException(status_code=503, detail="Too many exports in progress, try again later")
+    try:
+        conn = _open_export_connection()
+    except Exception as e:
+        _export_slots.release()
+        logging.error(f"Error during export: {e}")
+        raise HTTPException(status_code=500, detail="Failed to export data")
+
+    logging.info(f"Streaming {dataset} export as {format} for user: {user_email}, gzip: {gzip}")
+    filename = f"choremane-{dataset}.{format}" + (".gz" if gzip else "")
+    chunks = export_stream(conn, user_email, dataset, format, gzip)
+    release = _ExportRelease(conn)
+    response = StreamingResponse(
+        _stream_and_release(release, chunks, user_email),
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        background=BackgroundTask(release),
+    )
+    # A body that is never iterated (client gone before the first chunk)
+    # never reaches the generator's finally, nor the background task after a
+    # disconnect; release once the response itself is dropped
+    weakref.finalize(response, release)
+    return response
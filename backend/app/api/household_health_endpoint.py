@@ -1,47 +1,91 @@
 import logging
+import os
+from datetime import datetime
 from typing import Dict
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 
-from app.database import get_db_connection
-from app.services import calculate_household_health_score
+from app.async_database import async_db_connection
+from app.data_version import conditional_get
 
 router = APIRouter()
 
+# The score drifts with time even when no chore changes, so its ETag also
+# rolls over every window
+HEALTH_ETAG_WINDOW_SECONDS = int(os.getenv("HEALTH_ETAG_WINDOW_SECONDS", "300"))
+
+# SQL port of services.calculate_single_chore_score. "elapsed" is (now - due_date)
+# as a fraction of the interval: > 0 is overdue, and 1 + elapsed is the fraction
+# of the interval used so far. services.calculate_household_health_score remains
+# the reference implementation.
+CHORE_ELAPSED_SQL = """
+    EXTRACT(EPOCH FROM (%(now)s::timestamp - due_date::timestamp)) / (interval_days * 86400.0)
+"""
+
+CHORE_HEALTH_SCORE_SQL = """
+    CASE
+        WHEN elapsed > 0 THEN GREATEST(0, 80 - elapsed * 80)
+        WHEN 1 + elapsed <= 0.5 THEN 100
+        ELSE 100 - (1 + elapsed - 0.5) * 40
+    END
+"""
+
+# Averaged over the visible active chores with a usable interval
+HOUSEHOLD_HEALTH_SQL = f"""
+    SELECT COUNT(*), AVG(score)::float8
+    FROM (
+        SELECT {CHORE_HEALTH_SCORE_SQL} AS score
+        FROM (
+            SELECT {CHORE_ELAPSED_SQL} AS elapsed
+            FROM chores
+            WHERE archived = FALSE
+            AND interval_days IS NOT NULL
+            AND interval_days > 0
+            AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %(user_email)s))
+        ) AS ratios
+    ) AS scores
+"""
+
+def health_score_from_aggregate(chore_count, average_score) -> int:
+    """Round the SQL average like the Python implementation; no chores scores 100."""
+    if not chore_count or average_score is None:
+        return 100
+    return int(round(average_score))
+
+
+async def fetch_household_health(cur, user_email, now=None) -> int:
+    """Run the health aggregate on an open async cursor and return the 0-100 score."""
+    await cur.execute(
+        HOUSEHOLD_HEALTH_SQL,
+        {"now": now or datetime.now(), "user_email": user_email},
+    )
+    chore_count, average_score = await cur.fetchone()
+    return health_score_from_aggregate(chore_count, average_score)
+
 
 @router.get("/chores/household-health")
-def get_household_health(request: Request) -> Dict[str, int]:
+async def get_household_health(request: Request, response: Response) -> Dict[str, int]:
     """
     Calculate and return the household health score (0-100).
     Logic:
     - Fresh (0-50% elapsed): 100
     - Standard (50-100% elapsed): Decays 100 -> 80
     - Overdue (>100% elapsed): Decays 80 -> 0 based on overdue amount
+
+    Scoring runs in Postgres so only the averaged score leaves the database.
     """
     user_email = request.headers.get("X-User-Email")
-
-    conn = get_db_connection()
-    cur = conn.cursor()
+    window = int(datetime.now().timestamp() // HEALTH_ETAG_WINDOW_SECONDS)
+    not_modified = conditional_get(request, response, user_email, window)
+    if not_modified:
+        return not_modified
 
     try:
-        # Fetch all active chores relevant to the score
-        query = """
-            SELECT due_date, interval_days 
-            FROM chores 
-            WHERE archived = FALSE 
-            AND interval_days IS NOT NULL 
-            AND interval_days > 0
-            AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %s))
-        """
-        cur.execute(query, (user_email,))
-        rows = cur.fetchall()
-
-        score = calculate_household_health_score(rows)
+        async with async_db_connection() as conn:
+            async with conn.cursor() as cur:
+                score = await fetch_household_health(cur, user_email)
         return {"score": score}
 
     except Exception as e:
         logging.error(f"Error calculating household health: {e}")
         raise HTTPException(status_code=500, detail="Failed to calculate household health")
-    finally:
-        cur.close()
-        conn.close()
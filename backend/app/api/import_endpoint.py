@@ -0,0 +1,74 @@
+import logging
+
+import ijson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from app.data_version import bump_data_version
+from app.database import get_db_connection
+from app.importer import StreamingImport
+from app.utils import log_action
+
+router = APIRouter()
+
+
+def _close(cur, conn):
+    cur.close()
+    conn.close()
+
+
+@router.post("/import/stream")
+async def stream_import(request: Request):
+    """
+    Import a backup without buffering the upload.
+
+    Accepts the same {"chores": [...], "logs": [...]} document as /import, but
+    parses the body as it arrives and loads it in IMPORT_BATCH_SIZE batches
+    while the upload is still in progress, so memory stays flat for any file
+    size. The whole import is one transaction. The response reports counts and
+    one entry per batch listing the rows it rejected.
+    """
+    user_email = request.headers.get("X-User-Email")
+    try:
+        # May wait for a free pool slot, so keep it off the event loop
+        conn = await run_in_threadpool(get_db_connection)
+    except Exception as e:
+        logging.error(f"Error during streaming import: {e}")
+        raise HTTPException(status_code=500, detail="Failed to import data")
+
+    cur = conn.cursor()
+    try:
+        importer = StreamingImport(cur, user_email)
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(importer.feed, chunk)
+        report = await run_in_threadpool(importer.finish)
+        if not importer.seen["chores"]:
+            raise HTTPException(status_code=400, detail="No chores data found in the import file")
+        await run_in_threadpool(conn.commit)
+        bump_data_version()
+    except HTTPException:
+        await run_in_threadpool(conn.rollback)
+        raise
+    except ijson.JSONError as e:
+        await run_in_threadpool(conn.rollback)
+        reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+        logging.warning(f"Rejecting malformed import upload: {reason}")
+        raise HTTPException(status_code=400, detail=f"Invalid import file: {reason}")
+    except Exception as e:
+        await run_in_threadpool(conn.rollback)
+        logging.error(f"Error during streaming import: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to import data: {str(e)}")
+    finally:
+        await run_in_threadpool(_close, cur, conn)
+
+    log_action(
+        None,
+        user_email,
+        "import",
+        action_details={
+            "imported_chores": report["imported_chores"],
+            "imported_logs": report["imported_logs"],
+        },
+    )
+    return {"message": "Import successful", **report}
@@ -0,0 +1,120 @@
+import logging
+import os
+import uuid
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+
+from app.api.export_endpoint import EXPORT_MEDIA_TYPES
+from app.jobs import JOBS_DIR, get_job_pool, get_job_store, job_status
+
+router = APIRouter()
+
+
+def _queued(job):
+    get_job_pool().notify()
+    return {"id": job["id"], "status": job["status"], "status_url": f"/api/jobs/{job['id']}"}
+
+
+def _get_own_job(job_id, user_email):
+    try:
+        job = get_job_store().get(job_id)
+    except Exception as e:
+        logging.error(f"Error fetching job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch job")
+    # Other users' jobs are reported as missing rather than forbidden
+    if job is None or job["user_email"] != user_email:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def _discard_upload(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@router.post("/import/jobs", status_code=202)
+async def create_import_job(request: Request):
+    """
+    Queue an import of a {"chores": [...], "logs": [...]} backup.
+
+    The upload is spooled to JOBS_DIR as it arrives and the job is queued once
+    it is complete; the import itself runs in the background with the same
+    batching and single transaction as /import/stream. Poll the returned
+    status_url for progress and the import report.
+    """
+    user_email = request.headers.get("X-User-Email")
+    path = os.path.join(JOBS_DIR, f"upload-{uuid.uuid4()}.json")
+    try:
+        # File system calls can block, so none of them run on the event loop
+        await run_in_threadpool(os.makedirs, JOBS_DIR, exist_ok=True)
+        upload = await run_in_threadpool(open, path, "wb")
+        try:
+            async for chunk in request.stream():
+                if chunk:
+                    await run_in_threadpool(upload.write, chunk)
+        finally:
+            await run_in_threadpool(upload.close)
+        job = await run_in_threadpool(get_job_store().create, "import", user_email, {"path": path})
+    except Exception as e:
+        logging.error(f"Error queueing import job: {e}")
+        await run_in_threadpool(_discard_upload, path)
+        raise HTTPException(status_code=500, detail="Failed to queue import")
+
+    logging.info(f"Queued import job {job['id']} for user: {user_email}")
+    return _queued(job)
+
+
+@router.post("/export/jobs", status_code=202)
+async def create_export_job(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    dataset: Literal["all", "chores", "logs"] = "all",
+    gzip: bool = False,
+):
+    """
+    Queue an export with the same options as /export/stream.
+
+    The file is written in the background; once the job has succeeded its
+    status carries a result_url to download it from.
+    """
+    user_email = request.headers.get("X-User-Email")
+    if format == "csv" and dataset == "all":
+        raise HTTPException(status_code=400, detail="CSV export needs dataset=chores or dataset=logs")
+
+    try:
+        job = await run_in_threadpool(
+            get_job_store().create, "export", user_email, {"format": format, "dataset": dataset, "gzip": gzip}
+        )
+    except Exception as e:
+        logging.error(f"Error queueing export job: {e}")
+        raise HTTPException(status_code=500, detail="Failed to queue export")
+
+    logging.info(f"Queued {dataset} export job {job['id']} as {format} for user: {user_email}")
+    return _queued(job)
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str, request: Request):
+    """Status, progress, throughput and result of one of the current user's jobs."""
+    return job_status(_get_own_job(job_id, request.headers.get("X-User-Email")))
+
+
+@router.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str, request: Request):
+    """Download the file written by a finished export job."""
+    job = _get_own_job(job_id, request.headers.get("X-User-Email"))
+    if job["status"] != "succeeded" or not job["result_path"]:
+        raise HTTPException(status_code=409, detail=f"Job has no result to download (status: {job['status']})")
+    if not os.path.exists(job["result_path"]):
+        raise HTTPException(status_code=410, detail="Job result is no longer available")
+
+    params = job["params"]
+    filename = f"choremane-{params['dataset']}.{params['format']}" + (".gz" if params.get("gzip") else "")
+    return FileResponse(
+        job["result_path"],
+        media_type="application/gzip" if params.get("gzip") else EXPORT_MEDIA_TYPES[params["format"]],
+        filename=filename,
+    )
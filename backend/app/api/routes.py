@@ -1,19 +1,56 @@
+import base64
 import json
 import logging
-from datetime import datetime, timedelta, date
+import os
+from datetime import datetime, date
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 
 from fastapi.responses import JSONResponse
-from typing import List
+from typing import List, Optional, Union
 
-from app.database import get_db_connection
-from app.models import Chore, UndoRequest
+from app.async_database import async_db_connection, get_async_pool_stats
+from app.audit import get_audit_stats
+from app.auth import get_auth_stats
+from app.changes import get_change_feed_stats
+from app.chore_counts import get_chore_counts_stats
+from app.data_version import bump_data_version, conditional_get, get_conditional_stats
+from app.database import get_db_connection, get_pool_stats
+from app.http_client import get_http_client_stats
+from app.importer import import_chore_batch, import_log_batch
+from app.models import Chore, ChorePage, Dashboard, UndoRequest
+from app.serialization import CHORE_SELECT, chore_to_dict, fast_json_response
 from app.utils import log_action
-from app.api.household_health_endpoint import router as household_health_router
+from app.api.chore_counts_endpoint import (
+    CHORE_BUCKET_COUNT_COLUMNS,
+    CHORE_BUCKETS,
+    chore_bucket_params,
+    router as chore_counts_router,
+)
+from app.api.batch_endpoint import CHORE_STATE_COLUMNS, router as batch_router
+from app.api.export_endpoint import router as export_router
+from app.api.import_endpoint import router as import_router
+from app.api.jobs_endpoint import router as jobs_router
+from app.api.sync_endpoint import router as sync_router
+from app.api.household_health_endpoint import (
+    CHORE_ELAPSED_SQL,
+    CHORE_HEALTH_SCORE_SQL,
+    health_score_from_aggregate,
+    router as household_health_router,
+)
+
+# Upper bound on limit for the paginated list endpoints
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
 
 api_router = APIRouter(prefix="/api")
+api_router.include_router(chore_counts_router)
 api_router.include_router(household_health_router)
+api_router.include_router(export_router)
+api_router.include_router(import_router)
+api_router.include_router(jobs_router)
+api_router.include_router(batch_router)
+api_router.include_router(sync_router)
 
 @api_router.options("/{path:path}")
 async def options_handler(path: str):
@@ -26,6 +63,112 @@ def _to_iso_date(value):
         return value.isoformat()
     return value
 
+def _encode_cursor(*values):
+    """Build an opaque pagination cursor from the sort key of the last returned row."""
+    payload = json.dumps([_to_iso_date(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor, *parsers):
+    """Decode a cursor produced by _encode_cursor, applying one parser per key part."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor has the wrong number of parts")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError) as e:
+        logging.warning(f"Rejecting invalid pagination cursor {cursor!r}: {e}")
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def _chore_page_query(archived, user_email, page, limit, cursor):
+    """
+    Build the SQL for one page of visible chores ordered by (due_date, id).
+
+    With a cursor the page starts strictly after the cursor's (due_date, id)
+    key, so rows completed or added between requests are never duplicated or
+    skipped. Without one, legacy page/limit OFFSET paging is used. One extra
+    row is fetched to tell whether another page exists.
+    """
+    # Inline the archived flag so the planner can match partial indexes on it
+    archived_sql = "TRUE" if archived else "FALSE"
+    query = f"""
+        SELECT {CHORE_SELECT}
+        FROM chores
+        WHERE archived = {archived_sql}
+          AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %s))
+    """
+    params = [user_email]
+    if cursor:
+        after_due_date, after_id = _decode_cursor(cursor, date.fromisoformat, int)
+        query += " AND (due_date, id) > (%s, %s) ORDER BY due_date ASC, id ASC LIMIT %s"
+        params += [after_due_date, after_id, limit + 1]
+    else:
+        query += " ORDER BY due_date ASC, id ASC LIMIT %s OFFSET %s"
+        params += [limit + 1, (page - 1) * limit]
+    return query, tuple(params)
+
+
+def _split_page(rows, limit):
+    """Trim the look-ahead row and return (rows, next_cursor)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, _encode_cursor(last[3], last[0])
+
+
+def _chore_from_row(row):
+    """Build a Chore from a row in the _chore_page_query column order."""
+    return Chore(
+        id=row[0],
+        name=row[1],
+        interval_days=row[2],
+        due_date=str(_to_iso_date(row[3])),
+        done=row[4],
+        done_by=row[5],
+        archived=row[6],
+        owner_email=row[7],
+        is_private=row[8],
+        last_done=_to_iso_date(row[9]),
+    )
+
+
+# First page, bucket counts and health score for the startup view in one
+# statement, so all three are read from the same snapshot in one round trip.
+# Every output row carries the summary columns; the chore columns are NULL
+# when the user has no visible chores.
+DASHBOARD_SQL = f"""
+    WITH visible AS MATERIALIZED (
+        SELECT id, name, interval_days, due_date, done, done_by, archived, owner_email, is_private, last_done,
+               CASE WHEN interval_days > 0 THEN {CHORE_ELAPSED_SQL} END AS elapsed
+        FROM chores
+        WHERE archived = FALSE
+          AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %(user_email)s))
+    ),
+    summary AS (
+        SELECT {CHORE_BUCKET_COUNT_COLUMNS},
+               COUNT(elapsed) AS scored_count,
+               AVG({CHORE_HEALTH_SCORE_SQL})::float8 AS average_score
+        FROM visible
+    ),
+    first_page AS (
+        SELECT id, name, interval_days, due_date, done, done_by, archived, owner_email, is_private, last_done
+        FROM visible
+        ORDER BY due_date ASC, id ASC
+        LIMIT %(limit)s
+    )
+    SELECT summary.*, first_page.*
+    FROM summary
+    LEFT JOIN first_page ON TRUE
+    ORDER BY first_page.due_date ASC, first_page.id ASC
+"""
+
+# Leading summary columns in every DASHBOARD_SQL row: the buckets plus the health aggregate
+_DASHBOARD_SUMMARY_WIDTH = len(CHORE_BUCKETS) + 2
+
+
 @api_router.post("/cors-test")
 def cors_test():
     return {"message": "CORS test successful"}
@@ -43,35 +186,107 @@ def status_check():
         logging.error(f"Health check failed: {str(e)}")
         return {"status": "ERROR", "message": "Backend or database connectivity issue"}
 
+@api_router.get("/metrics")
+def get_metrics():
+    """Runtime metrics used for capacity planning (connection pools, audit log queue, auth caches, outbound HTTP, conditional GETs, change feed, chore count maintenance)."""
+    return {
+        "db_pool": get_pool_stats(),
+        "async_db_pool": get_async_pool_stats(),
+        "audit_log": get_audit_stats(),
+        "auth": get_auth_stats(),
+        "http_client": get_http_client_stats(),
+        "conditional_get": get_conditional_stats(),
+        "change_feed": get_change_feed_stats(),
+        "chore_counts": get_chore_counts_stats(),
+    }
+
+def _log_page_query(user_email, cursor, limit, chore_id, action_type, done_by, since, until):
+    """
+    Build the SQL for logs visible to the user, newest first by (done_at, id).
+
+    Filters are optional. With a cursor the page continues strictly before the
+    cursor's (done_at, id) key; limit fetches one look-ahead row so callers can
+    tell whether another page exists.
+    """
+    query = """
+        SELECT l.id, l.chore_id, l.done_by, l.done_at, l.action_details, l.action_type
+        FROM chore_logs l
+        LEFT JOIN chores c ON l.chore_id = c.id
+        WHERE (c.id IS NULL
+               OR c.is_private = FALSE
+               OR (c.is_private = TRUE AND c.owner_email = %s))
+    """
+    params = [user_email]
+    for column, value in (("l.chore_id", chore_id), ("l.action_type", action_type), ("l.done_by", done_by)):
+        if value is not None:
+            query += f" AND {column} = %s"
+            params.append(value)
+    if since is not None:
+        query += " AND l.done_at >= %s"
+        params.append(since)
+    if until is not None:
+        query += " AND l.done_at < %s"
+        params.append(until)
+    if cursor:
+        before_done_at, before_id = _decode_cursor(cursor, datetime.fromisoformat, int)
+        query += " AND (l.done_at, l.id) < (%s, %s)"
+        params += [before_done_at, before_id]
+    query += " ORDER BY l.done_at DESC, l.id DESC"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit + 1)
+    return query, tuple(params)
+
+
 @api_router.get("/logs")
-def get_logs(request: Request):
+async def get_logs(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    chore_id: Optional[int] = None,
+    action_type: Optional[str] = None,
+    done_by: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
     """
     Return logs visible to the current user. Logs for shared chores are always
     included; logs for private chores are limited to the owner. System-level
     logs without a chore_id are also returned.
+
+    Optional filters: chore_id, action_type, done_by and a done_at range
+    (since inclusive, until exclusive). Pass cursor (empty for the first page)
+    for keyset pagination on (done_at, id): the response becomes
+    {"items": [...], "next_cursor": ...} with limit defaulting to 50. Without
+    cursor a plain list is returned, capped at limit when given.
+
+    Responses carry an ETag; a matching If-None-Match gets 304.
     """
     user_email = request.headers.get("X-User-Email")
-    logging.info(f"Fetching chore logs for user: {user_email}")
+    logging.info(f"Fetching chore logs for user: {user_email}, cursor: {cursor}, limit: {limit}")
+    not_modified = conditional_get(request, response, user_email)
+    if not_modified:
+        return not_modified
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+    if cursor is not None and limit is None:
+        limit = 50
+    query, params = _log_page_query(user_email, cursor, limit, chore_id, action_type, done_by, since, until)
     try:
-        cur.execute(
-            """
-            SELECT l.id, l.chore_id, l.done_by, l.done_at, l.action_details, l.action_type
-            FROM chore_logs l
-            LEFT JOIN chores c ON l.chore_id = c.id
-            WHERE c.id IS NULL
-               OR c.is_private = FALSE
-               OR (c.is_private = TRUE AND c.owner_email = %s)
-            ORDER BY l.done_at DESC
-            """,
-            (user_email,),
-        )
-        logs = cur.fetchall()
+        async with async_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                logs = await cur.fetchall()
+
+        next_cursor = None
+        if limit is not None and len(logs) > limit:
+            logs = logs[:limit]
+            if logs:
+                next_cursor = _encode_cursor(logs[-1][3], logs[-1][0])
+                response.headers["X-Next-Cursor"] = next_cursor
         if not logs:
             logging.info("No logs found")
-            return []
+            return {"items": [], "next_cursor": None} if cursor is not None else []
 
         def parse_details(raw_details):
             if raw_details is None:
@@ -86,7 +301,7 @@ def get_logs(request: Request):
 
         normalized_logs = []
         for row in logs:
-            action_type = row[5] if len(row) > 5 else None
+            row_action_type = row[5] if len(row) > 5 else None
             normalized_logs.append(
                 {
                     "id": row[0],
@@ -94,78 +309,96 @@ def get_logs(request: Request):
                     "done_by": row[2],
                     "done_at": row[3].isoformat() if row[3] else None,
                     "action_details": parse_details(row[4] if len(row) > 4 else None),
-                    "action_type": action_type,
+                    "action_type": row_action_type,
                 }
             )
+        if cursor is not None:
+            return {"items": normalized_logs, "next_cursor": next_cursor}
         return normalized_logs
     except Exception as e:
         logging.error(f"Error fetching logs: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch logs")
-    finally:
-        cur.close()
-        conn.close()
 
-@api_router.get("/chores", response_model=List[Chore])
-def get_chores(request: Request, page: int = 1, limit: int = 10):
+@api_router.get("/chores", response_model=Union[List[Chore], ChorePage])
+async def get_chores(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
     """
     Fetch chores visible to the current user:
     - All shared chores (is_private = false)
     - Private chores owned by the user (is_private = true and owner_email = user)
     
-    Supports pagination with page and limit parameters.
+    Supports keyset pagination: pass cursor (empty for the first page) to get
+    {"items": [...], "next_cursor": ...} back. Without cursor the legacy page
+    and limit parameters are used and a plain list is returned. Both modes set
+    the X-Next-Cursor header when another page exists. Responses carry an
+    ETag; a matching If-None-Match gets 304.
     """
     user_email = request.headers.get("X-User-Email")  # In production, extract from auth/session
-    logging.info(f"Fetching chores for user: {user_email}, page: {page}, limit: {limit}")
-    
-    # Calculate offset based on page and limit
-    offset = (page - 1) * limit
+    logging.info(f"Fetching chores for user: {user_email}, page: {page}, limit: {limit}, cursor: {cursor}")
+    not_modified = conditional_get(request, response, user_email)
+    if not_modified:
+        return not_modified
     
-    conn = get_db_connection()
-    cur = conn.cursor()
+    query, params = _chore_page_query(False, user_email, page, limit, cursor)
     try:
-        cur.execute(
-            """
-            SELECT id, name, interval_days, due_date, done, done_by, archived, owner_email, is_private, last_done
-            FROM chores
-            WHERE archived = FALSE AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %s))
-            ORDER BY due_date ASC
-            LIMIT %s OFFSET %s
-            """,
-            (user_email, limit, offset)
-        )
-        rows = cur.fetchall()
-        columns = [desc[0] for desc in cur.description] if getattr(cur, "description", None) else []
+        async with async_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(query, params)
+                rows = await cur.fetchall()
+        rows, next_cursor = _split_page(rows, limit)
 
-        chores = []
-        for row in rows:
-            record = dict(zip(columns, row)) if columns else {}
-            chore_owner = record.get("owner_email") if record else (row[7] if len(row) > 7 else None)
-            is_private = record.get("is_private", False) if record else (row[8] if len(row) > 8 else False)
-
-            if is_private and chore_owner and chore_owner != user_email:
-                continue
-
-            chores.append(
-                Chore(
-                    id=record.get("id", row[0] if row else None),
-                    name=record.get("name", row[1] if len(row) > 1 else None),
-                    interval_days=record.get("interval_days", row[2] if len(row) > 2 else None),
-                    due_date=str(_to_iso_date(record.get("due_date", row[3] if len(row) > 3 else ""))),
-                    done=record.get("done", row[4] if len(row) > 4 else False),
-                    done_by=record.get("done_by", row[5] if len(row) > 5 else None),
-                    archived=record.get("archived", row[6] if len(row) > 6 else False),
-                    last_done=_to_iso_date(record.get("last_done", row[9] if len(row) > 9 else None)),
-                    owner_email=chore_owner,
-                    is_private=is_private,
-                )
-            )
-        return chores
+        # Rows are in the fixed CHORE_COLUMNS order, so they go straight to
+        # JSON; the query already filters by visibility, this guards it
+        chores = [
+            chore_to_dict(row) for row in rows
+            if not (row[8] and row[7] and row[7] != user_email)
+        ]
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if cursor is not None:
+            return fast_json_response({"items": chores, "next_cursor": next_cursor}, response)
+        return fast_json_response(chores, response)
     except Exception as e:
         logging.error(f"Error fetching chores: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch chores")
-    finally:
-        cur.close()
-        conn.close()
+
+@api_router.get("/dashboard", response_model=Dashboard)
+async def get_dashboard(request: Request, limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE)):
+    """
+    Everything the chore list needs for first paint in one request: the first
+    page of active chores (as GET /api/chores?cursor=), the bucket counts (as
+    GET /api/chores/count) and the household health score (as GET
+    /api/chores/household-health), all computed from one snapshot query.
+    """
+    user_email = request.headers.get("X-User-Email")
+    logging.info(f"Fetching dashboard for user: {user_email}, limit: {limit}")
+
+    params = chore_bucket_params(user_email)
+    params.update({"now": datetime.now(), "limit": limit + 1})
+    try:
+        async with async_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(DASHBOARD_SQL, params)
+                rows = await cur.fetchall()
+
+        summary = rows[0][:_DASHBOARD_SUMMARY_WIDTH]
+        chore_rows = [row[_DASHBOARD_SUMMARY_WIDTH:] for row in rows if row[_DASHBOARD_SUMMARY_WIDTH] is not None]
+        chore_rows, next_cursor = _split_page(chore_rows, limit)
+
+        return {
+            "items": [_chore_from_row(row) for row in chore_rows],
+            "next_cursor": next_cursor,
+            "counts": dict(zip(CHORE_BUCKETS, summary)),
+            "household_health": health_score_from_aggregate(*summary[len(CHORE_BUCKETS):]),
+        }
+    except Exception as e:
+        logging.error(f"Error fetching dashboard: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch dashboard")
 
 @api_router.post("/chores")
 def add_chore(chore: Chore, request: Request):
@@ -181,8 +414,9 @@ def add_chore(chore: Chore, request: Request):
             (chore.name, chore.interval_days, chore.due_date, user_email if chore.is_private else None, chore.is_private)
         )
         chore_id = cur.fetchone()[0]
-        conn.commit()
         log_action(chore_id, None, "created", action_details=chore.dict(), conn=conn)
+        conn.commit()
+        bump_data_version()
         return {"message": "Chore added successfully", "id": chore_id}
     except Exception as e:
         logging.error(f"Error adding chore: {e}")
@@ -231,9 +465,10 @@ def undo_action(undo_request: UndoRequest):
             )
         else:
             raise HTTPException(status_code=400, detail="Undo not supported for this action type")
-        conn.commit()
         log_chore_id = action_details.get("id") or action_details.get("chore_id") or action_details.get("previous_state", {}).get("id")
         log_action(log_chore_id, None, "undo", action_details={"action_type": action_type, "undone": True}, conn=conn)
+        conn.commit()
+        bump_data_version()
         return {"message": f"Action {action_type} undone successfully"}
     except HTTPException:
         conn.rollback()
@@ -251,7 +486,7 @@ def update_chore(chore_id: int, updated_chore: Chore):
     conn = get_db_connection()
     cur = conn.cursor()
     try:
-        cur.execute("SELECT * FROM chores WHERE id = %s", (chore_id,))
+        cur.execute(f"SELECT {', '.join(CHORE_STATE_COLUMNS)} FROM chores WHERE id = %s", (chore_id,))
         previous_state = cur.fetchone()
         if not previous_state:
             raise HTTPException(status_code=404, detail="Chore not found")
@@ -270,8 +505,9 @@ def update_chore(chore_id: int, updated_chore: Chore):
             """,
             (updated_chore.name, updated_chore.interval_days, updated_chore.due_date, chore_id)
         )
+        log_action(chore_id, None, "updated", action_details={"previous_state": previous_state_dict}, conn=conn)
         conn.commit()
-        log_action(chore_id, None, "updated", action_details={"previous_state": previous_state_dict})
+        bump_data_version()
         return {"message": f"Chore {chore_id} updated successfully"}
     except HTTPException:
         conn.rollback()
@@ -284,6 +520,22 @@ def update_chore(chore_id: int, updated_chore: Chore):
         cur.close()
         conn.close()
 
+# Completes a chore in one statement. The self-join locks the row, so the
+# previous due_date/last_done returned for the undo log are the values this
+# update replaced, and a concurrent completion waits on the lock and then
+# fails the last_done check instead of completing the chore twice.
+MARK_DONE_SQL = """
+    UPDATE chores c
+    SET done = TRUE,
+        done_by = %(done_by)s,
+        due_date = %(today)s::date + c.interval_days,
+        last_done = %(today)s
+    FROM (SELECT id, due_date, last_done FROM chores WHERE id = %(chore_id)s FOR UPDATE) previous
+    WHERE c.id = previous.id
+      AND c.last_done IS DISTINCT FROM %(today)s::date
+    RETURNING c.due_date, previous.due_date, previous.last_done
+"""
+
 @api_router.put("/chores/{chore_id}/done")
 def mark_chore_done(chore_id: int, payload: dict):
     done_by = payload.get("done_by")
@@ -293,22 +545,14 @@ def mark_chore_done(chore_id: int, payload: dict):
     conn = get_db_connection()
     cur = conn.cursor()
     try:
-        cur.execute("SELECT interval_days, due_date, last_done FROM chores WHERE id = %s", (chore_id,))
+        today_date = date.today()
+        cur.execute(MARK_DONE_SQL, {"chore_id": chore_id, "done_by": done_by, "today": today_date})
         result = cur.fetchone()
         if not result:
-            raise HTTPException(status_code=404, detail="Chore not found or incomplete")
-        interval_days, due_date, last_done = result
-
-        today_date = date.today()
-        last_done_date = None
-        if last_done:
-            if isinstance(last_done, datetime):
-                last_done_date = last_done.date()
-            elif isinstance(last_done, date):
-                last_done_date = last_done
-            elif isinstance(last_done, str):
-                last_done_date = datetime.fromisoformat(last_done).date()
-        if last_done_date == today_date:
+            # Nothing updated: either no such chore or it was already done today
+            cur.execute("SELECT 1 FROM chores WHERE id = %s", (chore_id,))
+            if not cur.fetchone():
+                raise HTTPException(status_code=404, detail="Chore not found or incomplete")
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -316,18 +560,10 @@ def mark_chore_done(chore_id: int, payload: dict):
                     "last_done": today_date.isoformat(),
                 },
             )
+        new_due_date, due_date, last_done = result
+        new_due_date = _to_iso_date(new_due_date)
+        due_date_str = _to_iso_date(due_date)
 
-        due_date_str = due_date.isoformat() if isinstance(due_date, date) else due_date
-        new_due_date = (today_date + timedelta(days=interval_days)).isoformat()
-        cur.execute(
-            """
-            UPDATE chores 
-            SET done = TRUE, done_by = %s, due_date = %s, last_done = %s 
-            WHERE id = %s
-            """,
-            (done_by, new_due_date, today_date, chore_id)
-        )
-        conn.commit()
         log_action(
             chore_id,
             done_by,
@@ -340,6 +576,8 @@ def mark_chore_done(chore_id: int, payload: dict):
             },
             conn=conn,
         )
+        conn.commit()
+        bump_data_version()
         return {
             "message": f"Chore {chore_id} marked as done",
             "new_due_date": new_due_date,
@@ -365,8 +603,9 @@ def archive_chore(chore_id: int):
         cur.execute("UPDATE chores SET archived = TRUE WHERE id = %s", (chore_id,))
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Chore not found")
-        conn.commit()
         log_action(chore_id, None, "archived", conn=conn)
+        conn.commit()
+        bump_data_version()
         return {"message": f"Chore {chore_id} archived successfully"}
     except HTTPException:
         conn.rollback()
@@ -387,8 +626,9 @@ def unarchive_chore(chore_id: int):
         cur.execute("UPDATE chores SET archived = FALSE WHERE id = %s", (chore_id,))
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Chore not found")
-        conn.commit()
         log_action(chore_id, None, "unarchived", conn=conn)
+        conn.commit()
+        bump_data_version()
         return {"message": f"Chore {chore_id} unarchived successfully"}
     except HTTPException:
         conn.rollback()
@@ -401,43 +641,35 @@ def unarchive_chore(chore_id: int):
         cur.close()
         conn.close()
 
-@api_router.get("/chores/archived", response_model=List[Chore])
-def get_archived_chores(request: Request):
+@api_router.get("/chores/archived", response_model=Union[List[Chore], ChorePage])
+def get_archived_chores(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
     """
     Fetch archived chores visible to the current user:
     - All shared archived chores (is_private = false, archived = true)
     - Private archived chores owned by the user (is_private = true, archived = true, and owner_email = user)
+
+    Paginated the same way as GET /chores (cursor, or legacy page and limit).
     """
     user_email = request.headers.get("X-User-Email")  # In production, extract from auth/session
-    logging.info(f"Fetching archived chores for user: {user_email}")
+    logging.info(f"Fetching archived chores for user: {user_email}, page: {page}, limit: {limit}, cursor: {cursor}")
+    query, params = _chore_page_query(True, user_email, page, limit, cursor)
     conn = get_db_connection()
     cur = conn.cursor()
     try:
-        cur.execute(
-            """
-            SELECT id, name, interval_days, due_date, done, done_by, archived, owner_email, is_private, last_done
-            FROM chores
-            WHERE archived = TRUE AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %s))
-            ORDER BY due_date ASC
-            """,
-            (user_email,)
-        )
-        rows = cur.fetchall()
-        chores = [
-            Chore(
-                id=row[0],
-                name=row[1],
-                interval_days=row[2],
-                due_date=str(_to_iso_date(row[3])),
-                done=row[4],
-                done_by=row[5],
-                archived=row[6],
-                owner_email=row[7] if len(row) > 7 else None,
-                is_private=row[8] if len(row) > 8 else False,
-                last_done=_to_iso_date(row[9] if len(row) > 9 else None),
-            ) for row in rows
-        ]
-        return chores
+        cur.execute(query, params)
+        rows, next_cursor = _split_page(cur.fetchall(), limit)
+        chores = [chore_to_dict(row) for row in rows]
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if cursor is not None:
+            return fast_json_response({"items": chores, "next_cursor": next_cursor}, response)
+        return fast_json_response(chores, response)
     except Exception as e:
         logging.error(f"Error fetching archived chores: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch archived chores")
@@ -457,6 +689,24 @@ def get_version_info():
         "frontend_image": frontend_image
     }
 
+def _import_payload(payload, user_email):
+    """Bulk-load an import payload in one transaction; see app.importer."""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        imported_chores = import_chore_batch(cur, payload["chores"], user_email)
+        imported_logs = import_log_batch(cur, payload.get("logs") or [], user_email)
+        conn.commit()
+        bump_data_version()
+        return imported_chores, imported_logs
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+
 @api_router.post("/import")
 async def import_data(request: Request):
     """
@@ -464,6 +714,9 @@ async def import_data(request: Request):
     Expects a JSON object with:
     - 'chores': array of chore objects
     - 'logs' (optional): array of chore log objects
+
+    Chores and logs are COPYed into staging tables and merged set-wise, so
+    large backups take a few round trips rather than several per row.
     """
     try:
         import_data = await request.json()
@@ -472,114 +725,24 @@ async def import_data(request: Request):
         if not import_data.get("chores"):
             raise HTTPException(status_code=400, detail="No chores data found in the import file")
         
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        imported_chores = []
-        for chore in import_data["chores"]:
-            try:
-                # Check if chore with this ID already exists
-                if chore.get("id"):
-                    cur.execute("SELECT id FROM chores WHERE id = %s", (chore["id"],))
-                    if cur.fetchone():
-                        # Update existing chore
-                        cur.execute(
-                            """
-                            UPDATE chores 
-                            SET name = %s, interval_days = %s, due_date = %s, 
-                                is_private = %s, owner_email = %s, last_done = %s
-                            WHERE id = %s
-                            """,
-                            (
-                                chore["name"], 
-                                chore["interval_days"], 
-                                chore["due_date"],
-                                chore.get("is_private", False),
-                                user_email if chore.get("is_private", False) else None,
-                                chore.get("last_done"),
-                                chore["id"]
-                            )
-                        )
-                        imported_chores.append({"id": chore["id"], "status": "updated"})
-                        continue
-                
-                # Insert as new chore
-                cur.execute(
-                    """
-                    INSERT INTO chores (name, interval_days, due_date, archived, owner_email, is_private, last_done)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
-                    """,
-                    (
-                        chore["name"], 
-                        chore["interval_days"], 
-                        chore["due_date"],
-                        chore.get("archived", False),
-                        user_email if chore.get("is_private", False) else None,
-                        chore.get("is_private", False),
-                        chore.get("last_done"),
-                    )
-                )
-                new_id = cur.fetchone()[0]
-                imported_chores.append({"id": new_id, "status": "created"})
-            except Exception as e:
-                logging.error(f"Error importing chore {chore.get('name')}: {e}")
-                # Continue with next chore
-
-        imported_logs = []
-        logs_payload = import_data.get("logs", [])
-        for log in logs_payload:
-            try:
-                action_details = log.get("action_details") or log.get("details") or {}
-                if isinstance(action_details, str):
-                    try:
-                        action_details = json.loads(action_details)
-                    except json.JSONDecodeError:
-                        logging.warning("Received unparseable action_details string during import; storing raw value")
-                done_at = log.get("done_at")
-                if done_at:
-                    try:
-                        done_at = datetime.fromisoformat(done_at)
-                    except Exception:
-                        logging.warning(f"Invalid done_at format in imported log {log.get('id')}, using current time")
-                        done_at = datetime.utcnow()
-                cur.execute(
-                    """
-                    INSERT INTO chore_logs (chore_id, done_by, done_at, action_type, action_details)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    (
-                        log.get("chore_id"),
-                        log.get("done_by") or user_email,
-                        done_at or datetime.utcnow(),
-                        log.get("action_type") or "imported",
-                        json.dumps(action_details),
-                    ),
-                )
-                imported_logs.append({"chore_id": log.get("chore_id"), "status": "created"})
-            except Exception as e:
-                logging.error(f"Error importing log entry {log.get('id')}: {e}")
-                # Continue with next log
-        
-        conn.commit()
+        imported_chores, imported_logs = await run_in_threadpool(_import_payload, import_data, user_email)
         log_action(
             None,
             user_email,
             "import",
             action_details={
                 "imported_chores": imported_chores,
-                "imported_logs": len(imported_logs),
+                "imported_logs": imported_logs,
             },
         )
         
         return {
             "message": "Import successful",
             "imported_chores": len(imported_chores),
-            "imported_logs": len(imported_logs),
+            "imported_logs": imported_logs,
             "details": imported_chores,
         }
     except HTTPException:
-        if "conn" in locals():
-            conn.rollback()
         raise
     except Exception as e:
         logging.error(f"Error during import: {e}")
@@ -643,73 +806,3 @@ def export_data(request: Request):
     finally:
         cur.close()
         conn.close()
-
-@api_router.get("/chores/count")
-def get_chore_counts(request: Request):
-    """
-    Get total counts of chores in different categories:
-    - all: All non-archived chores
-    - overdue: Chores with due date in the past
-    - today: Chores due today
-    - tomorrow: Chores due tomorrow
-    - thisWeek: Chores due in the next week (excluding today and tomorrow)
-    - upcoming: Chores due beyond next week
-    """
-    user_email = request.headers.get("X-User-Email")
-    
-    # Get today's date for comparisons
-    today = date.today()
-    tomorrow = today + timedelta(days=1)
-    next_week = today + timedelta(days=7)
-    
-    conn = get_db_connection()
-    cur = conn.cursor()
-    try:
-        # Base query for all non-archived chores visible to the user
-        base_query = """
-            SELECT COUNT(*) 
-            FROM chores 
-            WHERE archived = FALSE AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %s))
-        """
-        
-        # Total non-archived chores
-        cur.execute(base_query, (user_email,))
-        total_count = cur.fetchone()[0]
-        
-        # Overdue chores
-        cur.execute(base_query + " AND due_date < %s", (user_email, today))
-        overdue_count = cur.fetchone()[0]
-        
-        # Due today
-        cur.execute(base_query + " AND due_date = %s", (user_email, today))
-        today_count = cur.fetchone()[0]
-        
-        # Due tomorrow
-        cur.execute(base_query + " AND due_date = %s", (user_email, tomorrow))
-        tomorrow_count = cur.fetchone()[0]
-        
-        # Due this week (after tomorrow and up to a week from today)
-        cur.execute(
-            base_query + " AND due_date > %s AND due_date <= %s", 
-            (user_email, tomorrow, next_week)
-        )
-        this_week_count = cur.fetchone()[0]
-        
-        # Upcoming (beyond next week)
-        cur.execute(base_query + " AND due_date > %s", (user_email, next_week))
-        upcoming_count = cur.fetchone()[0]
-        
-        return {
-            "all": total_count,
-            "overdue": overdue_count,
-            "today": today_count,
-            "tomorrow": tomorrow_count,
-            "thisWeek": this_week_count,
-            "upcoming": upcoming_count
-        }
-    except Exception as e:
-        logging.error(f"Error getting chore counts: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get chore counts")
-    finally:
-        cur.close()
-        conn.close()
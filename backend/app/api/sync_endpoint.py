@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+from datetime import date, datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.async_database import async_db_connection
+from app.data_version import conditional_get
+from app.serialization import CHORE_COLUMNS, chore_to_dict
+
+router = APIRouter()
+
+# A delta with more changed chores or logs than this is sent as a snapshot
+SYNC_MAX_CHANGES = int(os.getenv("SYNC_MAX_CHANGES", "5000"))
+
+LOG_COLUMNS = ("id", "chore_id", "done_by", "done_at", "action_details", "action_type")
+
+VISIBLE_CHORE_SQL = "(c.is_private = FALSE OR (c.is_private = TRUE AND c.owner_email = %(user_email)s))"
+_CHORE_SELECT = ", ".join(f"c.{column}" for column in CHORE_COLUMNS)
+_LOG_SELECT = ", ".join(f"l.{column}" for column in LOG_COLUMNS)
+
+# Taken before reading any rows: everything committed by now is visible to
+# the queries that follow, and anything still in flight has an ID >= xmin
+SYNC_POSITION_SQL = """
+    SELECT txid_snapshot_xmin(s), txid_snapshot_xmax(s), (SELECT min_seq FROM sync_horizon)
+    FROM txid_current_snapshot() AS s
+"""
+
+# Changed chores the user cannot see (any more) are returned as tombstones
+CHANGED_CHORES_SQL = f"""
+    SELECT {_CHORE_SELECT}, {VISIBLE_CHORE_SQL} AS visible
+    FROM chores c
+    WHERE c.change_seq >= %(since)s
+    ORDER BY c.change_seq, c.id
+    LIMIT %(limit)s
+"""
+
+SNAPSHOT_CHORES_SQL = f"""
+    SELECT {_CHORE_SELECT}, TRUE AS visible
+    FROM chores c
+    WHERE {VISIBLE_CHORE_SQL}
+    ORDER BY c.id
+"""
+
+NEW_LOGS_SQL = f"""
+    SELECT {_LOG_SELECT}
+    FROM chore_logs l
+    LEFT JOIN chores c ON l.chore_id = c.id
+    WHERE l.change_seq >= %(since)s
+      AND (c.id IS NULL OR {VISIBLE_CHORE_SQL})
+    ORDER BY l.change_seq, l.id
+    LIMIT %(limit)s
+"""
+
+TOMBSTONES_SQL = "SELECT entity, id FROM sync_tombstones WHERE change_seq >= %(since)s ORDER BY change_seq"
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _log(row):
+    log = {column: _iso(value) for column, value in zip(LOG_COLUMNS, row)}
+    details = log["action_details"]
+    if isinstance(details, str):
+        try:
+            log["action_details"] = json.loads(details)
+        except json.JSONDecodeError:
+            pass
+    elif details is None:
+        log["action_details"] = {}
+    return log
+
+
+def _cursor_is_usable(since, xmax, horizon):
+    """A cursor must come from this database and be newer than any pruned tombstone."""
+    return since is not None and horizon is not None and horizon <= since <= xmax
+
+
+@router.get("/sync")
+async def sync(request: Request, response: Response, since: Optional[int] = None):
+    """
+    Changes visible to the current user since a previous sync.
+
+    Pass the cursor from the previous response as since. The response holds
+    the chores created or changed since then (archived ones included, with
+    archived = true), the new logs, and under "removed" the IDs of chores and
+    logs that were deleted or that the user can no longer see; clients drop
+    removed chores together with their logs. Rows may be repeated across
+    syncs, so clients should upsert by id.
+
+    Without since, with a cursor too old to be answered from the retained
+    tombstones, or when more than SYNC_MAX_CHANGES rows changed, the response
+    is a snapshot instead ("snapshot": true): every visible chore and no logs.
+    Clients then replace their chores and reload logs from /api/logs.
+    """
+    user_email = request.headers.get("X-User-Email")
+    not_modified = conditional_get(request, response, user_email)
+    if not_modified:
+        return not_modified
+
+    params = {"user_email": user_email, "since": since, "limit": SYNC_MAX_CHANGES + 1}
+    try:
+        async with async_db_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(SYNC_POSITION_SQL)
+                cursor, xmax, horizon = await cur.fetchone()
+                result = None
+                if _cursor_is_usable(since, xmax, horizon):
+                    result = await _delta(cur, params)
+                if result is None:
+                    await cur.execute(SNAPSHOT_CHORES_SQL, params)
+                    chores = [chore_to_dict(row) for row in await cur.fetchall()]
+                    result = {"snapshot": True, "chores": chores, "logs": [], "removed": {"chores": [], "logs": []}}
+        return {"cursor": cursor, **result}
+    except Exception as e:
+        logging.error(f"Error syncing changes: {e}")
+        raise HTTPException(status_code=500, detail="Failed to sync changes")
+
+
+async def _delta(cur, params):
+    """The changes since params["since"], or None if there are too many to send."""
+    await cur.execute(CHANGED_CHORES_SQL, params)
+    chore_rows = await cur.fetchall()
+    await cur.execute(NEW_LOGS_SQL, params)
+    log_rows = await cur.fetchall()
+    if len(chore_rows) > SYNC_MAX_CHANGES or len(log_rows) > SYNC_MAX_CHANGES:
+        logging.info(f"Sync delta since {params['since']} is too large; sending a snapshot")
+        return None
+    await cur.execute(TOMBSTONES_SQL, params)
+    tombstones = await cur.fetchall()
+
+    removed = {"chores": [], "logs": []}
+    chores = []
+    for row in chore_rows:
+        if row[-1]:
+            chores.append(chore_to_dict(row))
+        else:
+            removed["chores"].append(row[0])
+    for entity, row_id in tombstones:
+        removed["chores" if entity == "chore" else "logs"].append(row_id)
+    return {"snapshot": False, "chores": chores, "logs": [_log(row) for row in log_rows], "removed": removed}
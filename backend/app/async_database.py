@@ -0,0 +1,78 @@
+"""
+Async data-access layer backed by a psycopg 3 connection pool.
+
+Read-heavy handlers use this instead of the psycopg2 pool in app.database so
+they can run as ``async def`` on the event loop rather than occupying a slot
+in Starlette's threadpool while waiting on Postgres.
+"""
+
+import logging
+from contextlib import asynccontextmanager
+
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+
+from app.database import (
+    DB_HOST,
+    DB_NAME,
+    DB_PASSWORD,
+    DB_POOL_MAX_LIFETIME,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_USER,
+)
+
+_async_pool = None
+
+
+def get_async_pool():
+    """Return the process-wide async pool, creating it (unopened) on first use."""
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = AsyncConnectionPool(
+            make_conninfo(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD),
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            max_lifetime=DB_POOL_MAX_LIFETIME,
+            timeout=DB_POOL_TIMEOUT,
+            check=AsyncConnectionPool.check_connection,
+            name="choremane-async",
+            open=False,
+        )
+    return _async_pool
+
+
+async def open_async_pool():
+    """Open the async pool; connections are established in the background."""
+    try:
+        await get_async_pool().open()
+    except Exception as e:
+        logging.error(f"Unable to open async database pool: {e}")
+
+
+async def close_async_pool():
+    global _async_pool
+    if _async_pool is not None:
+        pool, _async_pool = _async_pool, None
+        await pool.close()
+
+
+@asynccontextmanager
+async def async_db_connection():
+    """
+    Check out an async connection for the duration of the block.
+
+    The transaction is committed when the block exits cleanly and rolled back
+    if it raises.
+    """
+    pool = get_async_pool()
+    await pool.open()
+    async with pool.connection() as conn:
+        yield conn
+
+
+def get_async_pool_stats():
+    if _async_pool is None:
+        return {}
+    return _async_pool.get_stats()
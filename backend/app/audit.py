@@ -0,0 +1,232 @@
+"""
+Write-behind writer for chore_logs audit rows.
+
+log_action hands rows to a bounded in-process queue instead of doing an
+INSERT + COMMIT per mutation. A background thread drains the queue and writes
+the rows in multi-row INSERT batches, flushing whenever AUDIT_BATCH_SIZE rows
+are waiting or AUDIT_FLUSH_INTERVAL seconds have passed. When the queue is
+full, callers block for up to AUDIT_ENQUEUE_TIMEOUT seconds and then fall back
+to writing the row themselves, so a slow database pushes back on request
+handlers instead of growing memory. Shutdown drains whatever is still queued.
+
+Rows logged inside a caller's transaction are only queued once that
+transaction commits, so a rolled-back change leaves no audit row. Each row
+carries the time it was logged, which is inserted as done_at rather than the
+flush time.
+
+Action types listed in AUDIT_STRICT_ACTIONS bypass the queue and are written
+in the caller's transaction, so the audit row commits atomically with the
+change it describes. The default covers every action /undo can reverse
+(created, marked_done, updated, archived): their log row is the only handle
+for undoing them, so it must exist as soon as the change is visible and must
+not be lost to a crash or failed flush. "unarchived" and "undo" rows cannot
+themselves be undone, so they stay on the write-behind queue.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+
+from psycopg2.extras import execute_values
+
+from app.data_version import bump_data_version
+from app.database import get_db_connection
+
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_ENQUEUE_TIMEOUT = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT", "0.5"))
+AUDIT_STRICT_ACTIONS = frozenset(
+    action.strip() for action in os.getenv("AUDIT_STRICT_ACTIONS", "created,marked_done,updated,archived").split(",") if action.strip()
+)
+
+AUDIT_INSERT_SQL = "INSERT INTO chore_logs (chore_id, done_by, action_type, action_details, done_at) VALUES %s"
+
+_STOP = object()
+
+
+class AuditLogWriter:
+    """Bounded queue of (chore_id, done_by, action_type, action_details, done_at) rows and the thread draining it."""
+
+    def __init__(
+        self,
+        queue_size=AUDIT_QUEUE_SIZE,
+        batch_size=AUDIT_BATCH_SIZE,
+        flush_interval=AUDIT_FLUSH_INTERVAL,
+        enqueue_timeout=AUDIT_ENQUEUE_TIMEOUT,
+        connect=None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._connect = connect or get_db_connection
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._accepting = False
+
+        self._enqueued = 0
+        self._rejected = 0
+        self._written = 0
+        self._batches = 0
+        self._failed = 0
+
+    @property
+    def running(self):
+        return self._accepting
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._accepting = True
+            self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, row):
+        """
+        Queue one audit row. Returns False when the writer is stopped or the
+        queue stayed full for enqueue_timeout seconds; the caller should then
+        write the row synchronously.
+        """
+        if not self._accepting:
+            return False
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            logging.warning("Audit log queue is full; writing entry synchronously")
+            return False
+        with self._lock:
+            self._enqueued += 1
+        return True
+
+    def stop(self, timeout=None):
+        """Stop accepting rows, flush everything already queued and join the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._accepting = False
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logging.error("Audit log writer did not drain before shutdown timeout")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=wait)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if deadline is None:
+                    # The flush interval is measured from the oldest queued row
+                    deadline = time.monotonic() + self.flush_interval
+            if stopping:
+                batch.extend(self._drain())
+            for start in range(0, len(batch), self.batch_size):
+                self._flush(batch[start:start + self.batch_size])
+
+    def _drain(self):
+        rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return rows
+            if item is not _STOP:
+                rows.append(item)
+
+    def _flush(self, rows):
+        if not rows:
+            return
+        try:
+            self._insert(rows)
+        except Exception as e:
+            # One bad row (e.g. a chore deleted before the flush) must not drop
+            # the whole batch, so retry the rows one by one
+            logging.error(f"Audit log batch of {len(rows)} failed, retrying per row: {e}")
+            for row in rows:
+                try:
+                    self._insert([row])
+                except Exception as row_error:
+                    with self._lock:
+                        self._failed += 1
+                    logging.error(f"Dropping audit log entry {row!r}: {row_error}")
+
+    def _insert(self, rows):
+        conn = self._connect()
+        cur = conn.cursor()
+        try:
+            execute_values(cur, AUDIT_INSERT_SQL, rows, page_size=len(rows))
+            conn.commit()
+            bump_data_version()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            conn.close()
+        with self._lock:
+            self._written += len(rows)
+            self._batches += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "running": self._accepting,
+                "queued": self._queue.qsize(),
+                "enqueued": self._enqueued,
+                "rejected": self._rejected,
+                "written": self._written,
+                "batches": self._batches,
+                "failed": self._failed,
+            }
+
+
+_writer = None
+
+
+def get_audit_writer():
+    global _writer
+    if _writer is None:
+        _writer = AuditLogWriter()
+    return _writer
+
+
+def start_audit_writer():
+    get_audit_writer().start()
+
+
+def stop_audit_writer(timeout=10):
+    if _writer is not None:
+        _writer.stop(timeout)
+
+
+def audit_writer_running():
+    return _writer is not None and _writer.running
+
+
+def submit_audit_row(row):
+    """Queue a row if the writer is running; False means the caller must write it."""
+    if _writer is None:
+        return False
+    return _writer.submit(row)
+
+
+def get_audit_stats():
+    if _writer is None:
+        return {}
+    return _writer.stats()
@@ -1,16 +1,18 @@
 """Authentication module for the Choremane app."""
 
+import asyncio
+import hashlib
+import logging
 import os
-import json
-from datetime import datetime, timedelta
-from typing import Dict, List
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import jwt
 from jwt.algorithms import RSAAlgorithm
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2AuthorizationCodeBearer
-import httpx
-
+from app import http_client
 from app.models import User
 
 # Configure OAuth2 authentication
@@ -31,59 +33,263 @@ DEX_ISSUER_URL = os.getenv("DEX_ISSUER_URL", "https://dex.stillon.top")
 ALGORITHM = "RS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
-# Cache for JWKs
-jwks_cache = {"keys": [], "last_updated": None}
+# How often the background task refetches the JWKS, the age after which a
+# request refetches it itself, and the minimum gap between refetches
+# triggered by tokens signed with an unknown key ID
+JWKS_REFRESH_INTERVAL = int(os.getenv("JWKS_REFRESH_INTERVAL", "3600"))
+JWKS_MAX_AGE = int(os.getenv("JWKS_MAX_AGE", str(24 * 3600)))
+JWKS_MIN_REFRESH_INTERVAL = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "30"))
+# Verified tokens kept in memory; 0 disables the cache
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
 
 
-async def get_jwks():
+async def fetch_jwks() -> List[Dict]:
     """Fetch JWKs from DEX_ISSUER_URL."""
-    global jwks_cache
-    # Return cached JWKs if they exist and are not expired
-    if (
-        jwks_cache["last_updated"]
-        and jwks_cache["keys"]
-        and jwks_cache["last_updated"] > datetime.now() - timedelta(hours=24)
+    response = await http_client.request(
+        "GET", f"{DEX_ISSUER_URL}/.well-known/openid-configuration"
+    )
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not retrieve OpenID configuration from Dex",
+        )
+
+    oidc_config = response.json()
+    jwks_uri = oidc_config.get("jwks_uri")
+
+    if not jwks_uri:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="JWKS URI not found in OpenID configuration",
+        )
+
+    jwks_response = await http_client.request("GET", jwks_uri)
+    if jwks_response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not retrieve JWKS from Dex",
+        )
+
+    return jwks_response.json().get("keys", [])
+
+
+class JwksCache:
+    """
+    Signing keys by key ID, parsed once per fetch.
+
+    Refreshes are single-flight: callers that arrive while a fetch is running
+    wait for it and reuse its result instead of fetching again. Non-RSA keys
+    are kept as None so they can be rejected without a refetch. version is
+    bumped whenever a fetch drops or replaces a key, which invalidates tokens
+    verified with the old key set.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[List[Dict]]] = fetch_jwks,
+        max_age: float = JWKS_MAX_AGE,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_INTERVAL,
     ):
-        return jwks_cache["keys"]
+        self._fetch = fetch
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.keys: Dict[str, Optional[Any]] = {}
+        self.version = 0
+        self._jwks: Dict[str, Dict] = {}
+        self.last_updated: Optional[float] = None
+        self.fetches = 0
+        self._last_fetch_started: Optional[float] = None
+        self._generation = 0
+        self._last_error: Optional[Exception] = None
+        self._lock = asyncio.Lock()
+
+    def _load(self, jwks: List[Dict]):
+        keys = {}
+        jwks_by_kid = {}
+        for key in jwks:
+            kid = key.get("kid")
+            if not kid:
+                continue
+            jwks_by_kid[kid] = key
+            if key.get("kty") != "RSA":
+                keys[kid] = None
+                continue
+            try:
+                keys[kid] = RSAAlgorithm.from_jwk(key)
+            except jwt.InvalidKeyError as e:
+                logging.warning(f"Ignoring invalid JWK {kid}: {e}")
+        # New keys alone are not a rotation: tokens signed with the old ones stay valid
+        if any(jwks_by_kid.get(kid) != key for kid, key in self._jwks.items()):
+            self.version += 1
+            logging.info("JWKS signing keys rotated")
+        self._jwks = jwks_by_kid
+        self.keys = keys
+        self.last_updated = time.monotonic()
 
-    # Fetch JWKs from DEX
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{DEX_ISSUER_URL}/.well-known/openid-configuration"
+    async def refresh(self):
+        """Fetch and parse the key set, or wait for a fetch already running."""
+        generation = self._generation
+        async with self._lock:
+            if self._generation != generation:
+                # Share the outcome of the fetch that ran while we waited
+                if self._last_error is not None:
+                    raise self._last_error
+                return
+            self._last_fetch_started = time.monotonic()
+            self.fetches += 1
+            try:
+                self._load(await self._fetch())
+                self._last_error = None
+            except Exception as e:
+                self._last_error = e
+                raise
+            finally:
+                self._generation += 1
+
+    def is_stale(self) -> bool:
+        return self.last_updated is None or time.monotonic() - self.last_updated > self.max_age
+
+    def _may_refetch(self) -> bool:
+        return (
+            self._last_fetch_started is None
+            or time.monotonic() - self._last_fetch_started >= self.min_refresh_interval
         )
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Could not retrieve OpenID configuration from Dex",
-            )
 
-        oidc_config = response.json()
-        jwks_uri = oidc_config.get("jwks_uri")
+    async def get_key(self, kid: str):
+        """The parsed RSA key for kid, fetching the key set if needed."""
+        if self.is_stale():
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Stale keys are still better than failing every request
+                if not self.keys:
+                    raise
+                logging.error(f"JWKS refresh failed, using cached keys: {e}")
+        if kid not in self.keys and self._may_refetch():
+            # The issuer may have rotated its signing keys
+            await self.refresh()
 
-        if not jwks_uri:
+        if kid not in self.keys:
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="JWKS URI not found in OpenID configuration",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Key not found",
+                headers={"WWW-Authenticate": "Bearer"},
             )
-
-        jwks_response = await client.get(jwks_uri)
-        if jwks_response.status_code != 200:
+        key = self.keys[kid]
+        if key is None:
             raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Could not retrieve JWKS from Dex",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Key is not RSA",
+                headers={"WWW-Authenticate": "Bearer"},
             )
+        return key
 
-        jwks_cache["keys"] = jwks_response.json().get("keys", [])
-        jwks_cache["last_updated"] = datetime.now()
+    async def run_refresh_loop(self, interval: float = JWKS_REFRESH_INTERVAL):
+        """Refetch the key set every interval so requests never wait for it."""
+        while True:
+            await asyncio.sleep(interval)
+            # Nothing to keep fresh until a token has been verified (e.g. mock auth)
+            if self.last_updated is None:
+                continue
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.error(f"Background JWKS refresh failed: {e}")
 
-        return jwks_cache["keys"]
 
+class TokenCache:
+    """
+    Claims of verified tokens, kept until the token's exp.
 
-async def get_rsa_key(token: str, jwks: List[Dict]):
+    Clients send the same bearer token with every request, so this skips the
+    RS256 signature check for active sessions. Entries are keyed by a SHA-256
+    of the token, evicted least recently used beyond max_size, and ignored
+    once the JWKS version they were verified under has changed.
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Dict, float, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str, key_set_version: int) -> Optional[Dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            claims, expires_at, version = entry
+            if version == key_set_version and expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(claims)
+            del self._entries[key]
+            if version != key_set_version:
+                self.invalidations += 1
+        self.misses += 1
+        return None
+
+    def put(self, token: str, claims: Dict, key_set_version: int):
+        exp = claims.get("exp")
+        # Tokens without an expiry are verified every time
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (dict(claims), float(exp), key_set_version)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+jwks_cache = JwksCache()
+token_cache = TokenCache()
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def start_jwks_refresh():
+    global _refresh_task
+    if _refresh_task is None:
+        _refresh_task = asyncio.create_task(jwks_cache.run_refresh_loop())
+
+
+async def stop_jwks_refresh():
+    global _refresh_task
+    if _refresh_task is None:
+        return
+    _refresh_task.cancel()
+    try:
+        await _refresh_task
+    except asyncio.CancelledError:
+        pass
+    _refresh_task = None
+
+
+async def get_rsa_key(token: str):
     """Get the RSA key from JWKs matching the token's key ID."""
     try:
         unverified_header = jwt.get_unverified_header(token)
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token header",
@@ -98,27 +304,23 @@ async def get_rsa_key(token: str, jwks: List[Dict]):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    for key in jwks:
-        if key.get("kid") == kid:
-            if key.get("kty") != "RSA":
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Key is not RSA",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            return RSAAlgorithm.from_jwk(json.dumps(key))
-
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Key not found",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    return await jwks_cache.get_key(kid)
+
+
+def get_auth_stats():
+    return {
+        "token_cache": token_cache.stats(),
+        "jwks": {"keys": len(jwks_cache.keys), "fetches": jwks_cache.fetches, "version": jwks_cache.version},
+    }
 
 
 async def verify_token(token: str):
     """Verify the token against Dex JWKs."""
-    jwks = await get_jwks()
-    rsa_key = await get_rsa_key(token, jwks)
+    cached = token_cache.get(token, jwks_cache.version)
+    if cached is not None:
+        return cached
+
+    rsa_key = await get_rsa_key(token)
 
     try:
         payload = jwt.decode(
@@ -128,6 +330,7 @@ async def verify_token(token: str):
             audience=OAUTH_CLIENT_ID,
             issuer=DEX_ISSUER_URL,
         )
+        token_cache.put(token, payload, jwks_cache.version)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -135,7 +338,7 @@ async def verify_token(token: str):
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except jwt.JWTClaimsError:
+    except (jwt.InvalidAudienceError, jwt.InvalidIssuerError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect claims, please check the audience and issuer",
@@ -149,6 +352,26 @@ async def verify_token(token: str):
         )
 
 
+async def verify_id_token(id_token: str, issuer: str = DEX_ISSUER_URL, nonce: Optional[str] = None) -> Dict:
+    """
+    Validate the ID token returned to the login callback with the cached
+    signing keys: signature, issuer, audience, expiry and, when given, the
+    nonce of the login request. Raises on any failure.
+    """
+    rsa_key = await get_rsa_key(id_token)
+    claims = jwt.decode(
+        id_token,
+        rsa_key,
+        algorithms=[ALGORITHM],
+        audience=OAUTH_CLIENT_ID,
+        issuer=issuer,
+        options={"require": ["exp", "iss", "aud"]},
+    )
+    if nonce and claims.get("nonce") != nonce:
+        raise jwt.InvalidTokenError("ID token nonce does not match the login request")
+    return claims
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     """Get the current user from the token."""
     payload = await verify_token(token)
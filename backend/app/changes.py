@@ -0,0 +1,229 @@
+"""
+Real-time change feed.
+
+Triggers from migration 0005 NOTIFY the choremane_changes channel with a
+small JSON payload for every committed change to chores and chore_logs. Each
+app process holds one LISTEN connection (ChangeListener) and hands the events
+to a ChangeHub, which fans them out to the /ws subscribers allowed to see
+them:
+
+- shared chores, their logs and system logs go to everyone;
+- private chores and their logs go to the owner only. A chore that turns
+  private is announced to everyone else as "removed", without its data.
+
+Each subscriber has a bounded send buffer. A client that falls WS_SEND_BUFFER
+messages behind has its buffer dropped and replaced by a single "resync"
+message, telling it to refetch, so a slow client neither holds up the others
+nor grows memory. Everyone also gets "resync" after the listener reconnects,
+since notifications sent while it was down are lost.
+
+Every event also bumps the data version (app.data_version), so ETags notice
+writes made by other processes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+import psycopg
+from psycopg.conninfo import make_conninfo
+
+from app.data_version import bump_data_version
+from app.database import DB_HOST, DB_NAME, DB_PASSWORD, DB_USER
+
+CHANGES_CHANNEL = "choremane_changes"
+WS_SEND_BUFFER = int(os.getenv("WS_SEND_BUFFER", "100"))
+WS_HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "30"))
+CHANGES_RECONNECT_DELAY = float(os.getenv("CHANGES_RECONNECT_DELAY", "1"))
+CHANGES_MAX_RECONNECT_DELAY = 30
+
+RESYNC = json.dumps({"type": "resync"})
+HEARTBEAT = json.dumps({"type": "heartbeat"})
+PONG = json.dumps({"type": "pong"})
+
+# Payload fields used for filtering that subscribers do not get
+_CHORE_ROUTING_FIELDS = ("was_private", "previous_owner_email")
+_LOG_ROUTING_FIELDS = ("is_private", "owner_email")
+
+
+def _visible(is_private, owner_email, user_email):
+    """
+    The REST list queries' rule, is_private = FALSE OR (is_private = TRUE AND
+    owner_email = user): a NULL is_private is visible to no one.
+    """
+    return is_private is False or (is_private is True and user_email is not None and owner_email == user_email)
+
+
+def message_for(event, user_email):
+    """The message user_email may see for a change event, or None."""
+    if event.get("action") == "bulk":
+        return event
+    visible = _visible(event.get("is_private"), event.get("owner_email"), user_email)
+    if event.get("type") == "chore":
+        if visible:
+            return {key: value for key, value in event.items() if key not in _CHORE_ROUTING_FIELDS}
+        if "was_private" in event and _visible(event["was_private"], event.get("previous_owner_email"), user_email):
+            return {"type": "chore", "action": "removed", "id": event["id"]}
+        return None
+    # System logs have no chore and, as in GET /api/logs, go to everyone
+    if event.get("type") == "log" and (visible or event.get("chore_id") is None):
+        return {key: value for key, value in event.items() if key not in _LOG_ROUTING_FIELDS}
+    return None
+
+
+class Subscriber:
+    """One /ws client: its identity and a bounded buffer of serialized messages."""
+
+    def __init__(self, user_email, buffer_size=WS_SEND_BUFFER):
+        self.user_email = user_email
+        self.queue = asyncio.Queue(maxsize=buffer_size)
+        self.overflows = 0
+
+    def offer(self, message):
+        """Queue a message without waiting; on overflow drop the backlog for a resync."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            self.overflows += 1
+            return False
+
+
+class ChangeHub:
+    """Fans change events out to subscribers; used from the event loop only."""
+
+    def __init__(self, buffer_size=WS_SEND_BUFFER):
+        self.buffer_size = buffer_size
+        self._subscribers = set()
+        self.events = 0
+        self.messages = 0
+        self.overflows = 0
+
+    def subscribe(self, user_email):
+        subscriber = Subscriber(user_email, self.buffer_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event):
+        """Deliver event to every subscriber allowed to see it."""
+        self.events += 1
+        # Visibility depends only on the user, so build and serialize each
+        # distinct message once however many connections share it
+        serialized = {}
+        for subscriber in list(self._subscribers):
+            if subscriber.user_email not in serialized:
+                message = message_for(event, subscriber.user_email)
+                serialized[subscriber.user_email] = json.dumps(message) if message is not None else None
+            message = serialized[subscriber.user_email]
+            if message is not None:
+                self._offer(subscriber, message)
+
+    def broadcast(self, message):
+        """Queue an already serialized message for every subscriber."""
+        for subscriber in list(self._subscribers):
+            self._offer(subscriber, message)
+
+    def _offer(self, subscriber, message):
+        self.messages += 1
+        if not subscriber.offer(message):
+            self.overflows += 1
+
+    def stats(self):
+        return {
+            "subscribers": len(self._subscribers),
+            "events": self.events,
+            "messages": self.messages,
+            "overflows": self.overflows,
+        }
+
+
+class ChangeListener:
+    """Holds one LISTEN connection and publishes its notifications to a hub."""
+
+    def __init__(self, hub, conninfo=None, channel=CHANGES_CHANNEL):
+        self.hub = hub
+        self.conninfo = conninfo or make_conninfo(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+        self.channel = channel
+        self.listening = False
+        self.reconnects = 0
+
+    def handle(self, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logging.warning(f"Ignoring malformed change notification: {payload[:200]!r}")
+            return
+        bump_data_version()
+        self.hub.publish(event)
+
+    async def run(self):
+        delay = CHANGES_RECONNECT_DELAY
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self.conninfo, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {self.channel}")
+                    self.listening = True
+                    delay = CHANGES_RECONNECT_DELAY
+                    if connected_before:
+                        # Changes made while we were disconnected were not delivered
+                        self.reconnects += 1
+                        bump_data_version()
+                        self.hub.broadcast(RESYNC)
+                    connected_before = True
+                    logging.info(f"Listening for changes on {self.channel}")
+                    async for notify in conn.notifies():
+                        self.handle(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Change listener disconnected: {e}; retrying in {delay:.0f}s")
+            finally:
+                self.listening = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CHANGES_MAX_RECONNECT_DELAY)
+
+
+_hub = None
+_listener = None
+_listener_task = None
+
+
+def get_change_hub():
+    global _hub
+    if _hub is None:
+        _hub = ChangeHub()
+    return _hub
+
+
+def start_change_feed():
+    global _listener, _listener_task
+    if _listener_task is None:
+        _listener = ChangeListener(get_change_hub())
+        _listener_task = asyncio.create_task(_listener.run())
+
+
+async def stop_change_feed():
+    global _listener_task
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+    _listener_task = None
+
+
+def get_change_feed_stats():
+    stats = get_change_hub().stats()
+    stats["listening"] = _listener is not None and _listener.listening
+    stats["reconnects"] = _listener.reconnects if _listener is not None else 0
+    return stats
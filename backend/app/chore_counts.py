@@ -0,0 +1,154 @@
+"""
+Maintenance of the chore_due_counts summary table.
+
+GET /api/chores/count sums bucket counts from chore_due_counts, to which
+triggers on chores append signed deltas (migrations 0009 and 0010). A background task
+keeps it small and correct:
+
+- every CHORE_COUNTS_COMPACT_INTERVAL seconds it folds each key's deltas into
+  one row and drops keys that sum to zero, without blocking writers;
+- once a night, at CHORE_COUNTS_CHECK_HOUR local time, it recounts chores and
+  rebuilds the table if any key has drifted (for example after a restore
+  that bypassed triggers).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from app.async_database import async_db_connection
+from app.data_version import bump_data_version
+
+CHORE_COUNTS_COMPACT_INTERVAL = float(os.getenv("CHORE_COUNTS_COMPACT_INTERVAL", "300"))
+CHORE_COUNTS_CHECK_HOUR = int(os.getenv("CHORE_COUNTS_CHECK_HOUR", "3"))
+# Writers queue behind the check's lock request, so give up rather than stall them
+CHORE_COUNTS_CHECK_LOCK_TIMEOUT_MS = int(os.getenv("CHORE_COUNTS_CHECK_LOCK_TIMEOUT_MS", "5000"))
+
+# Deltas appended while this runs are outside its snapshot and survive it
+COMPACT_SQL = """
+    WITH folded AS (
+        DELETE FROM chore_due_counts
+        RETURNING scope, due_date, chores
+    ),
+    kept AS (
+        INSERT INTO chore_due_counts (scope, due_date, chores)
+        SELECT scope, due_date, sum(chores)
+        FROM folded
+        GROUP BY scope, due_date
+        HAVING sum(chores) <> 0
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM folded), (SELECT count(*) FROM kept)
+"""
+
+EXPECTED_COUNTS_SQL = """
+    SELECT chore_count_scope(is_private, owner_email) AS scope, due_date, count(*) AS chores
+    FROM chores
+    WHERE archived = FALSE AND chore_counted(is_private, owner_email)
+    GROUP BY 1, 2
+"""
+
+# Keys whose summed deltas differ from the raw table. Grouped rather than
+# joined, since the shared scope is NULL and GROUP BY, unlike =, matches it
+DRIFT_SQL = f"""
+    SELECT scope, due_date, sum(expected)::bigint, sum(actual)::bigint
+    FROM (
+        SELECT scope, due_date, chores AS expected, 0 AS actual FROM ({EXPECTED_COUNTS_SQL}) AS e
+        UNION ALL
+        SELECT scope, due_date, 0, chores FROM chore_due_counts
+    ) AS counts
+    GROUP BY scope, due_date
+    HAVING sum(expected) <> sum(actual)
+    ORDER BY 1, 2
+"""
+
+REBUILD_SQL = f"INSERT INTO chore_due_counts (scope, due_date, chores) {EXPECTED_COUNTS_SQL}"
+
+_maintenance_task = None
+_stats = {"compactions": 0, "folded_rows": 0, "checks": 0, "drifted_keys": 0, "failures": 0, "last_checked": None}
+
+
+async def compact_chore_due_counts():
+    """Fold every key's deltas into one row; returns how many rows that removed."""
+    async with async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(COMPACT_SQL)
+            deleted, kept = await cur.fetchone()
+    folded = deleted - kept
+    _stats["compactions"] += 1
+    _stats["folded_rows"] += folded
+    return folded
+
+
+async def check_chore_due_counts():
+    """
+    Compare chore_due_counts with chores and rebuild it, compacted, from the
+    raw table. Holds a SHARE lock on chores meanwhile so no trigger runs
+    mid-comparison; readers of the counts are not blocked. Returns the drifted keys as (scope, due_date, expected,
+    actual) tuples.
+    """
+    async with async_db_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(f"SET LOCAL lock_timeout = {CHORE_COUNTS_CHECK_LOCK_TIMEOUT_MS}")
+            await cur.execute("LOCK TABLE chores IN SHARE MODE")
+            # Waits out a running compaction, whose folded rows would otherwise survive the rebuild
+            await cur.execute("LOCK TABLE chore_due_counts IN EXCLUSIVE MODE")
+            await cur.execute(DRIFT_SQL)
+            drift = await cur.fetchall()
+            await cur.execute("DELETE FROM chore_due_counts")
+            await cur.execute(REBUILD_SQL)
+    _stats["checks"] += 1
+    _stats["drifted_keys"] += len(drift)
+    _stats["last_checked"] = time.time()
+    if drift:
+        bump_data_version()
+        logging.warning(f"chore_due_counts had drifted on {len(drift)} keys and was rebuilt: {drift[:10]}")
+    return drift
+
+
+def seconds_until(hour, now=None):
+    """Seconds from now until the next hour:00 local time."""
+    now = now or datetime.now()
+    next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+async def run_maintenance(interval: float = CHORE_COUNTS_COMPACT_INTERVAL, hour: int = CHORE_COUNTS_CHECK_HOUR):
+    next_check = time.monotonic() + seconds_until(hour)
+    while True:
+        await asyncio.sleep(max(0, min(interval, next_check - time.monotonic())))
+        try:
+            if time.monotonic() >= next_check:
+                next_check = time.monotonic() + seconds_until(hour)
+                await check_chore_due_counts()
+            else:
+                await compact_chore_due_counts()
+        except Exception as e:
+            _stats["failures"] += 1
+            logging.error(f"Chore count maintenance failed: {e}")
+
+
+def start_chore_counts_maintenance():
+    global _maintenance_task
+    if _maintenance_task is None:
+        _maintenance_task = asyncio.create_task(run_maintenance())
+
+
+async def stop_chore_counts_maintenance():
+    global _maintenance_task
+    if _maintenance_task is None:
+        return
+    _maintenance_task.cancel()
+    try:
+        await _maintenance_task
+    except asyncio.CancelledError:
+        pass
+    _maintenance_task = None
+
+
+def get_chore_counts_stats():
+    return dict(_stats)
@@ -0,0 +1,96 @@
+"""
+Data version and conditional GET support.
+
+Every write to chores or chore_logs calls bump_data_version() after it
+commits. Read endpoints tag their responses with a weak ETag derived from
+the current version, the request (path and query) and the caller's
+visibility scope, and answer a matching If-None-Match with 304 before
+touching the database.
+
+The version is read before the endpoint queries, and bumped only after the
+writer commits, so a race can cost an extra full response but never a
+stale 304. It is kept per process and the ETag carries a per-process boot ID,
+so tags from before a restart never match.
+
+Writes from other processes (other app workers or replicas, jobs, manual SQL)
+are seen through the change feed: app.changes bumps the version for every
+NOTIFY from the chores and chore_logs triggers, and again whenever its
+LISTEN connection reconnects, since notifications may have been missed.
+Conditional GET therefore relies on the change feed running (it is started
+in the app lifespan); without it only this process's own writes invalidate
+ETags.
+"""
+
+import hashlib
+import threading
+import uuid
+
+from fastapi import Response
+
+BOOT_ID = uuid.uuid4().hex[:8]
+
+_lock = threading.Lock()
+_version = 0
+_stats = {"requests": 0, "conditional": 0, "not_modified": 0}
+
+
+def bump_data_version():
+    global _version
+    with _lock:
+        _version += 1
+        return _version
+
+
+def current_data_version():
+    return _version
+
+
+def make_etag(version, request, *scope):
+    """Weak ETag for version, distinct per path, query string and scope."""
+    key = "\x1f".join(
+        [request.url.path, str(sorted(request.query_params.multi_items()))] + [str(part) for part in scope]
+    )
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return f'W/"{BOOT_ID}-{version}-{digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against etag (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def conditional_get(request, response, *scope):
+    """
+    Set the ETag for the current data version on response and return a 304
+    response if the client already holds it; otherwise return None and let
+    the endpoint build the body.
+
+    scope must cover everything besides the data and the request that the
+    body depends on: the user's visibility and, for date-relative results,
+    the date or time window.
+    """
+    etag = make_etag(current_data_version(), request, *scope)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("If-None-Match")
+    with _lock:
+        _stats["requests"] += 1
+        if if_none_match:
+            _stats["conditional"] += 1
+        matched = bool(if_none_match) and etag_matches(if_none_match, etag)
+        if matched:
+            _stats["not_modified"] += 1
+    if matched:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def get_conditional_stats():
+    with _lock:
+        stats = dict(_stats)
+    stats["version"] = _version
+    stats["not_modified_ratio"] = round(stats["not_modified"] / stats["requests"], 4) if stats["requests"] else None
+    return stats
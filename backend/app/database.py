@@ -1,4 +1,10 @@
+import logging
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import psycopg2
 
 # Environment-based configuration
@@ -7,9 +13,374 @@ DB_NAME = os.getenv("POSTGRES_DB", "choresdb")
 DB_USER = os.getenv("POSTGRES_USER", "admin")
 DB_PASSWORD = os.getenv("POSTGRES_PASSWORD", "password")
 
+# Connection pool sizing and lifecycle (seconds for all durations)
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30"))
 
-def get_db_connection():
-    conn = psycopg2.connect(
-        host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASSWORD
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+def _connect(**kwargs):
+    return psycopg2.connect(
+        host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASSWORD, **kwargs
     )
-    return conn
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled psycopg2 connection.
+
+    Everything is delegated to the underlying connection except close(),
+    which hands the connection back to the pool instead of closing it.
+    Special methods bypass __getattr__, so the transaction context
+    (with conn: commits or rolls back, but keeps the connection) is
+    forwarded explicitly.
+
+    after_commit() registers a callback to run once the current transaction
+    commits; rollback() and close() discard pending callbacks.
+    """
+
+    def __init__(self, pool, conn, created_at):
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+        self._released = False
+        self._after_commit = []
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            result = self._conn.__exit__(exc_type, exc_value, traceback)
+        except Exception:
+            self._after_commit.clear()
+            raise
+        if exc_type is None:
+            self._run_after_commit()
+        else:
+            self._after_commit.clear()
+        return result
+
+    def after_commit(self, callback):
+        self._after_commit.append(callback)
+
+    def commit(self):
+        try:
+            self._conn.commit()
+        except Exception:
+            self._after_commit.clear()
+            raise
+        self._run_after_commit()
+
+    def rollback(self):
+        self._after_commit.clear()
+        self._conn.rollback()
+
+    def _run_after_commit(self):
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logging.error(f"After-commit callback failed: {e}")
+
+    @property
+    def raw_connection(self):
+        return self._conn
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        self._after_commit.clear()
+        self._pool._release(self._conn, self._created_at)
+
+
+class ConnectionPool:
+    """
+    Thread-safe psycopg2 connection pool.
+
+    - Keeps between min_size and max_size physical connections.
+    - Connections idle for longer than health_check_interval are probed with
+      SELECT 1 before being handed out; broken ones are replaced.
+    - Connections older than max_lifetime are closed instead of reused.
+    - getconn() waits up to timeout seconds for a free slot, then raises PoolTimeout.
+    """
+
+    def __init__(
+        self,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        max_lifetime=DB_POOL_MAX_LIFETIME,
+        timeout=DB_POOL_TIMEOUT,
+        health_check_interval=DB_POOL_HEALTH_CHECK_INTERVAL,
+        connect=None,
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Invalid pool size: require 0 <= min_size <= max_size and max_size >= 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._connect = connect or _connect
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, created_at, last_used)
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._opened = 0
+        self._discarded = 0
+        self._health_check_failures = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+    def open(self):
+        """Pre-fill the pool up to min_size connections."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            now = time.monotonic()
+            with self._cond:
+                self._opened += 1
+                self._idle.append((conn, now, now))
+                self._cond.notify()
+
+    def getconn(self, timeout=None):
+        """Check out a connection, waiting up to timeout seconds for a free slot."""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            candidate = None
+            reserve_new = False
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"Timed out after {timeout:.1f}s waiting for a database connection "
+                            f"(pool max_size={self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                    if self._closed:
+                        raise PoolTimeout("Connection pool is closed")
+                if self._idle:
+                    candidate = self._idle.pop()
+                else:
+                    self._size += 1
+                    reserve_new = True
+                self._in_use += 1
+
+            try:
+                if reserve_new:
+                    conn = self._connect()
+                    created_at = time.monotonic()
+                    with self._cond:
+                        self._opened += 1
+                else:
+                    conn, created_at, last_used = candidate
+                    if not self._is_usable(conn, created_at, last_used):
+                        self._discard(conn)
+                        continue
+            except Exception:
+                with self._cond:
+                    self._in_use -= 1
+                    if reserve_new:
+                        self._size -= 1
+                    self._cond.notify()
+                raise
+
+            elapsed = time.monotonic() - started
+            with self._cond:
+                self._checkouts += 1
+                self._checkout_time_total += elapsed
+                self._checkout_time_max = max(self._checkout_time_max, elapsed)
+            return PooledConnection(self, conn, created_at)
+
+    def _is_usable(self, conn, created_at, last_used):
+        now = time.monotonic()
+        if getattr(conn, "closed", 0):
+            return False
+        if self.max_lifetime and now - created_at > self.max_lifetime:
+            return False
+        if self.health_check_interval is not None and now - last_used >= self.health_check_interval:
+            try:
+                cur = conn.cursor()
+                try:
+                    cur.execute("SELECT 1")
+                finally:
+                    cur.close()
+                conn.rollback()
+            except Exception as e:
+                logging.warning(f"Discarding pooled connection that failed health check: {e}")
+                with self._cond:
+                    self._health_check_failures += 1
+                return False
+        return True
+
+    def _discard(self, conn):
+        """Close a checked-out connection and free its slot."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._in_use -= 1
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    def _release(self, conn, created_at):
+        reusable = not self._closed and not getattr(conn, "closed", 0)
+        if reusable and self.max_lifetime and time.monotonic() - created_at > self.max_lifetime:
+            reusable = False
+        if reusable:
+            try:
+                # Never hand out a connection with a half-finished transaction
+                conn.rollback()
+            except Exception:
+                reusable = False
+        if not reusable:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        """Close all idle connections; checked-out ones are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "connections_opened": self._opened,
+                "connections_discarded": self._discarded,
+                "health_check_failures": self._health_check_failures,
+                "checkout_latency_avg_ms": round(
+                    (self._checkout_time_total / self._checkouts) * 1000, 3
+                ) if self._checkouts else 0.0,
+                "checkout_latency_max_ms": round(self._checkout_time_max * 1000, 3),
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def get_db_connection():
+    """
+    Check out a pooled connection.
+
+    Callers keep using conn.close() when done; it returns the connection to the
+    pool rather than tearing down the TCP session.
+    """
+    return get_pool().getconn()
+
+
+def get_unpooled_connection(**kwargs):
+    """
+    Open a connection outside the pool, for long-lived work such as a
+    streaming download that would otherwise hold a pool slot for its whole
+    duration. Keyword arguments go to psycopg2.connect; conn.close()
+    disconnects.
+    """
+    return _connect(**kwargs)
+
+
+@contextmanager
+def db_connection():
+    """Context manager yielding a pooled connection and always releasing it."""
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def get_db():
+    """FastAPI dependency yielding a pooled connection for the request."""
+    with db_connection() as conn:
+        yield conn
+
+
+def open_pool():
+    """Warm the pool up to its minimum size; failures are logged, not raised."""
+    try:
+        get_pool().open()
+    except Exception as e:
+        logging.error(f"Unable to pre-fill database connection pool: {e}")
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def get_pool_stats():
+    return get_pool().stats()
@@ -0,0 +1,104 @@
+"""
+Shared HTTP client for outbound calls to the identity provider.
+
+One httpx.AsyncClient per process keeps connections to Dex alive between
+calls, so JWKS fetches and token refreshes do not pay for a new TCP and TLS
+handshake each time. It is opened and closed by the FastAPI lifespan, like
+the database pools.
+
+Requests that never reached the server (connect errors, pool timeouts) are
+retried with exponential backoff for any method. Other failures and 502/503/504
+responses are retried only for idempotent methods: re-posting a refresh token
+that Dex already accepted would fail, since Dex rotates refresh tokens.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+
+import httpx
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "120"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.2"))
+# HTTP/2 needs the h2 package (httpx[http2]); fall back to HTTP/1.1 keep-alive without it
+HTTP2 = os.getenv("HTTP2", "true").lower() == "true" and importlib.util.find_spec("h2") is not None
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+# Raised before the request was sent, so retrying cannot repeat a side effect
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+_client = None
+_stats = {"requests": 0, "retries": 0, "failures": 0}
+
+
+def create_http_client(**kwargs):
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=HTTP2,
+        **kwargs,
+    )
+
+
+def get_http_client():
+    """Return the process-wide client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+def open_http_client():
+    get_http_client()
+    logging.info(f"Shared HTTP client ready (http2={HTTP2})")
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+async def request(method, url, retries=HTTP_RETRIES, client=None, **kwargs):
+    """
+    Send a request with the shared client, retrying transient failures.
+
+    Returns the last response, whatever its status; raises the last
+    httpx.TransportError if every attempt failed to get one.
+    """
+    client = client or get_http_client()
+    method = method.upper()
+    idempotent = method in IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        _stats["requests"] += 1
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt >= retries or not (idempotent or isinstance(e, _NOT_SENT_ERRORS)):
+                _stats["failures"] += 1
+                raise
+            logging.warning(f"{method} {url} failed ({type(e).__name__}), retrying")
+        else:
+            if attempt >= retries or not idempotent or response.status_code not in RETRY_STATUS_CODES:
+                return response
+            logging.warning(f"{method} {url} returned {response.status_code}, retrying")
+        _stats["retries"] += 1
+        await asyncio.sleep(HTTP_RETRY_BACKOFF * 2**attempt)
+        attempt += 1
+
+
+def get_http_client_stats():
+    return {**_stats, "http2": HTTP2, "open": _client is not None and not _client.is_closed}
@@ -0,0 +1,524 @@
+"""
+Background import/export jobs.
+
+Large imports and exports are queued as jobs instead of running inside the
+HTTP request. A pool of worker threads claims queued jobs from a JobStore,
+runs them and records progress as they go, so clients can poll
+GET /api/jobs/{id} instead of holding a request open past proxy timeouts.
+
+Two stores are available, selected with JOB_BACKEND:
+
+- "memory": jobs live in this process only and are lost on restart.
+  Finished jobs are forgotten after JOB_RETENTION_SECONDS, or once more than
+  JOB_MEMORY_MAX_FINISHED have piled up.
+- "postgres": jobs live in the jobs table. Workers claim them with
+  FOR UPDATE SKIP LOCKED, so several processes can share the queue. A
+  running job whose heartbeat is older than JOB_LEASE_SECONDS is claimed
+  again, which resumes work orphaned by a restart (up to JOB_MAX_ATTEMPTS
+  tries). Imports commit once at the end, so a retried import never applies
+  rows twice.
+
+While a job runs, a heartbeat thread refreshes its lease every
+JOB_HEARTBEAT_INTERVAL seconds whether or not it reports progress. Each
+claim bumps the job's attempts, which doubles as the claim token: heartbeat,
+progress, complete and fail only touch the job while it is still running
+under the same attempt, so a worker that lost its lease cannot overwrite the
+new claimant's result.
+
+Uploaded import files and export results are kept under JOBS_DIR, which must
+be shared between replicas when the postgres backend is used by more than one.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from app.data_version import bump_data_version
+from app.database import get_db_connection
+from app.utils import log_action
+
+JOB_BACKEND = os.getenv("JOB_BACKEND", "memory")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOBS_DIR = os.getenv("JOBS_DIR", "/tmp/choremane-jobs")
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", str(JOB_LEASE_SECONDS / 3)))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+JOB_MEMORY_MAX_FINISHED = int(os.getenv("JOB_MEMORY_MAX_FINISHED", "1000"))
+
+# Minimum seconds between progress writes for one job
+PROGRESS_INTERVAL = 1.0
+IMPORT_READ_SIZE = 64 * 1024
+
+JOB_COLUMNS = (
+    "id", "kind", "status", "user_email", "params", "progress", "result", "result_path", "error", "attempts",
+    "created_at", "started_at", "finished_at", "heartbeat_at",
+)
+
+
+def _new_job(kind, user_email, params):
+    return {
+        "id": str(uuid.uuid4()),
+        "kind": kind,
+        "status": "queued",
+        "user_email": user_email,
+        "params": params,
+        "progress": {},
+        "result": None,
+        "result_path": None,
+        "error": None,
+        "attempts": 0,
+        "created_at": datetime.utcnow(),
+        "started_at": None,
+        "finished_at": None,
+        "heartbeat_at": None,
+    }
+
+
+def _remove_file(path):
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Unable to remove job file {path}: {e}")
+
+
+def _remove_input(job):
+    """
+    Delete a job's uploaded input (an import's params["path"]). Only called
+    once the job has finished under the caller's claim: a worker that lost
+    its claim must leave the file for the new claimant's retry.
+    """
+    _remove_file(job["params"].get("path"))
+
+
+class InMemoryJobStore:
+    """
+    Job store for a single process; jobs do not survive a restart.
+
+    Finished jobs, and their result files, are dropped once older than
+    retention_seconds or when more than max_finished of them are kept.
+    """
+
+    def __init__(self, retention_seconds=JOB_RETENTION_SECONDS, max_finished=JOB_MEMORY_MAX_FINISHED):
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, kind, user_email, params):
+        job = _new_job(kind, user_email, params)
+        with self._lock:
+            self._prune()
+            self._jobs[job["id"]] = job
+        return dict(job)
+
+    def _prune(self):
+        finished = sorted((job for job in self._jobs.values() if job["finished_at"]), key=lambda j: j["finished_at"])
+        excess = len(finished) - self.max_finished
+        expired_before = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        for n, job in enumerate(finished):
+            if n >= excess and job["finished_at"] >= expired_before:
+                break
+            del self._jobs[job["id"]]
+            _remove_file(job["result_path"])
+
+    def _claimed(self, job):
+        """The stored job if job's claim on it is still current, else None."""
+        stored = self._jobs.get(job["id"])
+        if stored is None or stored["status"] != "running" or stored["attempts"] != job["attempts"]:
+            return None
+        return stored
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def claim(self):
+        with self._lock:
+            queued = [job for job in self._jobs.values() if job["status"] == "queued"]
+            if not queued:
+                return None
+            job = min(queued, key=lambda j: j["created_at"])
+            now = datetime.utcnow()
+            job.update(status="running", started_at=job["started_at"] or now, heartbeat_at=now)
+            job["attempts"] += 1
+            return dict(job)
+
+    def _update_claimed(self, job, **values):
+        with self._lock:
+            stored = self._claimed(job)
+            if stored is None:
+                return False
+            stored.update(values)
+            return True
+
+    def heartbeat(self, job):
+        return self._update_claimed(job, heartbeat_at=datetime.utcnow())
+
+    def update_progress(self, job, progress):
+        return self._update_claimed(job, progress=dict(progress), heartbeat_at=datetime.utcnow())
+
+    def complete(self, job, result, result_path=None):
+        return self._update_claimed(
+            job, status="succeeded", result=result, result_path=result_path, finished_at=datetime.utcnow()
+        )
+
+    def fail(self, job, error):
+        return self._update_claimed(job, status="failed", error=error, finished_at=datetime.utcnow())
+
+
+class PostgresJobStore:
+    """Job store backed by the jobs table (migration 0003); shared by every process using the database."""
+
+    # Oldest queued job, or a running one whose worker stopped heartbeating
+    CLAIM_SQL = f"""
+        UPDATE jobs
+        SET status = 'running',
+            started_at = COALESCE(started_at, %(now)s),
+            heartbeat_at = %(now)s,
+            attempts = attempts + 1
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE status = 'queued' OR (status = 'running' AND heartbeat_at < %(stale_before)s)
+            ORDER BY created_at
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING {", ".join(JOB_COLUMNS)}
+    """
+
+    # Matches the job only while the caller's claim (its attempt) is current
+    CLAIMED_SQL = "id = %(id)s AND status = 'running' AND attempts = %(attempts)s"
+
+    def __init__(self, connect=None, lease_seconds=JOB_LEASE_SECONDS):
+        self._connect = connect or get_db_connection
+        self.lease_seconds = lease_seconds
+
+    def _execute(self, query, params=None, fetch=False):
+        conn = self._connect()
+        cur = conn.cursor()
+        try:
+            cur.execute(query, params)
+            result = cur.fetchone() if fetch else cur.rowcount
+            conn.commit()
+            return result
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            conn.close()
+
+    @staticmethod
+    def _row_to_job(row):
+        if row is None:
+            return None
+        job = dict(zip(JOB_COLUMNS, row))
+        for key in ("params", "progress", "result"):
+            if isinstance(job[key], str):
+                job[key] = json.loads(job[key])
+        return job
+
+    def create(self, kind, user_email, params):
+        job = _new_job(kind, user_email, params)
+        self._execute(
+            """
+            INSERT INTO jobs (id, kind, status, user_email, params, progress, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            (job["id"], kind, job["status"], user_email, json.dumps(params), "{}", job["created_at"]),
+        )
+        return job
+
+    def get(self, job_id):
+        return self._row_to_job(
+            self._execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = %s", (job_id,), fetch=True)
+        )
+
+    def claim(self):
+        now = datetime.utcnow()
+        row = self._execute(
+            self.CLAIM_SQL, {"now": now, "stale_before": now - timedelta(seconds=self.lease_seconds)}, fetch=True
+        )
+        return self._row_to_job(row)
+
+    def _update_claimed(self, job, assignments, **values):
+        """Apply assignments to a job the caller still holds; False once its claim has moved on."""
+        values.update(id=job["id"], attempts=job["attempts"], now=datetime.utcnow())
+        return self._execute(f"UPDATE jobs SET {assignments} WHERE {self.CLAIMED_SQL}", values) == 1
+
+    def heartbeat(self, job):
+        return self._update_claimed(job, "heartbeat_at = %(now)s")
+
+    def update_progress(self, job, progress):
+        return self._update_claimed(
+            job, "progress = %(progress)s, heartbeat_at = %(now)s", progress=json.dumps(progress)
+        )
+
+    def complete(self, job, result, result_path=None):
+        return self._update_claimed(
+            job,
+            "status = 'succeeded', result = %(result)s, result_path = %(result_path)s, finished_at = %(now)s",
+            result=json.dumps(result),
+            result_path=result_path,
+        )
+
+    def fail(self, job, error):
+        return self._update_claimed(job, "status = 'failed', error = %(error)s, finished_at = %(now)s", error=error)
+
+
+class JobHeartbeat:
+    """
+    Refreshes a claimed job's lease from its own thread every interval
+    seconds while the job runs, independent of progress reports.
+    """
+
+    def __init__(self, store, job, interval=JOB_HEARTBEAT_INTERVAL):
+        self._store = store
+        self._job = job
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name=f"job-heartbeat-{self._job['id']}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            try:
+                if not self._store.heartbeat(self._job):
+                    logging.warning(f"Job {self._job['id']} was claimed by another worker")
+                    return
+            except Exception as e:
+                logging.error(f"Heartbeat for job {self._job['id']} failed: {e}")
+
+
+class ProgressReporter:
+    """Accumulates a job's progress and writes it to the store at most once per PROGRESS_INTERVAL."""
+
+    def __init__(self, store, job, interval=PROGRESS_INTERVAL):
+        self._store = store
+        self._job = job
+        self._interval = interval
+        self._last_write = 0.0
+        self.progress = {}
+
+    def update(self, force=False, **values):
+        self.progress.update(values)
+        now = time.monotonic()
+        if force or now - self._last_write >= self._interval:
+            self._last_write = now
+            self._store.update_progress(self._job, self.progress)
+
+
+def run_import_job(job, reporter):
+    """Load an uploaded import file with StreamingImport in one transaction."""
+    from app.importer import StreamingImport
+
+    path = job["params"]["path"]
+    total_bytes = os.path.getsize(path)
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        importer = StreamingImport(cur, job["user_email"])
+        read = 0
+        with open(path, "rb") as upload:
+            while True:
+                chunk = upload.read(IMPORT_READ_SIZE)
+                if not chunk:
+                    break
+                importer.feed(chunk)
+                read += len(chunk)
+                reporter.update(rows=sum(importer.seen.values()), bytes=read, total_bytes=total_bytes)
+        report = importer.finish()
+        if not importer.seen["chores"]:
+            raise ValueError("No chores data found in the import file")
+        conn.commit()
+        bump_data_version()
+        reporter.update(force=True, rows=sum(importer.seen.values()), bytes=read, total_bytes=total_bytes)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+    log_action(
+        None,
+        job["user_email"],
+        "import",
+        action_details={"imported_chores": report["imported_chores"], "imported_logs": report["imported_logs"]},
+    )
+    return report, None
+
+
+def run_export_job(job, reporter):
+    """Write an export stream to a file under JOBS_DIR."""
+    from app.api.export_endpoint import export_stream
+
+    params = job["params"]
+    suffix = params["format"] + (".gz" if params.get("gzip") else "")
+    # Per attempt, so a worker that lost its claim never writes the new claimant's file
+    path = os.path.join(JOBS_DIR, f"{job['id']}-{job['attempts']}.export.{suffix}")
+    rows = 0
+
+    def on_batch(count):
+        nonlocal rows
+        rows += count
+        reporter.update(rows=rows)
+
+    conn = get_db_connection()
+    try:
+        with open(path, "wb") as output:
+            for chunk in export_stream(
+                conn, job["user_email"], params["dataset"], params["format"], params.get("gzip", False),
+                on_batch=on_batch,
+            ):
+                output.write(chunk)
+    finally:
+        conn.rollback()
+        conn.close()
+    reporter.update(force=True, rows=rows, bytes=os.path.getsize(path))
+    return {"rows": rows, "bytes": os.path.getsize(path)}, path
+
+
+JOB_HANDLERS = {"import": run_import_job, "export": run_export_job}
+
+
+class JobWorkerPool:
+    """Worker threads that claim jobs from a store and run them."""
+
+    def __init__(self, store, workers=JOB_WORKERS, poll_interval=JOB_POLL_INTERVAL, handlers=None,
+                 max_attempts=JOB_MAX_ATTEMPTS, heartbeat_interval=JOB_HEARTBEAT_INTERVAL):
+        self.store = store
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.handlers = handlers or JOB_HANDLERS
+        self.max_attempts = max_attempts
+        self.heartbeat_interval = heartbeat_interval
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self):
+        """Wake idle workers after a job has been queued."""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        """Stop claiming jobs and wait for running ones to finish."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                job = self.store.claim()
+            except Exception as e:
+                logging.error(f"Unable to claim job: {e}")
+                job = None
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self.run_job(job)
+
+    def run_job(self, job):
+        if job["attempts"] > self.max_attempts:
+            self._fail(job, f"Gave up after {self.max_attempts} attempts")
+            return
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            self._fail(job, f"Unknown job kind {job['kind']!r}")
+            return
+        logging.info(f"Running {job['kind']} job {job['id']} (attempt {job['attempts']})")
+        try:
+            with JobHeartbeat(self.store, job, self.heartbeat_interval):
+                result, result_path = handler(job, ProgressReporter(self.store, job))
+            completed = self.store.complete(job, result, result_path)
+        except Exception as e:
+            logging.error(f"Job {job['id']} failed: {e}")
+            self._fail(job, str(e))
+            return
+        if completed:
+            logging.info(f"Job {job['id']} succeeded")
+            _remove_input(job)
+        else:
+            logging.warning(f"Job {job['id']} lost its claim; discarding result of attempt {job['attempts']}")
+            _remove_file(result_path)
+
+    def _fail(self, job, error):
+        if self.store.fail(job, error):
+            _remove_input(job)
+        else:
+            logging.warning(f"Job {job['id']} lost its claim; failure of attempt {job['attempts']} not recorded")
+
+
+def job_status(job):
+    """Public view of a job for GET /api/jobs/{id}, including throughput."""
+    started, finished = job["started_at"], job["finished_at"]
+    elapsed = ((finished or datetime.utcnow()) - started).total_seconds() if started else None
+    rows = job["progress"].get("rows")
+    throughput = round(rows / elapsed, 1) if rows is not None and elapsed else None
+    status = {
+        key: job[key].isoformat() if isinstance(job[key], datetime) else job[key]
+        for key in ("id", "kind", "status", "created_at", "started_at", "finished_at", "progress", "result", "error")
+    }
+    status.update(elapsed_seconds=elapsed, rows_per_second=throughput)
+    if job["status"] == "succeeded" and job["result_path"]:
+        status["result_url"] = f"/api/jobs/{job['id']}/result"
+    return status
+
+
+_store = None
+_pool = None
+
+
+def get_job_store():
+    global _store
+    if _store is None:
+        _store = PostgresJobStore() if JOB_BACKEND == "postgres" else InMemoryJobStore()
+    return _store
+
+
+def get_job_pool():
+    global _pool
+    if _pool is None:
+        _pool = JobWorkerPool(get_job_store())
+    return _pool
+
+
+def start_job_workers():
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    get_job_pool().start()
+
+
+def stop_job_workers(timeout=30):
+    if _pool is not None:
+        _pool.stop(timeout)
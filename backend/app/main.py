@@ -1,137 +1,59 @@
-﻿import logging
+﻿import asyncio
+import logging
 import os
+from contextlib import asynccontextmanager
 
 from authlib.integrations.starlette_client import OAuth, OAuthError
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi_mcp import FastApiMCP
-import httpx
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.api.auth_routes import auth_router
+from app.api.changes_endpoint import router as changes_router
 from app.api.mcp_routes import router as mcp_router
 from app.api.routes import api_router
-from app.auth import get_current_user
-from app.database import get_db_connection
+from app.async_database import close_async_pool, open_async_pool
+from app.audit import start_audit_writer, stop_audit_writer
+from app.changes import start_change_feed, stop_change_feed
+from app.chore_counts import start_chore_counts_maintenance, stop_chore_counts_maintenance
+from app.auth import get_current_user, start_jwks_refresh, stop_jwks_refresh, verify_id_token
+from app.database import close_pool, get_db_connection, open_pool
+from app.http_client import close_http_client, open_http_client, request as http_request
+from app.jobs import start_job_workers, stop_job_workers
+from app.migrations import check_schema_version
 from app.models import User
 from app.mock_auth import mock_login, mock_login_page, mock_callback, mock_refresh
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def run_migrations():
-    """Run database migrations on startup"""
-    logging.info("Running database migrations...")
-    conn = None
-    cur = None
-    try:
-        try:
-            conn = get_db_connection()
-            cur = conn.cursor()
-        except Exception as e:
-            logging.error(f"Skipping migrations: unable to connect to database ({e})")
-            return
-
-        # Create chores table if it doesn't exist
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS chores (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                interval_days INT NOT NULL,
-                due_date DATE NOT NULL,
-                done BOOLEAN DEFAULT FALSE,
-                done_by VARCHAR(255),
-                last_done DATE,
-                owner_email VARCHAR(255),
-                is_private BOOLEAN DEFAULT FALSE,
-                archived BOOLEAN DEFAULT FALSE
-            )
-        """)
-        conn.commit()
-        logging.info("Chores table created or already exists")
-
-        # Create chore_logs table if it doesn't exist
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS chore_logs (
-                id SERIAL PRIMARY KEY,
-                chore_id INT,
-                done_by VARCHAR(255),
-                done_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                action_type VARCHAR(50) NOT NULL,
-                action_details JSON DEFAULT NULL,
-                FOREIGN KEY (chore_id) REFERENCES chores (id) ON DELETE CASCADE
-            )
-        """)
-        conn.commit()
-        logging.info("Chore logs table created or already exists")
-
-        # Check if chore_logs.chore_id allows NULL values
-        cur.execute("""
-            SELECT is_nullable
-            FROM information_schema.columns
-            WHERE table_name = 'chore_logs' AND column_name = 'chore_id'
-        """)
-        result = cur.fetchone()
-        if result and result[0] == 'NO':  # If NOT NULL constraint exists
-            logging.info("Applying migration: Allow NULL for chore_id in chore_logs")
-            cur.execute("ALTER TABLE chore_logs ALTER COLUMN chore_id DROP NOT NULL")
-            conn.commit()
-            logging.info("Migration completed successfully")
-        else:
-            logging.info("Migration already applied or not needed")
-
-        # Ensure last_done column exists for chores table
-        cur.execute("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'chores' AND column_name = 'last_done'
-        """)
-        has_last_done = cur.fetchone()
-        if not has_last_done:
-            logging.info("Applying migration: add last_done column to chores")
-            cur.execute("ALTER TABLE chores ADD COLUMN last_done DATE")
-            conn.commit()
-            logging.info("last_done column added to chores table")
-        else:
-            logging.info("last_done column already present on chores table")
-
-        # Check if users table exists
-        cur.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables
-                WHERE table_name = 'users'
-            )
-        """)
-        table_exists = cur.fetchone()[0]
-
-        if not table_exists:
-            logging.info("Creating users table")
-            cur.execute("""
-                CREATE TABLE users (
-                    email VARCHAR(255) PRIMARY KEY,
-                    name VARCHAR(255),
-                    given_name VARCHAR(255),
-                    family_name VARCHAR(255),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_login TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            conn.commit()
-            logging.info("Users table created successfully")
-    except Exception as e:
-        logging.error(f"Migration failed: {e}")
-        if conn:
-            conn.rollback()
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
-# Run migrations on startup
-run_migrations()
-
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    open_pool()
+    await open_async_pool()
+    # Migrations are applied out of band (python -m app.migrations); only check the version here
+    await asyncio.to_thread(check_schema_version, get_db_connection)
+    start_audit_writer()
+    open_http_client()
+    start_job_workers()
+    start_jwks_refresh()
+    start_change_feed()
+    start_chore_counts_maintenance()
+    yield
+    await stop_chore_counts_maintenance()
+    await stop_change_feed()
+    await stop_jwks_refresh()
+    # Let running jobs finish, then drain queued audit rows while the pool is still open
+    await asyncio.to_thread(stop_job_workers)
+    await asyncio.to_thread(stop_audit_writer)
+    await close_http_client()
+    await close_async_pool()
+    close_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add session middleware for OAuth with secure cookie settings for production
 is_prod_env = os.getenv("ENV", "production").lower() == "production"
@@ -191,6 +113,7 @@ app.add_middleware(
 app.include_router(api_router)
 app.include_router(mcp_router)
 app.include_router(auth_router)
+app.include_router(changes_router)
 
 # Add route for mock login page 
 @app.get("/auth/mock-login-page")
@@ -301,34 +224,12 @@ async def auth_callback(request: Request):
             # Log additional metadata about the OAuth client before decoding
             logging.info(f"DEX client metadata: {oauth.dex.server_metadata if hasattr(oauth.dex, 'server_metadata') else 'Not available'}")
             
-            # Check for JWKS URI availability which is required for token verification
-            jwks_uri = oauth.dex.server_metadata.get('jwks_uri') if hasattr(oauth.dex, 'server_metadata') else None
-            logging.info(f"JWKS URI available: {'Yes - ' + jwks_uri if jwks_uri else 'No'}")
-
-            # Fetch JWKS to validate the token
-            if not jwks_uri:
-                raise ValueError("JWKS URI not found in server metadata")
-
-            async with httpx.AsyncClient() as client:
-                jwks_response = await client.get(jwks_uri)
-                jwks = jwks_response.json()
-
-            claims_options = {
-                "iss": {"essential": True, "value": oauth.dex.server_metadata.get('issuer')},
-                "aud": {"essential": True, "value": os.getenv("OAUTH_CLIENT_ID", "choremane")},
-                "exp": {"essential": True},
-            }
-            if nonce:
-                claims_options["nonce"] = {"essential": True, "value": nonce}
-
-            from authlib.jose import jwt
-
-            user_info = jwt.decode(
+            # Signing keys come from the shared JWKS cache, so logins do not refetch them
+            user_info = await verify_id_token(
                 original_id_token_string,
-                jwks,
-                claims_options=claims_options
+                issuer=oauth.dex.server_metadata.get('issuer') or DEX_ISSUER_URL,
+                nonce=nonce,
             )
-            user_info.validate()  # Raises if claims invalid
 
             logging.info("Successfully decoded and validated ID token with JWKS")
         except Exception as e_decode:
@@ -500,18 +401,17 @@ async def api_auth_refresh(request: Request):
         }
         
         # Make the token request to Dex
-        async with httpx.AsyncClient() as client:
-            response = await client.post(token_url, data=data)
-            
-            if response.status_code != 200:
-                logging.error(f"Failed to refresh token: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Failed to refresh token"
-                )
-            
-            # Return the new tokens
-            return response.json()
+        response = await http_request("POST", token_url, data=data)
+        
+        if response.status_code != 200:
+            logging.error(f"Failed to refresh token: {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Failed to refresh token"
+            )
+        
+        # Return the new tokens
+        return response.json()
     except Exception as e:
         logging.error(f"Token refresh error: {str(e)}")
         raise HTTPException(
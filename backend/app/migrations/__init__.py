@@ -0,0 +1,237 @@
+"""
+Versioned schema migrations.
+
+Migrations are SQL files in versions/ named NNNN_description.sql and are
+applied in version order. Applied versions are recorded in the
+schema_migrations table, so each file runs once per database. Each migration
+runs in its own transaction together with its schema_migrations row, unless
+its first line is "-- migrate: no-transaction" (needed for statements such as
+CREATE INDEX CONCURRENTLY); such a file must hold a single statement, since
+the server runs a multi-statement string as one transaction.
+
+A concurrent index build that fails or is interrupted leaves an INVALID
+index behind, which CREATE INDEX ... IF NOT EXISTS would then skip. Before
+running a no-transaction migration the runner therefore drops INVALID
+indexes carrying a name the migration creates concurrently, and afterwards
+it refuses to record the migration unless those indexes are valid.
+
+Only one process migrates at a time: the runner holds a session-level
+advisory lock for the whole run, and others wait for it and then find
+nothing left to apply.
+
+Migrations are applied out of band with
+
+    python -m app.migrations upgrade
+
+and the app itself only checks the schema version on startup (see
+check_schema_version).
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+import psycopg2
+
+from app.database import DB_HOST, DB_NAME, DB_PASSWORD, DB_USER
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "versions")
+
+# Arbitrary key for pg_advisory_lock, shared by every migration runner
+MIGRATION_LOCK_ID = 0x63686F7265
+
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+_FILENAME_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+_CONCURRENT_INDEX_PATTERN = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE
+)
+
+# Indexes of the given names in the current schema that are not usable
+INVALID_INDEXES_SQL = """
+    SELECT c.oid::regclass::text
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid
+      AND c.relname = ANY(%s)
+      AND c.relnamespace = (SELECT oid FROM pg_namespace WHERE nspname = current_schema())
+    ORDER BY 1
+"""
+
+CREATE_SCHEMA_MIGRATIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class MigrationError(Exception):
+    """Raised for an invalid migrations directory or a failed migration."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: str
+
+    @property
+    def sql(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    @property
+    def transactional(self):
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+    @property
+    def concurrent_indexes(self):
+        """Names of the indexes this migration builds with CREATE INDEX CONCURRENTLY."""
+        return [name.lower() for name in _CONCURRENT_INDEX_PATTERN.findall(self.sql)]
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Migration files in version order; versions must be unique."""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME_PATTERN.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def latest_version(directory=MIGRATIONS_DIR):
+    migrations = discover_migrations(directory)
+    return migrations[-1].version if migrations else 0
+
+
+def connect():
+    """A dedicated connection: the advisory lock is held by the session, so it must not come from the pool."""
+    return psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+
+
+def applied_versions(conn):
+    """Versions recorded in schema_migrations; empty if the table does not exist yet."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('schema_migrations') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            conn.rollback()
+            return set()
+        cur.execute("SELECT version FROM schema_migrations")
+        versions = {row[0] for row in cur.fetchall()}
+    conn.rollback()
+    return versions
+
+
+def current_version(conn):
+    return max(applied_versions(conn), default=0)
+
+
+def pending_migrations(conn, directory=MIGRATIONS_DIR):
+    applied = applied_versions(conn)
+    return [migration for migration in discover_migrations(directory) if migration.version not in applied]
+
+
+def _apply(conn, migration):
+    logging.info(f"Applying migration {migration.version:04d}_{migration.name}")
+    record = (migration.version, migration.name)
+    if migration.transactional:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(migration.sql)
+                cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", record)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise MigrationError(f"Migration {migration.version:04d}_{migration.name} failed: {e}") from e
+        return
+
+    indexes = migration.concurrent_indexes
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(INVALID_INDEXES_SQL, (indexes,))
+            for (index,) in cur.fetchall():
+                # Left by an earlier build of this migration that failed; the
+                # advisory lock rules out a build still running elsewhere
+                logging.warning(f"Dropping INVALID index {index} before rebuilding it")
+                cur.execute(f"DROP INDEX CONCURRENTLY {index}")
+            cur.execute(migration.sql)
+            cur.execute(INVALID_INDEXES_SQL, (indexes,))
+            invalid = [row[0] for row in cur.fetchall()]
+            if invalid:
+                raise MigrationError(f"left INVALID indexes {', '.join(invalid)}")
+            cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", record)
+    except Exception as e:
+        raise MigrationError(f"Migration {migration.version:04d}_{migration.name} failed: {e}") from e
+    finally:
+        conn.autocommit = False
+
+
+def migrate(conn, directory=MIGRATIONS_DIR):
+    """
+    Apply every pending migration in version order and return the ones
+    applied. Stops at the first failure, leaving later migrations pending.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+    conn.commit()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(CREATE_SCHEMA_MIGRATIONS_SQL)
+        conn.commit()
+        # Read under the lock, so a concurrent runner's work is visible
+        pending = pending_migrations(conn, directory)
+        for migration in pending:
+            _apply(conn, migration)
+        if pending:
+            logging.info(f"Database migrated to version {pending[-1].version}")
+        else:
+            logging.info("Database schema is up to date")
+        return pending
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+        conn.commit()
+
+
+def check_schema_version(get_connection, directory=MIGRATIONS_DIR):
+    """
+    Compare the database's schema version with the newest migration.
+
+    Used on startup instead of migrating: it costs one query and never
+    changes the schema. Returns (current, expected), or None if the database
+    could not be reached; problems are logged, not raised, so the app still
+    starts.
+    """
+    expected = latest_version(directory)
+    try:
+        conn = get_connection()
+    except Exception as e:
+        logging.error(f"Skipping schema version check: unable to connect to database ({e})")
+        return None
+    try:
+        current = current_version(conn)
+    except Exception as e:
+        logging.error(f"Schema version check failed: {e}")
+        return None
+    finally:
+        conn.close()
+
+    if current < expected:
+        logging.error(
+            f"Database schema is at version {current} but this build expects {expected}; "
+            "run `python -m app.migrations upgrade`"
+        )
+    elif current > expected:
+        logging.warning(f"Database schema version {current} is newer than this build ({expected})")
+    else:
+        logging.info(f"Database schema is at version {current}")
+    return current, expected
@@ -0,0 +1,42 @@
+"""
+Command line entry point for schema migrations.
+
+    python -m app.migrations upgrade   # apply pending migrations (default)
+    python -m app.migrations status    # show applied and pending migrations
+
+Exits non-zero if a migration fails or, for status, if migrations are pending.
+"""
+
+import argparse
+import logging
+import sys
+
+from app.migrations import MigrationError, connect, current_version, migrate, pending_migrations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="Apply database schema migrations.")
+    parser.add_argument("command", nargs="?", choices=("upgrade", "status"), default="upgrade")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    conn = connect()
+    try:
+        if args.command == "status":
+            pending = pending_migrations(conn)
+            print(f"current version: {current_version(conn)}")
+            for migration in pending:
+                print(f"pending: {migration.version:04d}_{migration.name}")
+            return 1 if pending else 0
+        try:
+            migrate(conn)
+        except MigrationError as e:
+            logging.error(str(e))
+            return 1
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
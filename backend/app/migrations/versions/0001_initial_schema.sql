@@ -0,0 +1,39 @@
+-- Baseline: the schema previously created by run_migrations() at import time.
+-- Every statement is idempotent so databases set up by that code migrate cleanly.
+
+CREATE TABLE IF NOT EXISTS chores (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    interval_days INT NOT NULL,
+    due_date DATE NOT NULL,
+    done BOOLEAN DEFAULT FALSE,
+    done_by VARCHAR(255),
+    last_done DATE,
+    owner_email VARCHAR(255),
+    is_private BOOLEAN DEFAULT FALSE,
+    archived BOOLEAN DEFAULT FALSE
+);
+
+CREATE TABLE IF NOT EXISTS chore_logs (
+    id SERIAL PRIMARY KEY,
+    chore_id INT,
+    done_by VARCHAR(255),
+    done_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    action_type VARCHAR(50) NOT NULL,
+    action_details JSON DEFAULT NULL,
+    FOREIGN KEY (chore_id) REFERENCES chores (id) ON DELETE CASCADE
+);
+
+-- System-level log entries have no chore
+ALTER TABLE chore_logs ALTER COLUMN chore_id DROP NOT NULL;
+
+ALTER TABLE chores ADD COLUMN IF NOT EXISTS last_done DATE;
+
+CREATE TABLE IF NOT EXISTS users (
+    email VARCHAR(255) PRIMARY KEY,
+    name VARCHAR(255),
+    given_name VARCHAR(255),
+    family_name VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
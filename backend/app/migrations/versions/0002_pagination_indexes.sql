@@ -0,0 +1,17 @@
+-- Composite index backing keyset pagination on (due_date, id) per archive state
+CREATE INDEX IF NOT EXISTS idx_chores_archived_due_date_id
+ON chores (archived, due_date, id);
+
+-- Indexes backing /api/logs keyset pagination on (done_at, id), alone and
+-- behind each equality filter
+CREATE INDEX IF NOT EXISTS idx_chore_logs_done_at_id
+ON chore_logs (done_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_chore_logs_chore_id_done_at_id
+ON chore_logs (chore_id, done_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_chore_logs_action_type_done_at_id
+ON chore_logs (action_type, done_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_chore_logs_done_by_done_at_id
+ON chore_logs (done_by, done_at DESC, id DESC);
@@ -0,0 +1,19 @@
+-- Queue for background import/export jobs (app.jobs, JOB_BACKEND=postgres)
+CREATE TABLE IF NOT EXISTS jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    user_email VARCHAR(255),
+    params JSON NOT NULL,
+    progress JSON NOT NULL,
+    result JSON,
+    result_path TEXT,
+    error TEXT,
+    attempts INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    heartbeat_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claimable ON jobs (created_at) WHERE status IN ('queued', 'running');
@@ -0,0 +1,13 @@
+-- migrate: no-transaction
+-- Covering partial index for the active-chore hot path. The page query walks
+-- it in (due_date, id) order, and the count, household health and dashboard
+-- aggregates read every column they need from it (index-only scan) instead
+-- of scanning the heap: visibility (is_private, owner_email) and
+-- interval_days are INCLUDEd, and archived = FALSE is the index predicate.
+-- Built concurrently so chores stay writable. A failed build leaves an
+-- INVALID index, which IF NOT EXISTS alone would keep; the migration runner
+-- drops it before a retry and only records this migration once the index is
+-- valid.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chores_active_due_date_id
+ON chores (due_date, id) INCLUDE (interval_days, is_private, owner_email)
+WHERE archived = FALSE;
@@ -0,0 +1,109 @@
+-- Publish chore and chore_logs changes on the choremane_changes channel for
+-- the /ws change feed (app.changes). NOTIFY is transactional, so listeners
+-- only hear about committed changes.
+--
+-- The triggers run once per statement: a statement touching more than 200
+-- rows sends a single "bulk" event (clients refetch) instead of one
+-- notification per row. Payloads carry what subscribers need for visibility
+-- filtering but not action_details, to stay well under NOTIFY's 8000-byte
+-- payload limit.
+
+CREATE OR REPLACE FUNCTION notify_chore_changes() RETURNS trigger AS $$
+DECLARE
+    changed BIGINT;
+    payload TEXT;
+BEGIN
+    SELECT count(*) INTO changed FROM new_rows;
+    IF changed = 0 THEN
+        RETURN NULL;
+    END IF;
+    IF changed > 200 THEN
+        PERFORM pg_notify('choremane_changes', json_build_object('type', 'chore', 'action', 'bulk', 'count', changed)::text);
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        FOR payload IN
+            SELECT json_build_object(
+                'type', 'chore', 'action', 'created', 'id', n.id, 'name', n.name,
+                'interval_days', n.interval_days, 'due_date', n.due_date, 'done', n.done,
+                'done_by', n.done_by, 'last_done', n.last_done, 'archived', n.archived,
+                'is_private', n.is_private, 'owner_email', n.owner_email
+            )::text
+            FROM new_rows n
+            ORDER BY n.id
+        LOOP
+            PERFORM pg_notify('choremane_changes', payload);
+        END LOOP;
+    ELSE
+        FOR payload IN
+            SELECT json_build_object(
+                'type', 'chore',
+                'action', CASE
+                    WHEN n.archived IS TRUE AND o.archived IS NOT TRUE THEN 'archived'
+                    WHEN o.archived IS TRUE AND n.archived IS NOT TRUE THEN 'unarchived'
+                    WHEN n.last_done > o.last_done OR (o.last_done IS NULL AND n.last_done IS NOT NULL) THEN 'marked_done'
+                    ELSE 'updated'
+                END,
+                'id', n.id, 'name', n.name,
+                'interval_days', n.interval_days, 'due_date', n.due_date, 'done', n.done,
+                'done_by', n.done_by, 'last_done', n.last_done, 'archived', n.archived,
+                'is_private', n.is_private, 'owner_email', n.owner_email,
+                'was_private', o.is_private, 'previous_owner_email', o.owner_email
+            )::text
+            FROM new_rows n
+            JOIN old_rows o ON o.id = n.id
+            WHERE n IS DISTINCT FROM o
+            ORDER BY n.id
+        LOOP
+            PERFORM pg_notify('choremane_changes', payload);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_chore_log_changes() RETURNS trigger AS $$
+DECLARE
+    changed BIGINT;
+    payload TEXT;
+BEGIN
+    SELECT count(*) INTO changed FROM new_rows;
+    IF changed = 0 THEN
+        RETURN NULL;
+    END IF;
+    IF changed > 200 THEN
+        PERFORM pg_notify('choremane_changes', json_build_object('type', 'log', 'action', 'bulk', 'count', changed)::text);
+        RETURN NULL;
+    END IF;
+
+    FOR payload IN
+        SELECT json_build_object(
+            'type', 'log', 'action', l.action_type, 'id', l.id, 'chore_id', l.chore_id,
+            'done_by', l.done_by, 'done_at', l.done_at,
+            'is_private', c.is_private, 'owner_email', c.owner_email
+        )::text
+        FROM new_rows l
+        LEFT JOIN chores c ON c.id = l.chore_id
+        ORDER BY l.id
+    LOOP
+        PERFORM pg_notify('choremane_changes', payload);
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER chores_notify_insert
+    AFTER INSERT ON chores
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_chore_changes();
+
+CREATE TRIGGER chores_notify_update
+    AFTER UPDATE ON chores
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_chore_changes();
+
+CREATE TRIGGER chore_logs_notify_insert
+    AFTER INSERT ON chore_logs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_chore_log_changes();
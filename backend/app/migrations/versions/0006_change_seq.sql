@@ -0,0 +1,76 @@
+-- Per-row change sequence for GET /api/sync (app.api.sync_endpoint).
+--
+-- change_seq is the ID of the transaction that last inserted or changed the
+-- row (txid_current(), 64-bit so it never wraps). Sync cursors are snapshot
+-- xmins rather than the largest change_seq seen, so a transaction that
+-- commits after a later one is still picked up by the next sync.
+--
+-- Rows that existed before this migration keep change_seq 0; they are only
+-- sent in full snapshots, which every client starts with.
+
+ALTER TABLE chores ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE chores ALTER COLUMN change_seq SET DEFAULT txid_current();
+ALTER TABLE chore_logs ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE chore_logs ALTER COLUMN change_seq SET DEFAULT txid_current();
+
+CREATE OR REPLACE FUNCTION touch_change_seq() RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := txid_current();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER chores_touch_change_seq
+    BEFORE UPDATE ON chores
+    FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+    EXECUTE FUNCTION touch_change_seq();
+
+-- Deleted rows, so syncing clients can drop them. Tombstones are kept for 30
+-- days; cursors older than the newest pruned tombstone (sync_horizon) get a
+-- full snapshot instead of a delta.
+CREATE TABLE sync_tombstones (
+    entity VARCHAR(16) NOT NULL,
+    id INT NOT NULL,
+    change_seq BIGINT NOT NULL DEFAULT txid_current(),
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_sync_tombstones_change_seq ON sync_tombstones (change_seq);
+
+CREATE TABLE sync_horizon (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    min_seq BIGINT NOT NULL
+);
+
+-- Cursors from before change_seq existed cannot be trusted
+INSERT INTO sync_horizon (min_seq) VALUES (txid_current());
+
+-- Deletes are rare, so expired tombstones are pruned here rather than by a
+-- scheduled job
+CREATE OR REPLACE FUNCTION record_sync_tombstones() RETURNS trigger AS $$
+DECLARE
+    pruned BIGINT;
+BEGIN
+    INSERT INTO sync_tombstones (entity, id) SELECT TG_ARGV[0], id FROM old_rows;
+    WITH expired AS (
+        DELETE FROM sync_tombstones
+        WHERE deleted_at < CURRENT_TIMESTAMP - INTERVAL '30 days'
+        RETURNING change_seq
+    )
+    SELECT max(change_seq) INTO pruned FROM expired;
+    IF pruned IS NOT NULL THEN
+        UPDATE sync_horizon SET min_seq = GREATEST(min_seq, pruned + 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER chores_sync_tombstones
+    AFTER DELETE ON chores
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_sync_tombstones('chore');
+
+CREATE TRIGGER chore_logs_sync_tombstones
+    AFTER DELETE ON chore_logs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_sync_tombstones('log');
@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- Lets GET /api/sync find chores changed since a cursor without scanning the table
+-- Built concurrently so writes continue. A failed build leaves an INVALID
+-- index, which IF NOT EXISTS alone would keep; the migration runner drops it
+-- before a retry and only records this migration once the index is valid.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chores_change_seq ON chores (change_seq);
@@ -0,0 +1,97 @@
+-- Active chore counts per visibility scope and due date, for
+-- GET /api/chores/count. The bucket counts become a range sum over the
+-- caller's two scopes instead of a scan of every visible chore.
+--
+-- scope is '' for shared chores and the owner's email for private ones;
+-- private chores without an owner are visible to no one and not counted.
+--
+-- Rows are signed deltas: statement-level triggers on chores append one row
+-- per (scope, due_date) a statement changed, and a key's count is the sum of
+-- its rows. Appending rather than upserting means concurrent writers never
+-- wait on each other's counter rows. app.chore_counts folds the deltas back
+-- into one row per key every few minutes, and once a night checks the
+-- totals against chores and rebuilds the table if they have drifted.
+
+CREATE OR REPLACE FUNCTION chore_count_scope(is_private BOOLEAN, owner_email VARCHAR) RETURNS VARCHAR AS $$
+    SELECT CASE
+        WHEN is_private = FALSE THEN ''
+        WHEN is_private = TRUE THEN owner_email
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE TABLE chore_due_counts (
+    scope VARCHAR(255) NOT NULL,
+    due_date DATE NOT NULL,
+    chores INT NOT NULL
+);
+
+CREATE INDEX idx_chore_due_counts_scope_due_date ON chore_due_counts (scope, due_date);
+
+CREATE OR REPLACE FUNCTION maintain_chore_due_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO chore_due_counts (scope, due_date, chores)
+        SELECT chore_count_scope(is_private, owner_email), due_date, count(*)
+        FROM new_rows
+        WHERE archived = FALSE AND chore_count_scope(is_private, owner_email) IS NOT NULL
+        GROUP BY 1, 2;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO chore_due_counts (scope, due_date, chores)
+        SELECT chore_count_scope(is_private, owner_email), due_date, -count(*)
+        FROM old_rows
+        WHERE archived = FALSE AND chore_count_scope(is_private, owner_email) IS NOT NULL
+        GROUP BY 1, 2;
+    ELSE
+        INSERT INTO chore_due_counts (scope, due_date, chores)
+        SELECT scope, due_date, sum(delta)
+        FROM (
+            SELECT chore_count_scope(is_private, owner_email) AS scope, due_date, 1 AS delta
+            FROM new_rows
+            WHERE archived = FALSE
+            UNION ALL
+            SELECT chore_count_scope(is_private, owner_email), due_date, -1
+            FROM old_rows
+            WHERE archived = FALSE
+        ) AS changes
+        WHERE scope IS NOT NULL
+        GROUP BY 1, 2
+        HAVING sum(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION clear_chore_due_counts() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM chore_due_counts;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- No writes may land between the backfill and the triggers taking over
+LOCK TABLE chores IN SHARE ROW EXCLUSIVE MODE;
+
+INSERT INTO chore_due_counts (scope, due_date, chores)
+SELECT chore_count_scope(is_private, owner_email), due_date, count(*)
+FROM chores
+WHERE archived = FALSE AND chore_count_scope(is_private, owner_email) IS NOT NULL
+GROUP BY 1, 2;
+
+CREATE TRIGGER chores_due_counts_insert
+    AFTER INSERT ON chores
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_chore_due_counts();
+
+CREATE TRIGGER chores_due_counts_update
+    AFTER UPDATE ON chores
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_chore_due_counts();
+
+CREATE TRIGGER chores_due_counts_delete
+    AFTER DELETE ON chores
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_chore_due_counts();
+
+CREATE TRIGGER chores_due_counts_truncate
+    AFTER TRUNCATE ON chores
+    FOR EACH STATEMENT EXECUTE FUNCTION clear_chore_due_counts();
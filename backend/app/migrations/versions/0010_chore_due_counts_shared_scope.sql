@@ -0,0 +1,64 @@
+-- Shared chores in chore_due_counts get a NULL scope instead of ''. With ''
+-- a private chore whose owner_email is '' landed in the shared bucket and was
+-- counted for every user; no owner email can equal NULL, so the two scopes
+-- can no longer collide. GET /api/chores/count reads
+-- scope IS NULL OR scope = caller.
+--
+-- Since NULL now means "shared", chore_counted() rather than a NULL scope
+-- says which chores are counted at all: shared ones and private ones with an
+-- owner, the same chores the REST list queries can show to someone.
+
+CREATE OR REPLACE FUNCTION chore_count_scope(is_private BOOLEAN, owner_email VARCHAR) RETURNS VARCHAR AS $$
+    SELECT CASE WHEN is_private = TRUE THEN owner_email END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION chore_counted(is_private BOOLEAN, owner_email VARCHAR) RETURNS BOOLEAN AS $$
+    SELECT COALESCE(is_private = FALSE OR (is_private = TRUE AND owner_email IS NOT NULL), FALSE)
+$$ LANGUAGE sql IMMUTABLE;
+
+ALTER TABLE chore_due_counts ALTER COLUMN scope DROP NOT NULL;
+
+CREATE OR REPLACE FUNCTION maintain_chore_due_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO chore_due_counts (scope, due_date, chores)
+        SELECT chore_count_scope(is_private, owner_email), due_date, count(*)
+        FROM new_rows
+        WHERE archived = FALSE AND chore_counted(is_private, owner_email)
+        GROUP BY 1, 2;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO chore_due_counts (scope, due_date, chores)
+        SELECT chore_count_scope(is_private, owner_email), due_date, -count(*)
+        FROM old_rows
+        WHERE archived = FALSE AND chore_counted(is_private, owner_email)
+        GROUP BY 1, 2;
+    ELSE
+        INSERT INTO chore_due_counts (scope, due_date, chores)
+        SELECT scope, due_date, sum(delta)
+        FROM (
+            SELECT chore_count_scope(is_private, owner_email) AS scope, due_date, 1 AS delta
+            FROM new_rows
+            WHERE archived = FALSE AND chore_counted(is_private, owner_email)
+            UNION ALL
+            SELECT chore_count_scope(is_private, owner_email), due_date, -1
+            FROM old_rows
+            WHERE archived = FALSE AND chore_counted(is_private, owner_email)
+        ) AS changes
+        GROUP BY 1, 2
+        HAVING sum(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rebuild under the new scopes; no trigger or compaction may run meanwhile
+LOCK TABLE chores IN SHARE ROW EXCLUSIVE MODE;
+LOCK TABLE chore_due_counts IN EXCLUSIVE MODE;
+
+DELETE FROM chore_due_counts;
+
+INSERT INTO chore_due_counts (scope, due_date, chores)
+SELECT chore_count_scope(is_private, owner_email), due_date, count(*)
+FROM chores
+WHERE archived = FALSE AND chore_counted(is_private, owner_email)
+GROUP BY 1, 2;
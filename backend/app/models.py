@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 
 class Chore(BaseModel):
@@ -17,6 +17,31 @@ class Chore(BaseModel):
     is_private: bool = Field(default=False)  # True if the chore is private to the owner
 
 
+class ChorePage(BaseModel):
+    items: List[Chore]
+    next_cursor: Optional[str] = None  # Opaque keyset cursor; null on the last page
+
+
+class Dashboard(BaseModel):
+    items: List[Chore]  # First page of active chores, same as GET /api/chores?cursor=
+    next_cursor: Optional[str] = None
+    counts: Dict[str, int]  # Same buckets as GET /api/chores/count
+    household_health: int  # Same score as GET /api/chores/household-health
+
+
+class ChoreOperation(BaseModel):
+    op: Literal["mark_done", "archive", "unarchive", "update"]
+    chore_id: int
+    done_by: Optional[str] = None  # Required for mark_done
+    name: Optional[str] = None  # name, interval_days and due_date are required for update
+    interval_days: Optional[int] = None
+    due_date: Optional[str] = None
+
+
+class ChoreBatch(BaseModel):
+    operations: List[ChoreOperation]
+
+
 class UndoRequest(BaseModel):
     log_id: int
 
@@ -0,0 +1,69 @@
+"""
+Fast JSON path for chore list responses.
+
+List endpoints select chores in the fixed CHORE_COLUMNS order and turn each
+row straight into a dict, instead of building a models.Chore per
+row and having FastAPI validate and serialize it again through
+response_model. Returning a FastJSONResponse skips that validation; the
+response_model stays on the route for the OpenAPI schema, and the dicts have
+exactly the Chore fields.
+
+Encoding uses orjson when it is installed and the standard library otherwise.
+"""
+
+import json
+from datetime import date, datetime
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Column order of every chore list query; matches the models.Chore fields
+CHORE_COLUMNS = (
+    "id", "name", "interval_days", "due_date", "done", "done_by", "archived", "owner_email", "is_private", "last_done",
+)
+CHORE_SELECT = ", ".join(CHORE_COLUMNS)
+
+
+def chore_to_dict(row):
+    """
+    A row in CHORE_COLUMNS order as a dict with the models.Chore fields.
+
+    Dates are left as date objects for the encoder: orjson writes them as ISO
+    strings natively, and dumps() does the same on the standard library path.
+    """
+    return dict(zip(CHORE_COLUMNS, row))
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content):
+    """Encode content as compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """A JSON response encoded with dumps(), without response_model validation."""
+
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps(content)
+
+
+def fast_json_response(content, response):
+    """
+    Wrap content in a FastJSONResponse carrying the headers set on the
+    endpoint's injected Response (FastAPI drops them when a Response is
+    returned directly).
+    """
+    return FastJSONResponse(content, headers=dict(response.headers))
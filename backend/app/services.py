@@ -4,9 +4,14 @@ Business logic services for the Choremane backend.
 This module contains pure functions for business logic that can be easily unit tested.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Tuple, Optional
 
+import numpy as np
+
+# Day zero for the columnar (epoch-day) inputs of the batch scorers
+EPOCH = datetime(1970, 1, 1)
+
 
 def calculate_single_chore_score(
     due_date: datetime,
@@ -124,3 +129,104 @@ def calculate_household_health_score(
         return 100
 
     return int(round(total_score / active_chore_count))
+
+
+def to_epoch_days(value) -> float:
+    """
+    Convert a date, datetime or ISO string to (fractional) days since EPOCH.
+
+    Args:
+        value: Anything normalize_due_date accepts, or None for a missing date.
+
+    Returns:
+        Days since 1970-01-01 as a float; whole days for plain dates. NaN for
+        None, which the batch scorers skip like the scalar ones skip chores
+        without a due date.
+    """
+    if value is None:
+        return float("nan")
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return float(value.toordinal() - EPOCH.toordinal())
+    return (normalize_due_date(value) - EPOCH).total_seconds() / 86400
+
+
+def calculate_chore_scores_batch(
+    due_epoch_days,
+    interval_days,
+    now: Optional[datetime] = None,
+) -> np.ndarray:
+    """
+    Vectorized calculate_single_chore_score over columnar chore data.
+
+    Args:
+        due_epoch_days: Array-like of due dates as days since EPOCH (see to_epoch_days).
+        interval_days: Array-like of intervals in days, same length as due_epoch_days.
+        now: The current datetime. Defaults to datetime.now().
+
+    Returns:
+        A float64 array of per-chore scores from 0-100. Chores with a missing
+        (NaN) due date, or a missing or non-positive interval, score NaN so
+        callers can mask them out.
+    """
+    if now is None:
+        now = datetime.now()
+
+    due = np.asarray(due_epoch_days, dtype=np.float64)
+    interval = np.asarray(interval_days, dtype=np.float64)
+    if due.shape != interval.shape:
+        raise ValueError("due_epoch_days and interval_days must have the same length")
+
+    valid = (interval > 0) & np.isfinite(due)
+    safe_interval = np.where(valid, interval, 1.0)
+    # (now - due) as a fraction of the interval: > 0 is overdue
+    elapsed = (to_epoch_days(now) - np.where(valid, due, 0.0)) / safe_interval
+
+    overdue_score = np.maximum(0.0, 80 - elapsed * 80)
+    fraction_elapsed = np.clip(1 + elapsed, 0.0, 1.0)
+    standard_score = np.where(fraction_elapsed <= 0.5, 100.0, 100 - (fraction_elapsed - 0.5) * 40)
+
+    scores = np.where(elapsed > 0, overdue_score, standard_score)
+    return np.where(valid, scores, np.nan)
+
+
+def calculate_household_health_scores_batch(
+    due_epoch_days,
+    interval_days,
+    group_ids=None,
+    now: Optional[datetime] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score many households (or users) in one call.
+
+    Args:
+        due_epoch_days: Array-like of due dates as days since EPOCH.
+        interval_days: Array-like of intervals in days.
+        group_ids: Array-like assigning each chore to a household/user. When
+            omitted, every chore belongs to a single group 0.
+        now: The current datetime. Defaults to datetime.now().
+
+    Returns:
+        A tuple (groups, scores): the sorted unique group ids and an int64
+        array with each group's 0-100 score, matching
+        calculate_household_health_score per group (100 when a group has no
+        valid chores). Chores without a due date or a positive interval are
+        left out of the average, as the scalar scorer skips them.
+    """
+    chore_scores = calculate_chore_scores_batch(due_epoch_days, interval_days, now)
+    if group_ids is None:
+        group_ids = np.zeros(chore_scores.shape, dtype=np.int64)
+
+    groups, inverse = np.unique(np.asarray(group_ids), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    if inverse.shape != chore_scores.shape:
+        raise ValueError("group_ids must have the same length as due_epoch_days")
+
+    valid = ~np.isnan(chore_scores)
+    totals = np.bincount(inverse, weights=np.where(valid, chore_scores, 0.0), minlength=len(groups))
+    counts = np.bincount(inverse, weights=valid, minlength=len(groups))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = totals / counts
+    # np.rint rounds half to even, like the built-in round() used above
+    scores = np.where(counts > 0, np.rint(averages), 100).astype(np.int64)
+    return groups, scores
@@ -1,55 +1,121 @@
 import json
 import logging
 from datetime import datetime, date
+from psycopg2.extras import execute_values
+
+from .audit import AUDIT_INSERT_SQL, AUDIT_STRICT_ACTIONS, audit_writer_running, submit_audit_row
+from .data_version import bump_data_version
 from .database import get_db_connection
 
 
-# Utility for logging actions
-def log_action(chore_id, done_by, action_type, action_details=None, conn=None):
+def _serialize_details(action_details):
     if isinstance(action_details, dict):
         action_details = {
             key: (value.isoformat() if isinstance(value, (datetime, date)) else value)
             for key, value in action_details.items()
         }
-    action_details_str = json.dumps(action_details) if action_details else "{}"
+    return json.dumps(action_details) if action_details else "{}"
+
+
+AUDIT_ROW_INSERT_SQL = """
+    INSERT INTO chore_logs (chore_id, done_by, action_type, action_details, done_at)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+
+# Utility for logging actions
+def log_action(chore_id, done_by, action_type, action_details=None, conn=None, strict=None):
+    """
+    Record an audit row in chore_logs, with done_at set to the time of the call.
+
+    By default the row is handed to the write-behind audit writer (app.audit).
+    Given conn, whose change the caller has yet to commit, the row is queued
+    only once conn commits and is dropped if it rolls back. Strict actions
+    (AUDIT_STRICT_ACTIONS, or strict=True) are written synchronously instead,
+    as is any row logged while the writer is not running: through conn when
+    given, so the row commits or rolls back together with the caller's change
+    and a failed insert propagates to them. A row the writer cannot take
+    (queue full) is committed on its own connection and failures are only
+    logged.
+    """
+    action_details_str = _serialize_details(action_details)
     logging.info(
         f"Logging action for chore_id={chore_id}, action_type={action_type}, details={action_details_str}"
     )
 
-    # Use existing connection when available to support tests that monkeypatch database access
-    owns_connection = False
-    if conn is None:
-        try:
-            conn = get_db_connection()
-            owns_connection = True
-        except Exception as e:
-            logging.error(
-                f"Skipping action log due to missing database connection: {e}"
-            )
-            return
-    cur = conn.cursor()
-    try:
-        # Special case for system-level actions like import/export that don't relate to a specific chore
-        if action_type in ["import", "export"] and chore_id is None:
-            logging.info(
-                f"System operation: {action_type}, details stored in application logs only"
-            )
+    # Special case for system-level actions like import/export that don't relate to a specific chore
+    if action_type in ["import", "export"] and chore_id is None:
+        logging.info(
+            f"System operation: {action_type}, details stored in application logs only"
+        )
+        return
+
+    if strict is None:
+        strict = action_type in AUDIT_STRICT_ACTIONS
+    row = (chore_id, done_by, action_type, action_details_str, datetime.now())
+
+    if conn is not None:
+        after_commit = getattr(conn, "after_commit", None)
+        if not strict and after_commit is not None and audit_writer_running():
+            after_commit(lambda: _submit_or_write(row))
             return
+        # Same transaction as the caller's change; the caller commits
+        cur = conn.cursor()
+        try:
+            cur.execute(AUDIT_ROW_INSERT_SQL, row)
+        finally:
+            cur.close()
+        return
+
+    if strict:
+        _write_row(row)
+    else:
+        _submit_or_write(row)
+
+
+def _submit_or_write(row):
+    if not submit_audit_row(row):
+        _write_row(row)
 
-        # Normal case - log to database
-        cur.execute(
-            """
-            INSERT INTO chore_logs (chore_id, done_by, action_type, action_details)
-            VALUES (%s, %s, %s, %s)
-            """,
-            (chore_id, done_by, action_type, action_details_str),
+
+def _write_row(row):
+    """Commit one audit row on its own connection, logging any failure."""
+    try:
+        conn = get_db_connection()
+    except Exception as e:
+        logging.error(
+            f"Skipping action log due to missing database connection: {e}"
         )
+        return
+    cur = conn.cursor()
+    try:
+        cur.execute(AUDIT_ROW_INSERT_SQL, row)
         conn.commit()
-        logging.info(f"Action logged successfully for action_type={action_type}")
+        bump_data_version()
+        logging.info(f"Action logged successfully for action_type={row[2]}")
     except Exception as e:
-        logging.error(f"Error logging action for chore_id={chore_id}: {e}")
+        logging.error(f"Error logging action for chore_id={row[0]}: {e}")
         conn.rollback()
     finally:
         cur.close()
-        if owns_connection:
-            conn.close()
+        conn.close()
+
+
+def log_actions(entries, conn):
+    """
+    Record several (chore_id, done_by, action_type, action_details) audit rows
+    with one INSERT on conn, in the caller's transaction; the caller commits.
+    """
+    done_at = datetime.now()
+    rows = [
+        (chore_id, done_by, action_type, _serialize_details(action_details), done_at)
+        for chore_id, done_by, action_type, action_details in entries
+    ]
+    if not rows:
+        return
+    logging.info(f"Logging {len(rows)} actions in one statement")
+    cur = conn.cursor()
+    try:
+        execute_values(cur, AUDIT_INSERT_SQL, rows, page_size=len(rows))
+    finally:
+        cur.close()
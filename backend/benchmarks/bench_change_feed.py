@@ -0,0 +1,166 @@
+"""
+Benchmark: /ws change feed with thousands of idle connections.
+
+Starts a uvicorn server in a child process serving the /ws endpoint, opens
+--connections WebSocket clients against it and keeps them idle, then
+publishes --events changes and measures how long each takes to reach every
+client. Reports the server's RSS per idle connection and fan-out latency.
+
+Events are published into the server's ChangeHub directly (through a
+benchmark-only endpoint), so no database is needed; in production the
+listener feeds the same hub from Postgres NOTIFY, one JSON payload per
+change. A tenth of the clients are private-chore owners, so visibility
+filtering is exercised as well. All clients run in one process, so at high
+connection counts the measured latency includes their own scheduling.
+
+Run from the backend directory:
+    python -m benchmarks.bench_change_feed --connections 5000 --events 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from fastapi import FastAPI
+
+from app.api.changes_endpoint import router
+from app.changes import get_change_hub
+
+OWNERS = 50
+
+bench_app = FastAPI()
+bench_app.include_router(router)
+
+
+@bench_app.post("/publish")
+def publish(event_id: int, private: bool = False):
+    get_change_hub().publish(
+        {
+            "type": "chore", "action": "updated", "id": event_id, "name": f"chore {event_id}",
+            "is_private": private, "owner_email": "owner0@example.com" if private else None,
+            "sent_at": time.time(),
+        }
+    )
+    return {"subscribers": get_change_hub().stats()["subscribers"]}
+
+
+@bench_app.get("/rss")
+def rss():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return {"rss_kb": int(line.split()[1]), **get_change_hub().stats()}
+    return {}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def raise_fd_limit(needed):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, needed), hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def http(port, method, path):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", method=method)
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+async def client(port, user, received, ready, stop):
+    uri = f"ws://127.0.0.1:{port}/ws"
+    async with websockets.connect(uri, additional_headers={"X-User-Email": user}, open_timeout=60) as ws:
+        ready.release()
+        while not stop.is_set():
+            try:
+                message = json.loads(await asyncio.wait_for(ws.recv(), timeout=0.5))
+            except asyncio.TimeoutError:
+                continue
+            if message.get("type") == "chore":
+                received.setdefault(message["id"], []).append(time.time() - message["sent_at"])
+
+
+async def run(port, connections, events, idle):
+    received, stop = {}, asyncio.Event()
+    ready = asyncio.Semaphore(0)
+    baseline = http(port, "GET", "/rss")
+    started = time.perf_counter()
+    users = [f"owner{n % OWNERS}@example.com" if n % 10 == 0 else f"user{n}@example.com" for n in range(connections)]
+    tasks = []
+    for batch in range(0, connections, 500):
+        tasks += [asyncio.create_task(client(port, user, received, ready, stop)) for user in users[batch:batch + 500]]
+        for _ in users[batch:batch + 500]:
+            await ready.acquire()
+    connect_seconds = time.perf_counter() - started
+    await asyncio.sleep(idle)
+    loaded = http(port, "GET", "/rss")
+
+    expected = {}
+    for event_id in range(events):
+        private = event_id % 2 == 1
+        expected[event_id] = users.count("owner0@example.com") if private else connections
+        await asyncio.to_thread(http, port, "POST", f"/publish?event_id={event_id}&private={str(private).lower()}")
+        await asyncio.sleep(0.2)
+    await asyncio.sleep(1)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    per_connection_kb = (loaded["rss_kb"] - baseline["rss_kb"]) / connections
+    print(f"connections={connections} connect_time={connect_seconds:.2f}s subscribers={loaded['subscribers']}")
+    print(f"server_rss={loaded['rss_kb'] / 1024:.1f}MiB ({per_connection_kb:.1f}KiB per idle connection)")
+    for event_id in range(events):
+        latencies = sorted(received.get(event_id, []))
+        if not latencies:
+            print(f"event {event_id}: not delivered")
+            continue
+        print(
+            f"event {event_id:>3} {'private' if event_id % 2 else 'shared ':<7} "
+            f"delivered={len(latencies)}/{expected[event_id]} "
+            f"p50={latencies[len(latencies) // 2] * 1000:7.1f}ms max={latencies[-1] * 1000:7.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=2000, help="number of idle WebSocket clients")
+    parser.add_argument("--events", type=int, default=10, help="changes to publish once everyone is connected")
+    parser.add_argument("--idle", type=float, default=5, help="seconds to stay idle before publishing")
+    args = parser.parse_args()
+
+    limit = raise_fd_limit(args.connections * 2 + 100)
+    if limit < args.connections * 2 + 100:
+        sys.exit(f"open file limit {limit} is too low for {args.connections} connections")
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_change_feed:bench_app", "--port", str(port),
+         "--log-level", "warning", "--backlog", "4096"],
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    try:
+        for _ in range(100):
+            try:
+                http(port, "GET", "/rss")
+                break
+            except OSError:
+                time.sleep(0.1)
+        asyncio.run(run(port, args.connections, args.events, args.idle))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
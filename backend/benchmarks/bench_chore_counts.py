@@ -0,0 +1,173 @@
+"""
+Benchmark: /api/chores/count as six COUNT(*) queries, as one FILTER aggregate
+over the visible chores, and as range sums over the chore_due_counts summary
+table.
+
+Seeds a migrated scratch schema with synthetic chores (the triggers fill the
+summary table), then times each strategy on the same connection and reports
+round trips and latency per call.
+
+Run from the backend directory against a disposable database:
+    POSTGRES_HOST=localhost python -m benchmarks.bench_chore_counts --rows 100000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+import psycopg2
+
+from app.api.chore_counts_endpoint import (
+    CHORE_BUCKET_COUNT_COLUMNS,
+    CHORE_BUCKET_COUNTS_SQL,
+    CHORE_BUCKETS,
+    chore_bucket_params,
+)
+from app.database import DB_HOST, DB_NAME, DB_PASSWORD, DB_USER
+from app.migrations import migrate
+
+SCHEMA = "bench_chore_counts"
+USER_EMAIL = "bench@example.com"
+
+LEGACY_BASE_QUERY = """
+    SELECT COUNT(*)
+    FROM chores
+    WHERE archived = FALSE AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %s))
+"""
+
+
+class CountingCursor:
+    """Wraps a cursor and counts execute() calls (one round trip each)."""
+
+    def __init__(self, cur):
+        self._cur = cur
+        self.round_trips = 0
+
+    def execute(self, query, params=None):
+        self.round_trips += 1
+        self._cur.execute(query, params)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+
+def legacy_counts(cur, user_email, today):
+    """The pre-aggregate implementation: one COUNT(*) per bucket."""
+    tomorrow = today + timedelta(days=1)
+    next_week = today + timedelta(days=7)
+    counts = {}
+    cur.execute(LEGACY_BASE_QUERY, (user_email,))
+    counts["all"] = cur.fetchone()[0]
+    cur.execute(LEGACY_BASE_QUERY + " AND due_date < %s", (user_email, today))
+    counts["overdue"] = cur.fetchone()[0]
+    cur.execute(LEGACY_BASE_QUERY + " AND due_date = %s", (user_email, today))
+    counts["today"] = cur.fetchone()[0]
+    cur.execute(LEGACY_BASE_QUERY + " AND due_date = %s", (user_email, tomorrow))
+    counts["tomorrow"] = cur.fetchone()[0]
+    cur.execute(LEGACY_BASE_QUERY + " AND due_date > %s AND due_date <= %s", (user_email, tomorrow, next_week))
+    counts["thisWeek"] = cur.fetchone()[0]
+    cur.execute(LEGACY_BASE_QUERY + " AND due_date > %s", (user_email, next_week))
+    counts["upcoming"] = cur.fetchone()[0]
+    return counts
+
+
+# The single-scan implementation that preceded the summary table
+SCAN_COUNTS_SQL = f"""
+    SELECT {CHORE_BUCKET_COUNT_COLUMNS}
+    FROM chores
+    WHERE archived = FALSE
+    AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %(user_email)s))
+"""
+
+
+def aggregate_counts(cur, user_email, today):
+    cur.execute(SCAN_COUNTS_SQL, chore_bucket_params(user_email, today))
+    row = cur.fetchone()
+    return dict(zip(CHORE_BUCKETS, row))
+
+
+def summary_counts(cur, user_email, today):
+    cur.execute(CHORE_BUCKET_COUNTS_SQL, chore_bucket_params(user_email, today))
+    row = cur.fetchone()
+    return dict(zip(CHORE_BUCKETS, row))
+
+
+def seed(cur, rows):
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    conn = psycopg2.connect(
+        host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASSWORD, options=f"-c search_path={SCHEMA}"
+    )
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
+    cur.execute(f"SET search_path TO {SCHEMA}")
+    cur.execute(
+        """
+        INSERT INTO chores (name, interval_days, due_date, owner_email, is_private, archived)
+        SELECT 'chore ' || g,
+               1 + g %% 30,
+               CURRENT_DATE + (g %% 60) - 20,
+               CASE WHEN g %% 5 = 0 THEN %s ELSE NULL END,
+               g %% 5 = 0,
+               g %% 17 = 0
+        FROM generate_series(1, %s) AS g
+        """,
+        (USER_EMAIL, rows),
+    )
+    cur.execute("VACUUM ANALYZE chores, chore_due_counts")
+
+
+def measure(fn, cur, iterations):
+    counting = CountingCursor(cur)
+    timings = []
+    result = None
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = fn(counting, USER_EMAIL, date.today())
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, counting.round_trips / iterations, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="number of synthetic chores to seed")
+    parser.add_argument("--iterations", type=int, default=50, help="timed calls per strategy")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        seed(cur, args.rows)
+        strategies = (
+            ("legacy (6 queries)", legacy_counts),
+            ("aggregate (FILTER)", aggregate_counts),
+            ("summary table", summary_counts),
+        )
+        # Warm up caches so every strategy sees the same buffer state
+        for _, fn in strategies:
+            fn(cur, USER_EMAIL, date.today())
+
+        print(f"rows={args.rows} iterations={args.iterations}")
+        results, medians = [], []
+        for label, fn in strategies:
+            result, trips, timings = measure(fn, cur, args.iterations)
+            results.append(result)
+            medians.append(statistics.median(timings))
+            print(
+                f"{label:<20} round_trips={trips:.0f} "
+                f"median={medians[-1]:.2f}ms p95={sorted(timings)[int(len(timings) * 0.95) - 1]:.2f}ms"
+            )
+        assert all(result == results[0] for result in results), f"results differ: {results}"
+        print(f"speedup (median) over legacy: {medians[0] / medians[1]:.2f}x aggregate, {medians[0] / medians[2]:.2f}x summary")
+    finally:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
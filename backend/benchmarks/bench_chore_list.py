@@ -0,0 +1,145 @@
+"""
+Benchmark: serializing a large GET /api/chores response, per-row Chore
+models vs the fixed-layout fast path in app.serialization.
+
+Serves synthetic rows from an in-memory cursor (no database needed) and
+requests the same page through two routes on one app: /legacy/chores builds a
+models.Chore per row and lets FastAPI validate and encode the list through
+response_model, as get_chores used to, and /api/chores is the current
+handler. Reports rows per second for each, end to end through the ASGI
+stack, plus the time spent in the JSON encoder alone.
+
+Run from the backend directory:
+    python -m benchmarks.bench_chore_list --rows 1000 --repeat 20
+
+--rows is capped at routes.MAX_PAGE_SIZE; raise it with the MAX_PAGE_SIZE
+environment variable to benchmark larger pages.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import List, Union
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app import serialization
+from app.api import routes
+from app.models import Chore, ChorePage
+
+USER_EMAIL = "bench@example.com"
+
+
+def synthetic_rows(count):
+    today = date.today()
+    return [
+        (
+            n, f"chore {n}", 1 + n % 30, today + timedelta(days=n % 60 - 20), n % 3 == 0,
+            "someone@example.com" if n % 3 == 0 else None, False,
+            USER_EMAIL if n % 10 == 0 else None, n % 10 == 0, today - timedelta(days=n % 30),
+        )
+        for n in range(count)
+    ]
+
+
+def fake_connection(rows):
+    class Cursor:
+        async def execute(self, query, params=None):
+            pass
+
+        async def fetchall(self):
+            return rows
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    @asynccontextmanager
+    async def connect():
+        yield Connection()
+
+    return connect
+
+
+def build_app(rows):
+    routes.async_db_connection = fake_connection(rows)
+    app = FastAPI()
+    app.include_router(routes.api_router)
+
+    @app.get("/legacy/chores", response_model=Union[List[Chore], ChorePage])
+    async def legacy_chores(request: Request, limit: int = 10):
+        user_email = request.headers.get("X-User-Email")
+        chores = []
+        for row in rows[:limit]:
+            if row[8] and row[7] and row[7] != user_email:
+                continue
+            chores.append(
+                Chore(
+                    id=row[0], name=row[1], interval_days=row[2], due_date=str(routes._to_iso_date(row[3])),
+                    done=row[4], done_by=row[5], archived=row[6], last_done=routes._to_iso_date(row[9]),
+                    owner_email=row[7], is_private=row[8],
+                )
+            )
+        return chores
+
+    return app
+
+
+def time_route(client, path, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, params={"limit": rows}, headers={"X-User-Email": USER_EMAIL})
+        timings.append(time.perf_counter() - started)
+    assert response.status_code == 200 and len(response.json()) == rows
+    return statistics.median(timings)
+
+
+def time_encoder(encode, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode(content)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=routes.MAX_PAGE_SIZE, help="chores in the response")
+    parser.add_argument("--repeat", type=int, default=20, help="requests per route; the median is reported")
+    args = parser.parse_args()
+    if args.rows > routes.MAX_PAGE_SIZE:
+        parser.error(f"--rows is above MAX_PAGE_SIZE ({routes.MAX_PAGE_SIZE}); set MAX_PAGE_SIZE to allow it")
+
+    rows = synthetic_rows(args.rows)
+    client = TestClient(build_app(rows))
+    for path in ("/legacy/chores", "/api/chores"):
+        time_route(client, path, args.rows, 2)
+
+    print(f"rows={args.rows} repeat={args.repeat} orjson={'yes' if serialization.orjson else 'no'}")
+    for label, path in (("per-row Chore + response_model", "/legacy/chores"), ("fast path", "/api/chores")):
+        seconds = time_route(client, path, args.rows, args.repeat)
+        print(f"{label:<32} {seconds * 1000:8.1f}ms  {args.rows / seconds:>10,.0f} rows/s")
+
+    content = [serialization.chore_to_dict(row) for row in rows]
+    encoders = [("json", lambda c: json.dumps(c, separators=(",", ":"), default=serialization._default).encode())]
+    if serialization.orjson:
+        encoders.append(("orjson", serialization.orjson.dumps))
+    for name, encode in encoders:
+        seconds = time_encoder(encode, content, args.repeat)
+        print(f"{'encode only, ' + name:<32} {seconds * 1000:8.1f}ms  {args.rows / seconds:>10,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
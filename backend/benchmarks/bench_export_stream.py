@@ -0,0 +1,185 @@
+"""
+Benchmark: peak RSS of the buffered /api/export vs the streaming /api/export/stream.
+
+Seeds a scratch schema with chores and chore_logs rows, then runs each export
+strategy in a fresh child process and reports its peak resident set size, so
+one strategy's allocations cannot inflate the other's measurement.
+
+Run from the backend directory against a disposable database:
+    POSTGRES_HOST=localhost python -m benchmarks.bench_export_stream --logs 1000000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+
+import psycopg2
+
+from app.api.export_endpoint import export_stream
+from app.database import DB_HOST, DB_NAME, DB_PASSWORD, DB_USER
+
+SCHEMA = "bench_export_stream"
+USER_EMAIL = "bench@example.com"
+
+
+def connect():
+    conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+    with conn.cursor() as cur:
+        cur.execute(f"SET search_path TO {SCHEMA}")
+    return conn
+
+
+def seed(cur, chores, logs):
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    cur.execute(f"SET search_path TO {SCHEMA}")
+    cur.execute(
+        """
+        CREATE TABLE chores (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            interval_days INT NOT NULL,
+            due_date DATE NOT NULL,
+            done BOOLEAN DEFAULT FALSE,
+            done_by VARCHAR(255),
+            last_done DATE,
+            owner_email VARCHAR(255),
+            is_private BOOLEAN DEFAULT FALSE,
+            archived BOOLEAN DEFAULT FALSE
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE chore_logs (
+            id SERIAL PRIMARY KEY,
+            chore_id INT REFERENCES chores (id) ON DELETE CASCADE,
+            done_by VARCHAR(255),
+            done_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            action_type VARCHAR(50) NOT NULL,
+            action_details JSON DEFAULT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        INSERT INTO chores (name, interval_days, due_date)
+        SELECT 'chore ' || g, 1 + g %% 30, CURRENT_DATE + (g %% 60) - 20
+        FROM generate_series(1, %s) AS g
+        """,
+        (chores,),
+    )
+    cur.execute(
+        """
+        INSERT INTO chore_logs (chore_id, done_by, done_at, action_type, action_details)
+        SELECT 1 + g %% %s,
+               'user' || (g %% 7) || '@example.com',
+               TIMESTAMP '2024-01-01' + g * INTERVAL '1 minute',
+               'marked_done',
+               json_build_object('chore_id', 1 + g %% %s, 'previous_due_date', '2024-01-01',
+                                 'new_due_date', '2024-01-08')
+        FROM generate_series(1, %s) AS g
+        """,
+        (chores, chores, logs),
+    )
+    cur.execute("CREATE INDEX ON chore_logs (done_at DESC, id DESC)")
+    cur.execute("ANALYZE")
+
+
+def run_buffered(conn):
+    """The pre-streaming export_data body: fetchall, dicts per row, one JSON document."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, name, interval_days, due_date, done, done_by, archived, owner_email, is_private, last_done
+        FROM chores
+        WHERE is_private = FALSE OR (is_private = TRUE AND owner_email = %s)
+        """,
+        (USER_EMAIL,),
+    )
+    chores = []
+    for row in cur.fetchall():
+        chore = dict(zip([desc[0] for desc in cur.description], row))
+        for key in ("due_date", "last_done"):
+            if isinstance(chore.get(key), (datetime, date)):
+                chore[key] = chore[key].isoformat()
+        chores.append(chore)
+    cur.execute("SELECT id, chore_id, done_by, done_at, action_details, action_type FROM chore_logs ORDER BY done_at DESC")
+    logs = []
+    for row in cur.fetchall():
+        log = dict(zip([desc[0] for desc in cur.description], row))
+        if isinstance(log["done_at"], (datetime, date)):
+            log["done_at"] = log["done_at"].isoformat()
+        logs.append(log)
+    return len(json.dumps({"chores": chores, "logs": logs}).encode())
+
+
+def run_streaming(conn, fmt="ndjson", compress=False):
+    dataset = "all" if fmt == "ndjson" else "logs"
+    return sum(len(chunk) for chunk in export_stream(conn, USER_EMAIL, dataset, fmt, compress))
+
+
+STRATEGIES = {
+    "buffered-json": run_buffered,
+    "stream-ndjson": run_streaming,
+    "stream-csv": lambda conn: run_streaming(conn, "csv"),
+    "stream-ndjson-gzip": lambda conn: run_streaming(conn, "ndjson", True),
+}
+
+
+def child(strategy):
+    conn = connect()
+    try:
+        baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        size = STRATEGIES[strategy](conn)
+        elapsed = time.perf_counter() - started
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(json.dumps({"bytes": size, "seconds": elapsed, "baseline_kb": baseline_kb, "peak_kb": peak_kb}))
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chores", type=int, default=1000, help="number of synthetic chores to seed")
+    parser.add_argument("--logs", type=int, default=1_000_000, help="number of synthetic log rows to seed")
+    parser.add_argument("--strategy", choices=STRATEGIES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.strategy:
+        child(args.strategy)
+        return
+
+    conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        seed(cur, args.chores, args.logs)
+        print(f"chores={args.chores} logs={args.logs}")
+        for strategy in STRATEGIES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_export_stream", "--strategy", strategy],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{strategy:<20} peak_rss={result['peak_kb'] / 1024:8.1f}MiB "
+                f"(+{(result['peak_kb'] - result['baseline_kb']) / 1024:7.1f}MiB over baseline) "
+                f"output={result['bytes'] / 1024 / 1024:7.1f}MiB time={result['seconds']:.2f}s"
+            )
+    finally:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Benchmark: /api/import row-at-a-time vs the bulk COPY pipeline in app.importer.
+
+Builds a synthetic backup (half the chores reuse existing ids, half are new,
+plus logs), imports it with both strategies into a scratch schema and reports
+rows per second and round trips.
+
+Run from the backend directory against a disposable database:
+    POSTGRES_HOST=localhost python -m benchmarks.bench_import --chores 50000 --logs 100000
+"""
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+
+import psycopg2
+
+from app.database import DB_HOST, DB_NAME, DB_PASSWORD, DB_USER
+from app.importer import import_chore_batch, import_log_batch
+
+SCHEMA = "bench_import"
+USER_EMAIL = "bench@example.com"
+
+
+class CountingCursor:
+    """Wraps a cursor and counts statements sent to the server."""
+
+    def __init__(self, cur):
+        self._cur = cur
+        self.round_trips = 0
+
+    def execute(self, query, params=None):
+        self.round_trips += 1
+        self._cur.execute(query, params)
+
+    def copy_expert(self, sql, file):
+        self.round_trips += 1
+        self._cur.copy_expert(sql, file)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+def reset_schema(cur, existing):
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    cur.execute(f"SET search_path TO {SCHEMA}")
+    cur.execute(
+        """
+        CREATE TABLE chores (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            interval_days INT NOT NULL,
+            due_date DATE NOT NULL,
+            done BOOLEAN DEFAULT FALSE,
+            done_by VARCHAR(255),
+            last_done DATE,
+            owner_email VARCHAR(255),
+            is_private BOOLEAN DEFAULT FALSE,
+            archived BOOLEAN DEFAULT FALSE
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE chore_logs (
+            id SERIAL PRIMARY KEY,
+            chore_id INT REFERENCES chores (id) ON DELETE CASCADE,
+            done_by VARCHAR(255),
+            done_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            action_type VARCHAR(50) NOT NULL,
+            action_details JSON DEFAULT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        INSERT INTO chores (name, interval_days, due_date)
+        SELECT 'existing ' || g, 7, CURRENT_DATE FROM generate_series(1, %s) AS g
+        """,
+        (existing,),
+    )
+
+
+def build_payload(chores, logs):
+    existing = chores // 2
+    today = date.today()
+    payload_chores = [
+        {
+            "id": n + 1 if n < existing else None,
+            "name": f"chore {n}",
+            "interval_days": 1 + n % 30,
+            "due_date": (today + timedelta(days=n % 60)).isoformat(),
+            "is_private": n % 5 == 0,
+            "last_done": (today - timedelta(days=n % 10)).isoformat(),
+        }
+        for n in range(chores)
+    ]
+    payload_logs = [
+        {
+            "chore_id": 1 + n % existing,
+            "done_by": "bench",
+            "done_at": (datetime(2024, 1, 1) + timedelta(minutes=n)).isoformat(),
+            "action_type": "marked_done",
+            "action_details": {"chore_id": 1 + n % existing},
+        }
+        for n in range(logs)
+    ]
+    return existing, payload_chores, payload_logs
+
+
+def legacy_import(cur, chores, logs):
+    """The pre-COPY import_data loop: SELECT then UPDATE or INSERT per chore, INSERT per log."""
+    report = []
+    for chore in chores:
+        if chore.get("id"):
+            cur.execute("SELECT id FROM chores WHERE id = %s", (chore["id"],))
+            if cur.fetchone():
+                cur.execute(
+                    """
+                    UPDATE chores
+                    SET name = %s, interval_days = %s, due_date = %s,
+                        is_private = %s, owner_email = %s, last_done = %s
+                    WHERE id = %s
+                    """,
+                    (
+                        chore["name"], chore["interval_days"], chore["due_date"], chore.get("is_private", False),
+                        USER_EMAIL if chore.get("is_private", False) else None, chore.get("last_done"), chore["id"],
+                    ),
+                )
+                report.append({"id": chore["id"], "status": "updated"})
+                continue
+        cur.execute(
+            """
+            INSERT INTO chores (name, interval_days, due_date, archived, owner_email, is_private, last_done)
+            VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
+            """,
+            (
+                chore["name"], chore["interval_days"], chore["due_date"], chore.get("archived", False),
+                USER_EMAIL if chore.get("is_private", False) else None, chore.get("is_private", False),
+                chore.get("last_done"),
+            ),
+        )
+        report.append({"id": cur.fetchone()[0], "status": "created"})
+    for log in logs:
+        cur.execute(
+            """
+            INSERT INTO chore_logs (chore_id, done_by, done_at, action_type, action_details)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            (
+                log["chore_id"], log["done_by"], datetime.fromisoformat(log["done_at"]), log["action_type"],
+                json.dumps(log["action_details"]),
+            ),
+        )
+    return report, len(logs)
+
+
+def bulk_import(cur, chores, logs):
+    return import_chore_batch(cur, chores, USER_EMAIL), import_log_batch(cur, logs, USER_EMAIL)
+
+
+def run(conn, strategy, existing, chores, logs):
+    cur = conn.cursor()
+    reset_schema(cur, existing)
+    conn.commit()
+    counting = CountingCursor(cur)
+    started = time.perf_counter()
+    report, log_count = strategy(counting, chores, logs)
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    cur.close()
+    return report, log_count, counting.round_trips, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chores", type=int, default=50_000, help="number of chores in the synthetic backup")
+    parser.add_argument("--logs", type=int, default=100_000, help="number of logs in the synthetic backup")
+    args = parser.parse_args()
+
+    existing, chores, logs = build_payload(args.chores, args.logs)
+    conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASSWORD)
+    try:
+        results = {}
+        for label, strategy in (("row-at-a-time", legacy_import), ("bulk COPY", bulk_import)):
+            results[label] = run(conn, strategy, existing, chores, logs)
+
+        legacy_report, bulk_report = results["row-at-a-time"][0], results["bulk COPY"][0]
+        assert [r["status"] for r in legacy_report] == [r["status"] for r in bulk_report], "reports differ"
+
+        print(f"chores={args.chores} (existing ids={existing}) logs={args.logs}")
+        for label, (report, log_count, round_trips, elapsed) in results.items():
+            rows = len(report) + log_count
+            print(f"{label:<14} rows/s={rows / elapsed:10.0f} round_trips={round_trips:7d} time={elapsed:.2f}s")
+        print(f"speedup: {results['row-at-a-time'][3] / results['bulk COPY'][3]:.1f}x")
+    finally:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
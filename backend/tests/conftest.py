@@ -4,6 +4,7 @@ Shared pytest fixtures and reusable mocks for backend tests.
 
 import json
 import os
+from contextlib import asynccontextmanager
 from datetime import date, datetime
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -73,6 +74,46 @@ class MockConnection:
         self.closed = True
 
 
+class AsyncMockCursor(MockCursor):
+    """Async variant of MockCursor matching the psycopg 3 cursor API."""
+
+    async def execute(self, query: str, params: Any = None) -> None:
+        MockCursor.execute(self, query, params)
+
+    async def fetchone(self) -> Optional[Any]:
+        return MockCursor.fetchone(self)
+
+    async def fetchall(self) -> List[Any]:
+        return MockCursor.fetchall(self)
+
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "AsyncMockCursor":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+class AsyncMockConnection:
+    """Async variant of MockConnection for app.async_database consumers."""
+
+    def __init__(self, cursor: AsyncMockCursor):
+        self._cursor = cursor
+        self.committed = False
+        self.rolled_back = False
+
+    def cursor(self) -> AsyncMockCursor:
+        return self._cursor
+
+    async def commit(self) -> None:
+        self.committed = True
+
+    async def rollback(self) -> None:
+        self.rolled_back = True
+
+
 # =============================================================================
 # Mock Factories
 # =============================================================================
@@ -96,6 +137,41 @@ def create_mock_connection(
     return MockConnection(cursor)
 
 
+def create_async_mock_connection(
+    rows: Optional[List[Any]] = None,
+    description: Optional[List[Tuple[str]]] = None,
+    rowcount: int = 1,
+    fetchone_handler: Optional[Callable] = None,
+    fetchall_handler: Optional[Callable] = None,
+) -> AsyncMockConnection:
+    """Factory function to create an AsyncMockConnection with a configured AsyncMockCursor."""
+    cursor = AsyncMockCursor(
+        rows=rows,
+        description=description,
+        rowcount=rowcount,
+        fetchone_handler=fetchone_handler,
+        fetchall_handler=fetchall_handler,
+    )
+    return AsyncMockConnection(cursor)
+
+
+def async_connection_factory(conn: Any) -> Callable:
+    """
+    Build a stand-in for app.async_database.async_db_connection that yields conn.
+
+    Pass an exception instance instead of a connection to simulate a database
+    failure when the connection is checked out.
+    """
+
+    @asynccontextmanager
+    async def _async_db_connection():
+        if isinstance(conn, Exception):
+            raise conn
+        yield conn
+
+    return _async_db_connection
+
+
 # =============================================================================
 # Common Test Data Builders
 # =============================================================================
@@ -188,6 +264,38 @@ def mock_db_connection():
     return create_mock_connection
 
 
+@pytest.fixture
+def mock_async_db_connection():
+    """
+    Provides a factory fixture to create mock async database connections.
+
+    Usage in tests:
+        def test_something(mock_async_db_connection, monkeypatch):
+            conn = mock_async_db_connection(rows=[[1, "Test", ...]])
+            monkeypatch.setattr("app.api.routes.async_db_connection", async_connection_factory(conn))
+
+    or use the patch_async_db fixture below.
+    """
+    return create_async_mock_connection
+
+
+@pytest.fixture
+def patch_async_db(monkeypatch):
+    """
+    Patch an imported async_db_connection so it yields the given connection.
+
+    Usage in tests:
+        def test_something(mock_async_db_connection, patch_async_db):
+            conn = patch_async_db("app.api.routes.async_db_connection", mock_async_db_connection(rows=[]))
+    """
+
+    def _patch(target: str, conn: Any) -> Any:
+        monkeypatch.setattr(target, async_connection_factory(conn))
+        return conn
+
+    return _patch
+
+
 @pytest.fixture(scope="session", autouse=True)
 def fallback_fake_db():
     """Provide a lightweight fake database when PostgreSQL isn't available."""
@@ -236,8 +344,63 @@ def real_db_connection():
             password=os.getenv("POSTGRES_PASSWORD", "password"),
             connect_timeout=2,
         )
+        if not isinstance(conn, psycopg2.extensions.connection):
+            # fallback_fake_db replaced psycopg2.connect with a mock
+            pytest.skip("PostgreSQL not available")
         yield conn
         conn.rollback()
         conn.close()
     except Exception as e:
         pytest.skip(f"PostgreSQL not available: {e}")
+
+
+@pytest.fixture
+def scratch_db(real_db_connection):
+    """
+    Connection factory for an empty scratch schema holding chores and
+    chore_logs, for tests whose code opens its own connections. The schema is
+    dropped afterwards; skips if DB is unavailable.
+    """
+    schema = "test_scratch"
+    cur = real_db_connection.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema}")
+    cur.execute(
+        f"""
+        CREATE TABLE {schema}.chores (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            interval_days INT NOT NULL,
+            due_date DATE NOT NULL,
+            done BOOLEAN DEFAULT FALSE,
+            done_by VARCHAR(255),
+            archived BOOLEAN DEFAULT FALSE,
+            owner_email VARCHAR(255),
+            is_private BOOLEAN DEFAULT FALSE,
+            last_done DATE
+        );
+        CREATE TABLE {schema}.chore_logs (
+            id SERIAL PRIMARY KEY,
+            chore_id INT REFERENCES {schema}.chores (id) ON DELETE CASCADE,
+            done_by VARCHAR(255),
+            done_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            action_type VARCHAR(50) NOT NULL,
+            action_details JSON DEFAULT NULL
+        )
+        """
+    )
+    real_db_connection.commit()
+    params = real_db_connection.get_dsn_parameters()
+
+    def connect():
+        return psycopg2.connect(
+            host=params["host"],
+            dbname=params["dbname"],
+            user=params["user"],
+            password=os.getenv("POSTGRES_PASSWORD", "password"),
+            options=f"-c search_path={schema}",
+        )
+
+    yield connect
+    cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    real_db_connection.commit()
+    cur.close()
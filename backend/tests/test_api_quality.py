@@ -37,8 +37,8 @@ def test_mark_chore_done_updates_due_date_and_logs(monkeypatch):
             self.calls.append((query, params))
 
         def fetchone(self):
-            # interval_days, due_date, last_done
-            return (2, today, None)
+            # new due_date, previous due_date, previous last_done
+            return (today + timedelta(days=2), today, None)
 
         def close(self):
             pass
@@ -77,7 +77,9 @@ def test_mark_chore_done_updates_due_date_and_logs(monkeypatch):
     assert body["new_due_date"] == (today + timedelta(days=2)).isoformat()
     assert dummy_conn.committed is True
     assert dummy_conn.rolled_back is False
-    assert any("UPDATE chores" in call[0] for call in dummy_conn.cursor_obj.calls)
+    # One conditional UPDATE, no separate SELECT round trip
+    assert len(dummy_conn.cursor_obj.calls) == 1
+    assert "UPDATE chores" in dummy_conn.cursor_obj.calls[0][0]
     assert log_calls and log_calls[0][0][0] == 7
 
 
@@ -331,53 +333,40 @@ def test_import_data_creates_and_updates(monkeypatch):
     client = make_client()
 
     class DummyCursor:
-        def __init__(self):
-            self.pending_fetch = None
-            self.created = []
-            self.updated = []
-            self.inserted_logs = 0
-            self.next_id = 500
-
-        def execute(self, query, params=None):
-            if "SELECT id FROM chores" in query:
-                # Only id=101 exists already
-                self.pending_fetch = (101,) if params and params[0] == 101 else None
-            elif query.strip().startswith("UPDATE chores"):
-                # params: name, interval_days, due_date, is_private, owner_email, last_done, id
-                self.updated.append(params[6])
-                self.pending_fetch = None
-            elif query.strip().startswith("INSERT INTO chores"):
-                self.created.append(params[0])
-                self.pending_fetch = (self.next_id,)
-                self.next_id += 1
-            elif "INSERT INTO chore_logs" in query:
-                self.inserted_logs += 1
-                self.pending_fetch = None
-
-        def fetchone(self):
-            value = self.pending_fetch
-            self.pending_fetch = None
-            return value
-
         def close(self):
             pass
 
     class DummyConn:
         def __init__(self):
-            self.cursor_obj = DummyCursor()
             self.committed = False
+            self.rolled_back = False
 
         def cursor(self):
-            return self.cursor_obj
+            return DummyCursor()
 
         def commit(self):
             self.committed = True
 
+        def rollback(self):
+            self.rolled_back = True
+
         def close(self):
             pass
 
     dummy_conn = DummyConn()
     monkeypatch.setattr("app.api.routes.get_db_connection", lambda: dummy_conn)
+    batches = {}
+
+    def fake_import_chore_batch(cur, chores, user_email):
+        batches["chores"] = (chores, user_email)
+        return [{"id": 101, "status": "updated"}, {"id": 500, "status": "created"}]
+
+    def fake_import_log_batch(cur, logs, user_email):
+        batches["logs"] = (logs, user_email)
+        return len(logs)
+
+    monkeypatch.setattr("app.api.routes.import_chore_batch", fake_import_chore_batch)
+    monkeypatch.setattr("app.api.routes.import_log_batch", fake_import_log_batch)
     log_calls = []
     monkeypatch.setattr(
         "app.api.routes.log_action", lambda *a, **k: log_calls.append((a, k))
@@ -418,40 +407,37 @@ def test_import_data_creates_and_updates(monkeypatch):
     assert response.status_code == 200
     body = response.json()
     assert body["imported_chores"] == 2
+    assert body["imported_logs"] == 1
+    assert body["details"] == [{"id": 101, "status": "updated"}, {"id": 500, "status": "created"}]
     assert dummy_conn.committed is True
-    assert dummy_conn.cursor_obj.updated == [101]
-    assert dummy_conn.cursor_obj.created  # new chore created
-    assert dummy_conn.cursor_obj.inserted_logs == 1
+    assert batches["chores"] == (payload["chores"], "user@example.com")
+    assert batches["logs"] == (payload["logs"], "user@example.com")
     assert log_calls and log_calls[0][0][2] == "import"
 
 
-def test_get_chore_counts_returns_breakdown(monkeypatch):
+def test_import_data_rolls_back_on_failure(monkeypatch, mock_db_connection):
     client = make_client()
+    dummy_conn = mock_db_connection()
+    monkeypatch.setattr("app.api.routes.get_db_connection", lambda: dummy_conn)
 
-    class DummyCursor:
-        def __init__(self):
-            self.values = [12, 2, 3, 1, 4, 2]
+    def failing_import(cur, chores, user_email):
+        raise Exception("COPY failed")
 
-        def execute(self, *args, **kwargs):
-            pass
+    monkeypatch.setattr("app.api.routes.import_chore_batch", failing_import)
 
-        def fetchone(self):
-            return (self.values.pop(0),)
+    response = client.post("/api/import", json={"chores": [{"name": "x"}]})
 
-        def close(self):
-            pass
-
-    class DummyConn:
-        def __init__(self):
-            self.cursor_obj = DummyCursor()
-
-        def cursor(self):
-            return self.cursor_obj
+    assert response.status_code == 500
+    assert dummy_conn.rolled_back is True
+    assert dummy_conn.committed is False
 
-        def close(self):
-            pass
 
-    monkeypatch.setattr("app.api.routes.get_db_connection", lambda: DummyConn())
+def test_get_chore_counts_returns_breakdown(mock_async_db_connection, patch_async_db):
+    client = make_client()
+    patch_async_db(
+        "app.api.chore_counts_endpoint.async_db_connection",
+        mock_async_db_connection(rows=[(12, 2, 3, 1, 4, 2)]),
+    )
 
     response = client.get(
         "/api/chores/count", headers={"X-User-Email": "user@example.com"}
@@ -469,44 +455,22 @@ def test_get_chore_counts_returns_breakdown(monkeypatch):
     }
 
 
-def test_get_logs_parses_action_details(monkeypatch):
+def test_get_logs_parses_action_details(mock_async_db_connection, patch_async_db):
     client = make_client()
     log_time = datetime(2025, 1, 1, 10, 0, 0)
-
-    class DummyCursor:
-        def __init__(self):
-            self.description = None
-
-        def execute(self, *args, **kwargs):
-            pass
-
-        def fetchall(self):
-            return [
-                (
-                    1,
-                    None,
-                    "tester",
-                    log_time,
-                    json.dumps({"action": "json"}),
-                    "created",
-                ),
-                (2, None, "tester", log_time, "not-json", "created"),
-            ]
-
-        def close(self):
-            pass
-
-    class DummyConn:
-        def __init__(self):
-            self.cursor_obj = DummyCursor()
-
-        def cursor(self):
-            return self.cursor_obj
-
-        def close(self):
-            pass
-
-    monkeypatch.setattr("app.api.routes.get_db_connection", lambda: DummyConn())
+    rows = [
+        (
+            1,
+            None,
+            "tester",
+            log_time,
+            json.dumps({"action": "json"}),
+            "created",
+        ),
+        (2, None, "tester", log_time, "not-json", "created"),
+    ]
+
+    patch_async_db("app.api.routes.async_db_connection", mock_async_db_connection(rows=rows))
 
     response = client.get("/api/logs", headers={"X-User-Email": "user@example.com"})
 
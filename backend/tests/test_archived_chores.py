@@ -191,3 +191,65 @@ class TestArchivedChoresEndpoint:
         )
 
         assert response.status_code == 500
+
+    def test_cursor_mode_returns_next_cursor(self, mock_db_connection, monkeypatch):
+        """With a cursor the endpoint returns a page object and a cursor for the next page."""
+        client = make_client()
+        today = date.today()
+        rows = [
+            (1, "Archived 1", 7, today, False, None, True, None, False, None),
+            (2, "Archived 2", 7, today, False, None, True, None, False, None),
+            (3, "Archived 3", 7, today, False, None, True, None, False, None),
+        ]
+        conn = mock_db_connection(rows=rows)
+        monkeypatch.setattr("app.api.routes.get_db_connection", lambda: conn)
+
+        response = client.get(
+            "/api/chores/archived?cursor=&limit=2",
+            headers={"X-User-Email": "user@example.com"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [c["id"] for c in data["items"]] == [1, 2]
+        assert data["next_cursor"]
+        assert response.headers["X-Next-Cursor"] == data["next_cursor"]
+
+        # Following the cursor seeks past (due_date, id) of the last row instead of using OFFSET
+        conn.cursor().queries.clear()
+        response = client.get(
+            f"/api/chores/archived?cursor={data['next_cursor']}&limit=2",
+            headers={"X-User-Email": "user@example.com"},
+        )
+        assert response.status_code == 200
+        query, params = conn.cursor().queries[0]
+        assert "(due_date, id) > (%s, %s)" in query
+        assert "OFFSET" not in query
+        assert params == ("user@example.com", today, 2, 3)
+
+    def test_last_page_has_no_next_cursor(self, mock_db_connection, monkeypatch):
+        """When fewer rows than limit come back there is no next cursor."""
+        client = make_client()
+        conn = mock_db_connection(rows=[])
+        monkeypatch.setattr("app.api.routes.get_db_connection", lambda: conn)
+
+        response = client.get(
+            "/api/chores/archived?cursor=",
+            headers={"X-User-Email": "user@example.com"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_cursor": None}
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_rejects_malformed_cursor(self, mock_db_connection, monkeypatch):
+        """A cursor that does not decode to (due_date, id) is a client error."""
+        client = make_client()
+        monkeypatch.setattr("app.api.routes.get_db_connection", lambda: mock_db_connection())
+
+        response = client.get(
+            "/api/chores/archived?cursor=not-a-cursor",
+            headers={"X-User-Email": "user@example.com"},
+        )
+
+        assert response.status_code == 400
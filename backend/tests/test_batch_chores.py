@@ -0,0 +1,186 @@
+"""
+Tests for POST /api/chores/batch.
+
+Validation tests run anywhere; the others need PostgreSQL and run against
+the scratch_db schema.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import batch_endpoint
+from app.api.batch_endpoint import router
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+@pytest.fixture
+def seeded(scratch_db, monkeypatch):
+    """Three chores in the scratch schema; returns (connection, ids)."""
+    monkeypatch.setattr(batch_endpoint, "get_db_connection", scratch_db)
+    conn = scratch_db()
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO chores (name, interval_days, due_date, last_done, archived) VALUES
+                ('Dishes', 2, '2025-01-01', NULL, FALSE),
+                ('Laundry', 7, '2025-01-02', %s, FALSE),
+                ('Windows', 30, '2025-01-03', NULL, TRUE)
+            RETURNING id
+            """,
+            (date.today(),),
+        )
+        ids = [row[0] for row in cur.fetchall()]
+    conn.commit()
+    yield conn, ids
+    conn.close()
+
+
+def fetch(conn, query, params=None):
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        return cur.fetchall()
+
+
+def test_applies_mixed_operations_in_one_transaction(client, seeded):
+    conn, (dishes, laundry, windows) = seeded
+    today = date.today()
+
+    response = client.post(
+        "/api/chores/batch",
+        json={
+            "operations": [
+                {"op": "mark_done", "chore_id": dishes, "done_by": "alex"},
+                {"op": "mark_done", "chore_id": laundry, "done_by": "alex"},
+                {"op": "unarchive", "chore_id": windows},
+                {"op": "update", "chore_id": laundry, "name": "x", "interval_days": 1, "due_date": "2025-02-01"},
+                {"op": "archive", "chore_id": 424242},
+                {"op": "mark_done", "chore_id": dishes},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] == 2
+    assert [result["status"] for result in body["results"]] == [
+        "ok", "conflict", "ok", "conflict", "not_found", "invalid",
+    ]
+    assert body["results"][0]["new_due_date"] == (today + timedelta(days=2)).isoformat()
+    assert body["results"][1]["detail"] == "Chore already completed today"
+
+    assert fetch(conn, "SELECT id, done_by, due_date, archived FROM chores ORDER BY id") == [
+        (dishes, "alex", today + timedelta(days=2), False),
+        (laundry, None, date(2025, 1, 2), False),
+        (windows, None, date(2025, 1, 3), False),
+    ]
+    logs = fetch(conn, "SELECT chore_id, done_by, action_type, action_details FROM chore_logs ORDER BY chore_id")
+    assert [(chore_id, done_by, action) for chore_id, done_by, action, _ in logs] == [
+        (dishes, "alex", "marked_done"), (windows, None, "unarchived"),
+    ]
+    # Same undo payload as PUT /chores/{id}/done
+    assert logs[0][3] == {
+        "chore_id": dishes,
+        "new_due_date": (today + timedelta(days=2)).isoformat(),
+        "previous_due_date": "2025-01-01",
+        "previous_last_done": None,
+    }
+
+
+def test_update_logs_previous_state(client, seeded):
+    conn, (dishes, _, windows) = seeded
+
+    response = client.post(
+        "/api/chores/batch",
+        json={
+            "operations": [
+                {"op": "update", "chore_id": dishes, "name": "Plates", "interval_days": 3, "due_date": "2025-03-01"},
+                {"op": "archive", "chore_id": windows},
+            ]
+        },
+    )
+
+    assert response.json()["applied"] == 2
+    assert fetch(conn, "SELECT name, interval_days, due_date FROM chores WHERE id = %s", (dishes,)) == [
+        ("Plates", 3, date(2025, 3, 1))
+    ]
+    (details,) = fetch(conn, "SELECT action_details FROM chore_logs WHERE action_type = 'updated'")[0]
+    assert details["previous_state"]["name"] == "Dishes"
+    assert details["previous_state"]["due_date"] == "2025-01-01"
+
+
+def test_database_error_rolls_back_every_operation(client, seeded, monkeypatch):
+    conn, (dishes, _, windows) = seeded
+
+    def failing_log_actions(entries, conn):
+        raise RuntimeError("audit insert failed")
+
+    monkeypatch.setattr(batch_endpoint, "log_actions", failing_log_actions)
+
+    response = client.post(
+        "/api/chores/batch",
+        json={
+            "operations": [
+                {"op": "mark_done", "chore_id": dishes, "done_by": "alex"},
+                {"op": "unarchive", "chore_id": windows},
+            ]
+        },
+    )
+
+    assert response.status_code == 500
+    assert fetch(conn, "SELECT done, archived FROM chores WHERE id IN (%s, %s) ORDER BY id", (dishes, windows)) == [
+        (False, False), (False, True)
+    ]
+
+
+def test_invalid_operations_are_reported_without_touching_the_database(client, monkeypatch):
+    class NoQueryCursor:
+        def execute(self, query, params=None):
+            raise AssertionError(f"unexpected query: {query}")
+
+        def close(self):
+            pass
+
+    class NoQueryConnection:
+        def cursor(self):
+            return NoQueryCursor()
+
+        def commit(self):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(batch_endpoint, "get_db_connection", NoQueryConnection)
+
+    response = client.post(
+        "/api/chores/batch",
+        json={
+            "operations": [
+                {"op": "update", "chore_id": 1, "name": "x", "interval_days": 1, "due_date": "soon"},
+                {"op": "update", "chore_id": 1, "name": "x"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert [result["detail"] for result in response.json()["results"]] == [
+        "due_date must be an ISO date",
+        "name, interval_days and due_date are required",
+    ]
+
+
+def test_rejects_oversized_batches(client, monkeypatch):
+    monkeypatch.setattr(batch_endpoint, "BATCH_MAX_OPERATIONS", 2)
+
+    response = client.post("/api/chores/batch", json={"operations": [{"op": "archive", "chore_id": n} for n in range(3)]})
+
+    assert response.status_code == 400
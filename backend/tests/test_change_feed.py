@@ -0,0 +1,217 @@
+"""
+Tests for the /ws change feed.
+
+Endpoint tests publish straight into the hub. The trigger and listener tests
+need PostgreSQL and run in a scratch schema created by the migrations.
+"""
+
+import asyncio
+import json
+import os
+
+import psycopg
+import psycopg2
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app import changes
+from app.api.changes_endpoint import router
+from app.changes import ChangeHub, ChangeListener
+from app.migrations import migrate
+
+SHARED_CHORE = {"type": "chore", "action": "created", "id": 1, "name": "Dishes", "is_private": False, "owner_email": None}
+PRIVATE_CHORE = {"type": "chore", "action": "created", "id": 2, "name": "Diary", "is_private": True, "owner_email": "a@example.com"}
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = ChangeHub()
+    monkeypatch.setattr(changes, "_hub", hub)
+    return hub
+
+
+@pytest.fixture
+def client(hub):
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+
+
+def wait_for_subscribers(client, hub, count):
+    for _ in range(200):
+        if client.portal.call(lambda: hub.stats()["subscribers"]) >= count:
+            return
+        client.portal.call(asyncio.sleep, 0.01)
+    raise AssertionError("subscribers did not connect")
+
+
+class TestChangeFeedEndpoint:
+    def test_streams_visible_changes(self, client, hub):
+        with client.websocket_connect("/ws", headers={"X-User-Email": "b@example.com"}) as ws:
+            wait_for_subscribers(client, hub, 1)
+            client.portal.call(hub.publish, PRIVATE_CHORE)
+            client.portal.call(hub.publish, SHARED_CHORE)
+
+            assert ws.receive_json() == SHARED_CHORE
+
+    def test_owner_sees_private_changes(self, client, hub):
+        with client.websocket_connect("/ws", headers={"X-User-Email": "a@example.com"}) as ws:
+            wait_for_subscribers(client, hub, 1)
+            client.portal.call(hub.publish, PRIVATE_CHORE)
+
+            assert ws.receive_json()["name"] == "Diary"
+
+    def test_disconnect_unsubscribes(self, client, hub):
+        with client.websocket_connect("/ws"):
+            wait_for_subscribers(client, hub, 1)
+
+        for _ in range(200):
+            if client.portal.call(lambda: hub.stats()["subscribers"]) == 0:
+                break
+            client.portal.call(asyncio.sleep, 0.01)
+        assert hub.stats()["subscribers"] == 0
+
+    def test_heartbeat_and_ping(self, client, hub, monkeypatch):
+        monkeypatch.setattr(changes, "WS_HEARTBEAT_INTERVAL", 0.05)
+        with client.websocket_connect("/ws") as ws:
+            assert ws.receive_json() == {"type": "heartbeat"}
+            ws.send_text("ping")
+            messages = [ws.receive_json()["type"] for _ in range(3)]
+
+        assert "pong" in messages
+
+    def test_accepts_frontend_subprotocol(self, client, hub):
+        with client.websocket_connect("/ws", subprotocols=["echo-protocol"]) as ws:
+            assert ws.accepted_subprotocol == "echo-protocol"
+
+    def test_token_identifies_subscriber(self, client, hub, monkeypatch):
+        async def fake_verify(token):
+            if token != "good":
+                raise HTTPException(status_code=401, detail="Could not validate token")
+            return {"email": "a@example.com"}
+
+        monkeypatch.setattr("app.api.changes_endpoint.verify_token", fake_verify)
+
+        with pytest.raises(WebSocketDisconnect) as rejected:
+            with client.websocket_connect("/ws?token=bad"):
+                pass
+        assert rejected.value.code == 1008
+
+        with client.websocket_connect("/ws?token=good") as ws:
+            wait_for_subscribers(client, hub, 1)
+            client.portal.call(hub.publish, PRIVATE_CHORE)
+            assert ws.receive_json()["id"] == 2
+
+
+SCHEMA = "test_change_feed"
+
+
+@pytest.fixture
+def feed_db(real_db_connection):
+    """Connection params for a migrated scratch schema with the notify triggers."""
+    cur = real_db_connection.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+    real_db_connection.commit()
+    params = real_db_connection.get_dsn_parameters()
+    params = {
+        "host": params["host"], "dbname": params["dbname"], "user": params["user"],
+        "password": os.getenv("POSTGRES_PASSWORD", "password"),
+    }
+    conn = psycopg2.connect(**params, options=f"-c search_path={SCHEMA}")
+    migrate(conn)
+    yield conn, params
+    conn.close()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    real_db_connection.commit()
+    cur.close()
+
+
+def notifications(params, statements):
+    listener = psycopg.connect(**params, autocommit=True)
+    try:
+        listener.execute(f"LISTEN {changes.CHANGES_CHANNEL}")
+        statements()
+        return [json.loads(n.payload) for n in listener.notifies(timeout=0.5)]
+    finally:
+        listener.close()
+
+
+class TestNotifyTriggers:
+    def test_row_changes_are_notified_on_commit(self, feed_db):
+        conn, params = feed_db
+        cur = conn.cursor()
+
+        def statements():
+            cur.execute(
+                "INSERT INTO chores (name, interval_days, due_date, is_private, owner_email)"
+                " VALUES ('Diary', 7, CURRENT_DATE, TRUE, 'a@example.com') RETURNING id"
+            )
+            chore_id = cur.fetchone()[0]
+            cur.execute("UPDATE chores SET last_done = CURRENT_DATE WHERE id = %s", (chore_id,))
+            cur.execute("UPDATE chores SET name = name WHERE id = %s", (chore_id,))
+            cur.execute("INSERT INTO chore_logs (chore_id, action_type) VALUES (%s, 'marked_done')", (chore_id,))
+            cur.execute("UPDATE chores SET archived = TRUE WHERE id = %s", (chore_id,))
+            conn.commit()
+
+        events = notifications(params, statements)
+
+        assert [(e["type"], e["action"]) for e in events] == [
+            ("chore", "created"), ("chore", "marked_done"), ("log", "marked_done"), ("chore", "archived"),
+        ]
+        assert events[2]["owner_email"] == "a@example.com" and events[2]["is_private"] is True
+        assert "action_details" not in events[2]
+
+    def test_rolled_back_changes_are_not_notified(self, feed_db):
+        conn, params = feed_db
+
+        def statements():
+            with conn.cursor() as cur:
+                cur.execute("INSERT INTO chores (name, interval_days, due_date) VALUES ('x', 1, CURRENT_DATE)")
+            conn.rollback()
+
+        assert notifications(params, statements) == []
+
+    def test_large_statements_send_one_bulk_event(self, feed_db):
+        conn, params = feed_db
+
+        def statements():
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO chores (name, interval_days, due_date)"
+                    " SELECT 'c' || n, 1, CURRENT_DATE FROM generate_series(1, 500) AS n"
+                )
+            conn.commit()
+
+        assert notifications(params, statements) == [{"type": "chore", "action": "bulk", "count": 500}]
+
+
+def test_listener_delivers_committed_changes(feed_db):
+    conn, params = feed_db
+    hub = ChangeHub()
+    subscriber = hub.subscribe(None)
+    listener = ChangeListener(hub, conninfo=psycopg.conninfo.make_conninfo(**params))
+
+    async def run():
+        task = asyncio.create_task(listener.run())
+        try:
+            for _ in range(200):
+                if listener.listening:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.to_thread(_insert_shared_chore, conn)
+            return json.loads(await asyncio.wait_for(subscriber.queue.get(), timeout=5))
+        finally:
+            task.cancel()
+
+    message = asyncio.run(run())
+
+    assert (message["type"], message["action"], message["name"]) == ("chore", "created", "Listened")
+
+
+def _insert_shared_chore(conn):
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO chores (name, interval_days, due_date) VALUES ('Listened', 1, CURRENT_DATE)")
+    conn.commit()
@@ -1,11 +1,27 @@
 """
 Tests for the chore counts endpoint.
+
+The summary table tests need PostgreSQL and run in a scratch schema created
+by the migrations, so the maintenance triggers are exercised.
 """
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+
+import psycopg
+import psycopg2
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from app import chore_counts
+from app.api import chore_counts_endpoint
+from app.api.chore_counts_endpoint import CHORE_BUCKET_COUNT_COLUMNS, CHORE_BUCKETS, chore_bucket_params
 from app.api.routes import api_router
+from app.chore_counts import check_chore_due_counts, compact_chore_due_counts, seconds_until
+from app.migrations import migrate
 
 
 def make_client():
@@ -17,31 +33,11 @@ def make_client():
 class TestChoreCountsEndpoint:
     """Tests for the /api/chores/count endpoint."""
 
-    def test_returns_all_zero_counts_for_empty_db(self, monkeypatch):
+    def test_returns_all_zero_counts_for_empty_db(self, mock_async_db_connection, patch_async_db):
         """Empty database should return all zeros."""
         client = make_client()
 
-        class DummyCursor:
-            def execute(self, *args, **kwargs):
-                pass
-
-            def fetchone(self):
-                return (0,)
-
-            def close(self):
-                pass
-
-        class DummyConn:
-            def cursor(self):
-                return DummyCursor()
-
-            def close(self):
-                pass
-
-        monkeypatch.setattr(
-            "app.api.routes.get_db_connection",
-            lambda: DummyConn(),
-        )
+        patch_async_db("app.api.chore_counts_endpoint.async_db_connection", mock_async_db_connection(rows=[(0, 0, 0, 0, 0, 0)]))
 
         response = client.get(
             "/api/chores/count",
@@ -59,33 +55,14 @@ class TestChoreCountsEndpoint:
             "upcoming": 0,
         }
 
-    def test_returns_correct_counts(self, monkeypatch):
+    def test_returns_correct_counts(self, mock_async_db_connection, patch_async_db):
         """Should return correct counts for each category."""
         client = make_client()
 
-        # Mock different counts for each query
-        counts = iter([10, 2, 3, 1, 2, 2])  # all, overdue, today, tomorrow, thisWeek, upcoming
-
-        class DummyCursor:
-            def execute(self, *args, **kwargs):
-                pass
-
-            def fetchone(self):
-                return (next(counts),)
-
-            def close(self):
-                pass
-
-        class DummyConn:
-            def cursor(self):
-                return DummyCursor()
-
-            def close(self):
-                pass
-
-        monkeypatch.setattr(
-            "app.api.routes.get_db_connection",
-            lambda: DummyConn(),
+        # all, overdue, today, tomorrow, thisWeek, upcoming come back as one row
+        patch_async_db(
+            "app.api.chore_counts_endpoint.async_db_connection",
+            mock_async_db_connection(rows=[(10, 2, 3, 1, 2, 2)]),
         )
 
         response = client.get(
@@ -102,32 +79,10 @@ class TestChoreCountsEndpoint:
         assert data["thisWeek"] == 2
         assert data["upcoming"] == 2
 
-    def test_respects_user_email_header(self, monkeypatch):
+    def test_respects_user_email_header(self, mock_async_db_connection, patch_async_db):
         """The endpoint should pass the user email to each query."""
         client = make_client()
-        captured_params = []
-
-        class DummyCursor:
-            def execute(self, query, params=None):
-                captured_params.append(params)
-
-            def fetchone(self):
-                return (5,)
-
-            def close(self):
-                pass
-
-        class DummyConn:
-            def cursor(self):
-                return DummyCursor()
-
-            def close(self):
-                pass
-
-        monkeypatch.setattr(
-            "app.api.routes.get_db_connection",
-            lambda: DummyConn(),
-        )
+        conn = patch_async_db("app.api.chore_counts_endpoint.async_db_connection", mock_async_db_connection(rows=[(5, 1, 1, 1, 1, 1)]))
 
         response = client.get(
             "/api/chores/count",
@@ -136,21 +91,38 @@ class TestChoreCountsEndpoint:
 
         assert response.status_code == 200
         # All queries should have included the user email
+        captured_params = [params for _, params in conn.cursor().queries]
+        assert captured_params
         assert all("test@example.com" in str(p) for p in captured_params)
 
-    def test_handles_database_errors(self, monkeypatch):
+    def test_uses_single_round_trip(self, mock_async_db_connection, patch_async_db):
+        """All buckets come from one aggregate query using FILTER clauses."""
+        client = make_client()
+        conn = patch_async_db(
+            "app.api.chore_counts_endpoint.async_db_connection",
+            mock_async_db_connection(rows=[(4, 1, 1, 1, 1, 0)]),
+        )
+
+        response = client.get(
+            "/api/chores/count",
+            headers={"X-User-Email": "user@example.com"},
+        )
+
+        assert response.status_code == 200
+        queries = conn.cursor().queries
+        assert len(queries) == 1
+        query, params = queries[0]
+        assert query.count("FILTER (WHERE") == 5
+        assert params["tomorrow"] == params["today"] + timedelta(days=1)
+        assert params["next_week"] == params["today"] + timedelta(days=7)
+
+    def test_handles_database_errors(self, patch_async_db):
         """Database errors should return 500."""
         app = FastAPI()
         app.include_router(api_router)
         client = TestClient(app, raise_server_exceptions=False)
 
-        def raise_error():
-            raise Exception("Database connection failed")
-
-        monkeypatch.setattr(
-            "app.api.routes.get_db_connection",
-            raise_error,
-        )
+        patch_async_db("app.api.chore_counts_endpoint.async_db_connection", Exception("Database connection failed"))
 
         response = client.get(
             "/api/chores/count",
@@ -158,3 +130,157 @@ class TestChoreCountsEndpoint:
         )
 
         assert response.status_code == 500
+
+
+SCHEMA = "test_chore_counts"
+USERS = ("a@example.com", "b@example.com", None)
+
+# The pre-summary implementation: one pass over the visible chores
+SCAN_COUNTS_SQL = f"""
+    SELECT {CHORE_BUCKET_COUNT_COLUMNS}
+    FROM chores
+    WHERE archived = FALSE
+    AND (is_private = FALSE OR (is_private = TRUE AND owner_email = %(user_email)s))
+"""
+
+
+@pytest.fixture
+def counts_db(real_db_connection, monkeypatch):
+    """A psycopg2 connection to a migrated scratch schema read by the endpoint and the check."""
+    cur = real_db_connection.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+    real_db_connection.commit()
+    params = real_db_connection.get_dsn_parameters()
+    params = {
+        "host": params["host"], "dbname": params["dbname"], "user": params["user"],
+        "password": os.getenv("POSTGRES_PASSWORD", "password"), "options": f"-c search_path={SCHEMA}",
+    }
+
+    @asynccontextmanager
+    async def scratch_connection():
+        async with await psycopg.AsyncConnection.connect(**params) as conn:
+            yield conn
+
+    monkeypatch.setattr(chore_counts_endpoint, "async_db_connection", scratch_connection)
+    monkeypatch.setattr(chore_counts, "async_db_connection", scratch_connection)
+    conn = psycopg2.connect(**params)
+    migrate(conn)
+    yield conn
+    conn.close()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    real_db_connection.commit()
+    cur.close()
+
+
+def execute(conn, sql, params=None):
+    with conn.cursor() as cur:
+        cur.execute(sql, params)
+    conn.commit()
+
+
+def assert_counts_match_a_scan(conn):
+    client = make_client()
+    for user in USERS:
+        with conn.cursor() as cur:
+            cur.execute(SCAN_COUNTS_SQL, chore_bucket_params(user))
+            expected = dict(zip(CHORE_BUCKETS, cur.fetchone()))
+        headers = {"X-User-Email": user} if user else {}
+        assert client.get("/api/chores/count", headers=headers).json() == expected, user
+
+
+class TestChoreDueCounts:
+    def test_counts_follow_every_kind_of_write(self, counts_db):
+        execute(
+            counts_db,
+            """
+            INSERT INTO chores (name, interval_days, due_date, is_private, owner_email, archived)
+            SELECT 'c' || n, 1, CURRENT_DATE + (n % 12) - 3, n % 4 = 0,
+                   CASE WHEN n % 4 = 0 THEN 'a@example.com' WHEN n % 5 = 0 THEN 'b@example.com' END,
+                   n % 9 = 0
+            FROM generate_series(1, 60) AS n
+            """,
+        )
+        assert_counts_match_a_scan(counts_db)
+
+        execute(counts_db, "UPDATE chores SET due_date = due_date + 7, last_done = CURRENT_DATE WHERE id % 3 = 0")
+        execute(counts_db, "UPDATE chores SET is_private = TRUE, owner_email = 'b@example.com' WHERE id % 7 = 0")
+        execute(counts_db, "UPDATE chores SET archived = NOT archived WHERE id % 5 = 0")
+        execute(counts_db, "UPDATE chores SET name = name || '!'")
+        execute(counts_db, "DELETE FROM chores WHERE id % 11 = 0")
+        assert_counts_match_a_scan(counts_db)
+
+        execute(counts_db, "TRUNCATE chores CASCADE")
+        assert_counts_match_a_scan(counts_db)
+
+    def test_private_chores_with_an_empty_owner_are_not_shared(self, counts_db):
+        execute(
+            counts_db,
+            """
+            INSERT INTO chores (name, interval_days, due_date, is_private, owner_email) VALUES
+                ('shared', 1, CURRENT_DATE, FALSE, NULL),
+                ('empty owner', 1, CURRENT_DATE, TRUE, ''),
+                ('no owner', 1, CURRENT_DATE, TRUE, NULL),
+                ('unknown privacy', 1, CURRENT_DATE, NULL, 'a@example.com')
+            """,
+        )
+
+        assert_counts_match_a_scan(counts_db)
+        assert make_client().get("/api/chores/count", headers={"X-User-Email": "b@example.com"}).json()["all"] == 1
+
+    def test_rolled_back_writes_leave_counts_alone(self, counts_db):
+        with counts_db.cursor() as cur:
+            cur.execute("INSERT INTO chores (name, interval_days, due_date) VALUES ('x', 1, CURRENT_DATE)")
+        counts_db.rollback()
+
+        assert make_client().get("/api/chores/count").json()["all"] == 0
+
+    def test_concurrent_writers_do_not_wait_on_each_other(self, counts_db):
+        other = psycopg2.connect(**counts_db.get_dsn_parameters(), password=os.getenv("POSTGRES_PASSWORD", "password"))
+        try:
+            with other.cursor() as cur:
+                cur.execute(f"SET search_path = {SCHEMA}")
+                cur.execute("INSERT INTO chores (name, interval_days, due_date) VALUES ('open', 1, CURRENT_DATE)")
+            with counts_db.cursor() as cur:
+                cur.execute("SET lock_timeout = 1000")
+            execute(counts_db, "INSERT INTO chores (name, interval_days, due_date) VALUES ('x', 1, CURRENT_DATE)")
+            other.commit()
+        finally:
+            other.close()
+
+        assert_counts_match_a_scan(counts_db)
+
+    def test_compaction_folds_deltas_without_changing_counts(self, counts_db):
+        execute(counts_db, "INSERT INTO chores (name, interval_days, due_date) SELECT 'c', 1, CURRENT_DATE FROM generate_series(1, 3)")
+        for _ in range(3):
+            execute(counts_db, "UPDATE chores SET due_date = due_date + 1")
+        execute(counts_db, "UPDATE chores SET due_date = CURRENT_DATE + 10 WHERE id = 1")
+
+        assert asyncio.run(compact_chore_due_counts()) == 9 - 2
+        assert_counts_match_a_scan(counts_db)
+        with counts_db.cursor() as cur:
+            cur.execute("SELECT due_date - CURRENT_DATE, chores FROM chore_due_counts ORDER BY 1")
+            assert cur.fetchall() == [(3, 2), (10, 1)]
+
+    def test_nightly_check_repairs_drift_and_prunes_empty_keys(self, counts_db):
+        execute(counts_db, "INSERT INTO chores (name, interval_days, due_date) VALUES ('x', 1, CURRENT_DATE)")
+        execute(counts_db, "INSERT INTO chores (name, interval_days, due_date) VALUES ('y', 1, CURRENT_DATE + 1)")
+        execute(counts_db, "DELETE FROM chores WHERE name = 'y'")
+        # Simulate writes that bypassed the triggers
+        execute(counts_db, "SET session_replication_role = replica")
+        execute(counts_db, "INSERT INTO chores (name, interval_days, due_date) VALUES ('z', 1, CURRENT_DATE)")
+        execute(counts_db, "SET session_replication_role = DEFAULT")
+
+        drift = asyncio.run(check_chore_due_counts())
+
+        assert drift == [(None, date.today(), 2, 1)]
+        assert_counts_match_a_scan(counts_db)
+        assert asyncio.run(check_chore_due_counts()) == []
+        with counts_db.cursor() as cur:
+            cur.execute("SELECT scope, due_date, chores FROM chore_due_counts")
+            assert cur.fetchall() == [(None, date.today(), 2)]
+
+
+def test_nightly_check_runs_at_the_next_configured_hour():
+    assert seconds_until(3, datetime(2025, 1, 1, 2, 30)) == 30 * 60
+    assert seconds_until(3, datetime(2025, 1, 1, 3, 0)) == 24 * 3600
+    assert seconds_until(3, datetime(2025, 1, 1, 23, 0)) == 4 * 3600
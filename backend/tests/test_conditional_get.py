@@ -0,0 +1,155 @@
+"""
+Tests for ETag / If-None-Match support on the read endpoints.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import data_version
+from app.api.routes import api_router
+from app.data_version import bump_data_version, etag_matches
+
+USER = {"X-User-Email": "user@example.com"}
+CHORE_ROW = (1, "Dishes", 1, date(2025, 1, 1), False, None, False, None, False, None)
+CHORE_COLUMNS = [(name,) for name in (
+    "id", "name", "interval_days", "due_date", "done", "done_by", "archived", "owner_email", "is_private", "last_done"
+)]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(api_router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def checkouts(monkeypatch, mock_async_db_connection):
+    """Serve canned rows to every read endpoint and count connection checkouts."""
+    checkouts = []
+    connections = {
+        "app.api.routes": mock_async_db_connection(rows=[CHORE_ROW], description=CHORE_COLUMNS),
+        "app.api.chore_counts_endpoint": mock_async_db_connection(rows=[(1, 0, 1, 0, 0, 0)]),
+        "app.api.household_health_endpoint": mock_async_db_connection(rows=[(1, 90.0)]),
+    }
+    for module, conn in connections.items():
+
+        @asynccontextmanager
+        async def connect(module=module, conn=conn):
+            checkouts.append(module)
+            yield conn
+
+        monkeypatch.setattr(f"{module}.async_db_connection", connect)
+    return checkouts
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/chores", "/api/chores?cursor=", "/api/chores/count", "/api/chores/household-health"]
+)
+def test_matching_etag_is_answered_without_the_database(client, checkouts, path):
+    first = client.get(path, headers=USER)
+    etag = first.headers["ETag"]
+
+    second = client.get(path, headers={**USER, "If-None-Match": etag})
+
+    assert first.status_code == 200 and etag.startswith('W/"')
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
+    assert len(checkouts) == 1
+
+
+def test_logs_endpoint_is_conditional(client, mock_async_db_connection, patch_async_db):
+    log_row = (1, 1, "tester", datetime(2025, 1, 1, 12), "{}", "marked_done")
+    patch_async_db("app.api.routes.async_db_connection", mock_async_db_connection(rows=[log_row]))
+    etag = client.get("/api/logs", headers=USER).headers["ETag"]
+
+    assert client.get("/api/logs", headers={**USER, "If-None-Match": etag}).status_code == 304
+
+
+def test_data_change_invalidates_etag(client, checkouts):
+    etag = client.get("/api/chores", headers=USER).headers["ETag"]
+
+    bump_data_version()
+    response = client.get("/api/chores", headers={**USER, "If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_is_scoped_to_user_and_query(client, checkouts):
+    etag = client.get("/api/chores", headers=USER).headers["ETag"]
+
+    other_user = client.get("/api/chores", headers={"X-User-Email": "other@example.com", "If-None-Match": etag})
+    other_page = client.get("/api/chores?page=2", headers={**USER, "If-None-Match": etag})
+
+    assert (other_user.status_code, other_page.status_code) == (200, 200)
+
+
+def test_mutations_bump_the_version(client, mock_db_connection, monkeypatch):
+    conn = mock_db_connection(rows=[[123]])
+    monkeypatch.setattr("app.api.routes.get_db_connection", lambda: conn)
+    before = data_version.current_data_version()
+
+    response = client.post(
+        "/api/chores", json={"name": "Dishes", "interval_days": 1, "due_date": "2025-01-01"}, headers=USER
+    )
+
+    assert response.status_code == 200
+    assert data_version.current_data_version() == before + 1
+
+
+def test_streaming_import_invalidates_etag(client, checkouts, mock_db_connection, monkeypatch):
+    monkeypatch.setattr("app.api.import_endpoint.get_db_connection", lambda: mock_db_connection())
+    monkeypatch.setattr("app.api.import_endpoint.log_action", lambda *a, **k: None)
+    monkeypatch.setattr(
+        "app.importer.import_chore_batch",
+        lambda cur, chores, user_email, errors=None: [{"id": 2, "status": "created"} for _ in chores],
+    )
+    monkeypatch.setattr("app.importer.import_log_batch", lambda cur, logs, user_email, errors=None: len(logs))
+    etag = client.get("/api/chores", headers=USER).headers["ETag"]
+
+    imported = client.post("/api/import/stream", content=b'{"chores": [{"name": "Laundry"}]}', headers=USER)
+    response = client.get("/api/chores", headers={**USER, "If-None-Match": etag})
+
+    assert imported.status_code == 200
+    assert response.status_code == 200
+
+
+def test_failed_mutations_do_not_bump_the_version(client, mock_db_connection, monkeypatch):
+    conn = mock_db_connection(rows=[], rowcount=0)
+    monkeypatch.setattr("app.api.routes.get_db_connection", lambda: conn)
+    before = data_version.current_data_version()
+
+    client.put("/api/chores/1/archive")
+
+    assert data_version.current_data_version() == before
+
+
+def test_metrics_report_not_modified_ratio(client, checkouts, monkeypatch):
+    monkeypatch.setattr(data_version, "_stats", {"requests": 0, "conditional": 0, "not_modified": 0})
+    etag = client.get("/api/chores", headers=USER).headers["ETag"]
+    client.get("/api/chores", headers={**USER, "If-None-Match": etag})
+
+    stats = client.get("/api/metrics").json()["conditional_get"]
+
+    assert (stats["requests"], stats["conditional"], stats["not_modified"]) == (2, 1, 1)
+    assert stats["not_modified_ratio"] == 0.5
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ('W/"a-1-x"', True),
+        ('"a-1-x"', True),
+        ('W/"b-2-y", W/"a-1-x"', True),
+        ("*", True),
+        ('W/"a-2-x"', False),
+    ],
+)
+def test_etag_matching_is_weak(header, expected):
+    assert etag_matches(header, 'W/"a-1-x"') is expected
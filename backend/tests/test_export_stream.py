@@ -0,0 +1,202 @@
+"""
+Tests for the streaming export endpoint.
+"""
+
+import csv
+import gc
+import gzip
+import io
+import json
+import threading
+from datetime import date, datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api.export_endpoint import export_stream, router, stream_export
+
+CHORE_ROWS = [
+    (1, "Dishes", 1, date(2025, 1, 1), False, None, False, None, False, None),
+    (2, "Laundry", 7, date(2025, 1, 5), False, None, False, "user@example.com", True, date(2024, 12, 29)),
+]
+LOG_ROWS = [
+    (11, 2, "user@example.com", datetime(2025, 1, 2, 8, 30), {"chore_id": 2}, "marked_done"),
+    (10, 1, None, datetime(2025, 1, 1, 9, 0), None, "created"),
+]
+
+
+class NamedCursor:
+    """Server-side cursor stand-in that hands out rows in fetchmany batches."""
+
+    def __init__(self, conn, name):
+        self.conn = conn
+        self.name = name
+        self.itersize = None
+        self._rows = []
+
+    def execute(self, query, params=None):
+        self.conn.queries.append((self.name, query, params))
+        self._rows = list(LOG_ROWS if "chore_logs" in query else CHORE_ROWS)
+
+    def fetchmany(self, size):
+        self.conn.fetch_sizes.append(size)
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+
+    def close(self):
+        pass
+
+
+class StreamingConnection:
+    def __init__(self):
+        self.queries = []
+        self.fetch_sizes = []
+        self.closed = False
+
+    def cursor(self, name=None):
+        assert name, "export must use a named (server-side) cursor"
+        return NamedCursor(self, name)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def make_client(monkeypatch, conn):
+    def connect(**kwargs):
+        conn.connect_options = kwargs
+        return conn
+
+    monkeypatch.setattr("app.api.export_endpoint.get_unpooled_connection", connect)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+def test_streams_ndjson_for_all_datasets(monkeypatch):
+    conn = StreamingConnection()
+    client = make_client(monkeypatch, conn)
+
+    response = client.get("/api/export/stream", headers={"X-User-Email": "user@example.com"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [(r["type"], r["id"]) for r in records] == [("chore", 1), ("chore", 2), ("log", 11), ("log", 10)]
+    assert records[1]["last_done"] == "2024-12-29"
+    assert records[2]["done_at"] == "2025-01-02T08:30:00"
+    assert all(params == {"user_email": "user@example.com"} for _, _, params in conn.queries)
+    assert conn.closed is True
+
+
+def test_reads_in_batches():
+    conn = StreamingConnection()
+
+    chunks = list(export_stream(conn, "user@example.com", "logs", "ndjson", batch_size=1))
+
+    # One chunk per fetched batch, plus the final empty fetch that ends the cursor
+    assert len(chunks) == 2
+    assert conn.fetch_sizes == [1, 1, 1]
+
+
+def test_streams_csv_logs(monkeypatch):
+    conn = StreamingConnection()
+    client = make_client(monkeypatch, conn)
+
+    response = client.get("/api/export/stream?format=csv&dataset=logs")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "chore_id", "done_by", "done_at", "action_details", "action_type"]
+    assert rows[1] == ["11", "2", "user@example.com", "2025-01-02T08:30:00", '{"chore_id": 2}', "marked_done"]
+    assert len(rows) == 3
+
+
+def test_gzip_output(monkeypatch):
+    conn = StreamingConnection()
+    client = make_client(monkeypatch, conn)
+
+    response = client.get("/api/export/stream?dataset=chores&gzip=true")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert 'filename="choremane-chores.ndjson.gz"' in response.headers["content-disposition"]
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["Dishes", "Laundry"]
+
+
+def test_csv_requires_single_dataset(monkeypatch):
+    conn = StreamingConnection()
+    client = make_client(monkeypatch, conn)
+
+    response = client.get("/api/export/stream?format=csv")
+
+    assert response.status_code == 400
+    assert conn.queries == []
+
+
+def test_database_unavailable_returns_500(monkeypatch):
+    def fail(**kwargs):
+        raise Exception("Database connection failed")
+
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr("app.api.export_endpoint._export_slots", slots)
+    monkeypatch.setattr("app.api.export_endpoint.get_unpooled_connection", fail)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    client = TestClient(app, raise_server_exceptions=False)
+
+    response = client.get("/api/export/stream")
+
+    assert response.status_code == 500
+    # The slot is handed back when the connection cannot be opened
+    assert slots.acquire(blocking=False)
+
+
+def test_export_uses_its_own_connection_with_timeouts(monkeypatch):
+    conn = StreamingConnection()
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr("app.api.export_endpoint._export_slots", slots)
+    client = make_client(monkeypatch, conn)
+
+    response = client.get("/api/export/stream?dataset=chores")
+
+    assert response.status_code == 200
+    assert "statement_timeout=" in conn.connect_options["options"]
+    assert "idle_in_transaction_session_timeout=" in conn.connect_options["options"]
+    assert conn.closed
+    assert slots.acquire(blocking=False)
+
+
+def test_concurrent_exports_are_capped(monkeypatch):
+    conn = StreamingConnection()
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr("app.api.export_endpoint._export_slots", slots)
+    client = make_client(monkeypatch, conn)
+
+    response = client.get("/api/export/stream")
+
+    assert response.status_code == 503
+    assert conn.queries == []
+
+
+def test_dropped_response_frees_its_slot(monkeypatch):
+    conn = StreamingConnection()
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr("app.api.export_endpoint._export_slots", slots)
+    monkeypatch.setattr("app.api.export_endpoint.get_unpooled_connection", lambda **kwargs: conn)
+    request = Request({"type": "http", "method": "GET", "path": "/api/export/stream", "headers": []})
+
+    # The client disconnects before the body is ever iterated
+    response = stream_export(request, format="ndjson", dataset="all", gzip=False)
+    assert not slots.acquire(blocking=False)
+    del response
+    gc.collect()
+
+    assert conn.closed
+    assert slots.acquire(blocking=False)
@@ -2,12 +2,24 @@
 Tests for the household health endpoint.
 """
 
-from datetime import date, timedelta
+from datetime import datetime, timedelta
 
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
 
-from app.api.household_health_endpoint import router
+from app.api.household_health_endpoint import (
+    HOUSEHOLD_HEALTH_SQL,
+    health_score_from_aggregate,
+    router,
+)
+from app.services import (
+    calculate_household_health_score,
+    calculate_single_chore_score,
+    normalize_due_date,
+)
 
 
 def make_client():
@@ -19,31 +31,12 @@ def make_client():
 class TestHouseholdHealthEndpoint:
     """Tests for the /api/chores/household-health endpoint."""
 
-    def test_returns_100_for_no_chores(self, monkeypatch):
+    def test_returns_100_for_no_chores(self, mock_async_db_connection, patch_async_db):
         """Empty chore list should return score 100."""
         client = make_client()
+        conn = mock_async_db_connection(rows=[(0, None)])
 
-        class DummyCursor:
-            def execute(self, *args, **kwargs):
-                pass
-
-            def fetchall(self):
-                return []
-
-            def close(self):
-                pass
-
-        class DummyConn:
-            def cursor(self):
-                return DummyCursor()
-
-            def close(self):
-                pass
-
-        monkeypatch.setattr(
-            "app.api.household_health_endpoint.get_db_connection",
-            lambda: DummyConn(),
-        )
+        patch_async_db("app.api.household_health_endpoint.async_db_connection", conn)
 
         response = client.get(
             "/api/chores/household-health",
@@ -53,33 +46,13 @@ class TestHouseholdHealthEndpoint:
         assert response.status_code == 200
         assert response.json() == {"score": 100}
 
-    def test_returns_score_for_fresh_chores(self, monkeypatch):
+    def test_returns_score_for_fresh_chores(self, mock_async_db_connection, patch_async_db):
         """Fresh chores should result in a high score."""
         client = make_client()
-        # Chore due 10 days from now with 7-day interval = very fresh
-        future_date = date.today() + timedelta(days=10)
-
-        class DummyCursor:
-            def execute(self, *args, **kwargs):
-                pass
-
-            def fetchall(self):
-                return [(future_date, 7)]
-
-            def close(self):
-                pass
+        # One chore averaging a perfect score
+        conn = mock_async_db_connection(rows=[(1, 100.0)])
 
-        class DummyConn:
-            def cursor(self):
-                return DummyCursor()
-
-            def close(self):
-                pass
-
-        monkeypatch.setattr(
-            "app.api.household_health_endpoint.get_db_connection",
-            lambda: DummyConn(),
-        )
+        patch_async_db("app.api.household_health_endpoint.async_db_connection", conn)
 
         response = client.get(
             "/api/chores/household-health",
@@ -89,33 +62,13 @@ class TestHouseholdHealthEndpoint:
         assert response.status_code == 200
         assert response.json()["score"] == 100
 
-    def test_returns_low_score_for_overdue_chores(self, monkeypatch):
+    def test_returns_low_score_for_overdue_chores(self, mock_async_db_connection, patch_async_db):
         """Overdue chores should result in a lower score."""
         client = make_client()
-        # Chore due 5 days ago with 10-day interval = 50% overdue
-        past_date = date.today() - timedelta(days=5)
-
-        class DummyCursor:
-            def execute(self, *args, **kwargs):
-                pass
+        # Chore 50% overdue averages a score of 40 in SQL
+        conn = mock_async_db_connection(rows=[(1, 40.0)])
 
-            def fetchall(self):
-                return [(past_date, 10)]
-
-            def close(self):
-                pass
-
-        class DummyConn:
-            def cursor(self):
-                return DummyCursor()
-
-            def close(self):
-                pass
-
-        monkeypatch.setattr(
-            "app.api.household_health_endpoint.get_db_connection",
-            lambda: DummyConn(),
-        )
+        patch_async_db("app.api.household_health_endpoint.async_db_connection", conn)
 
         response = client.get(
             "/api/chores/household-health",
@@ -127,20 +80,14 @@ class TestHouseholdHealthEndpoint:
         score = response.json()["score"]
         assert score < 50
 
-    def test_handles_database_errors(self, monkeypatch):
+    def test_handles_database_errors(self, patch_async_db):
         """Database errors should return 500 or cause an exception."""
         app = FastAPI()
         app.include_router(router, prefix="/api")
         # Use raise_server_exceptions=False to get HTTP response instead of exception
         client = TestClient(app, raise_server_exceptions=False)
 
-        def raise_error():
-            raise Exception("Database connection failed")
-
-        monkeypatch.setattr(
-            "app.api.household_health_endpoint.get_db_connection",
-            raise_error,
-        )
+        patch_async_db("app.api.household_health_endpoint.async_db_connection", Exception("Database connection failed"))
 
         response = client.get(
             "/api/chores/household-health",
@@ -150,32 +97,28 @@ class TestHouseholdHealthEndpoint:
         # Server error should return 500
         assert response.status_code == 500
 
-    def test_respects_user_email_header(self, monkeypatch):
-        """The endpoint should pass the user email to the query."""
+    def test_rounds_average_like_python_implementation(self, mock_async_db_connection, patch_async_db):
+        """The SQL average is rounded with Python's round() to match the reference path."""
         client = make_client()
-        captured_params = []
-
-        class DummyCursor:
-            def execute(self, query, params=None):
-                captured_params.append(params)
-
-            def fetchall(self):
-                return []
+        patch_async_db(
+            "app.api.household_health_endpoint.async_db_connection",
+            mock_async_db_connection(rows=[(2, 90.5)]),
+        )
 
-            def close(self):
-                pass
+        response = client.get(
+            "/api/chores/household-health",
+            headers={"X-User-Email": "user@example.com"},
+        )
 
-        class DummyConn:
-            def cursor(self):
-                return DummyCursor()
+        assert response.status_code == 200
+        assert response.json()["score"] == round(90.5)
 
-            def close(self):
-                pass
+    def test_respects_user_email_header(self, mock_async_db_connection, patch_async_db):
+        """The endpoint should pass the user email to the query."""
+        client = make_client()
+        conn = mock_async_db_connection(rows=[(0, None)])
 
-        monkeypatch.setattr(
-            "app.api.household_health_endpoint.get_db_connection",
-            lambda: DummyConn(),
-        )
+        patch_async_db("app.api.household_health_endpoint.async_db_connection", conn)
 
         response = client.get(
             "/api/chores/household-health",
@@ -184,4 +127,58 @@ class TestHouseholdHealthEndpoint:
 
         assert response.status_code == 200
         # The user email should have been passed to the query
-        assert captured_params and captured_params[0] == ("test@example.com",)
+        captured_params = [params for _, params in conn.cursor().queries]
+        assert captured_params and captured_params[0]["user_email"] == "test@example.com"
+
+
+class TestHouseholdHealthSqlParity:
+    """Property-based check that the SQL scorer matches services.calculate_household_health_score."""
+
+    @settings(
+        max_examples=150,
+        deadline=None,
+        suppress_health_check=[HealthCheck.function_scoped_fixture],
+    )
+    @given(
+        chores=st.lists(
+            st.tuples(
+                st.integers(min_value=-400, max_value=400),  # due date offset in days
+                st.integers(min_value=-2, max_value=365),  # interval_days, including invalid ones
+            ),
+            max_size=25,
+        ),
+        now=st.datetimes(min_value=datetime(2020, 1, 1), max_value=datetime(2030, 12, 31)),
+    )
+    def test_sql_matches_python_oracle(self, real_db_connection, chores, now):
+        cur = real_db_connection.cursor()
+        cur.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS chores (
+                due_date DATE NOT NULL,
+                interval_days INT,
+                archived BOOLEAN DEFAULT FALSE,
+                is_private BOOLEAN DEFAULT FALSE,
+                owner_email VARCHAR(255)
+            )
+            """
+        )
+        cur.execute("TRUNCATE pg_temp.chores")
+        rows = [(now.date() + timedelta(days=offset), interval) for offset, interval in chores]
+        for due_date, interval_days in rows:
+            cur.execute(
+                "INSERT INTO pg_temp.chores (due_date, interval_days) VALUES (%s, %s)",
+                (due_date, interval_days),
+            )
+
+        cur.execute(HOUSEHOLD_HEALTH_SQL, {"now": now, "user_email": "user@example.com"})
+        chore_count, sql_average = cur.fetchone()
+
+        valid = [(d, i) for d, i in rows if i > 0]
+        assert chore_count == len(valid)
+        if valid:
+            python_average = sum(
+                calculate_single_chore_score(normalize_due_date(d), i, now) for d, i in valid
+            ) / len(valid)
+            assert sql_average == pytest.approx(python_average, abs=1e-6)
+        sql_score = health_score_from_aggregate(chore_count, sql_average)
+        assert abs(sql_score - calculate_household_health_score(rows, now)) <= 1
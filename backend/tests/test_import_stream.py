@@ -0,0 +1,163 @@
+"""
+Tests for the incremental streaming import.
+
+The COPY batch loaders are replaced with recorders, so these tests exercise
+the parser, batching and endpoint without PostgreSQL.
+"""
+
+import json
+
+import ijson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.import_endpoint import router
+from app.importer import StreamingImport
+
+
+@pytest.fixture
+def loaded(monkeypatch):
+    """Record each batch handed to the database loaders."""
+    batches = []
+
+    def fake_chore_batch(cur, chores, user_email, errors=None):
+        batches.append(("chores", list(chores)))
+        report = []
+        for index, chore in enumerate(chores):
+            if not isinstance(chore, dict) or "name" not in chore:
+                errors.append({"index": index, "name": None, "error": "name is required"})
+                continue
+            report.append({"id": chore.get("id") or 1000 + index, "status": "updated" if chore.get("id") else "created"})
+        return report
+
+    def fake_log_batch(cur, logs, user_email, errors=None):
+        batches.append(("logs", list(logs)))
+        return len(logs)
+
+    monkeypatch.setattr("app.importer.import_chore_batch", fake_chore_batch)
+    monkeypatch.setattr("app.importer.import_log_batch", fake_log_batch)
+    return batches
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def feed_all(importer, document, chunk_size=5):
+    for chunk in chunked(json.dumps(document).encode(), chunk_size):
+        importer.feed(chunk)
+    return importer.finish()
+
+
+class TestStreamingImport:
+    def test_loads_fixed_size_batches_across_chunk_boundaries(self, loaded):
+        document = {
+            "chores": [{"name": f"chore {n}", "interval_days": 1, "due_date": "2025-01-01"} for n in range(5)],
+            "logs": [{"chore_id": 1, "action_details": {"nested": [1, {"ratio": 0.5}]}} for _ in range(3)],
+        }
+
+        report = feed_all(StreamingImport(None, "user@example.com", batch_size=2), document, chunk_size=3)
+
+        assert [(dataset, len(rows)) for dataset, rows in loaded] == [
+            ("chores", 2), ("chores", 2), ("chores", 1), ("logs", 2), ("logs", 1),
+        ]
+        assert loaded[3][1][0]["action_details"] == {"nested": [1, {"ratio": 0.5}]}
+        assert report["imported_chores"] == 5
+        assert report["created_chores"] == 5
+        assert report["imported_logs"] == 3
+        assert [batch["batch"] for batch in report["batches"]] == [1, 2, 3, 4, 5]
+
+    def test_errors_are_reported_per_batch_with_document_index(self, loaded):
+        document = {
+            "chores": [
+                {"name": "ok", "interval_days": 1, "due_date": "2025-01-01"},
+                {"id": 4, "name": "existing", "interval_days": 1, "due_date": "2025-01-01"},
+                {"interval_days": 1},
+                "not an object",
+            ]
+        }
+
+        report = feed_all(StreamingImport(None, "user@example.com", batch_size=2), document)
+
+        first, second = report["batches"]
+        assert (first["created"], first["updated"], first["errors"]) == (1, 1, [])
+        assert second["first_index"] == 2
+        assert [error["index"] for error in second["errors"]] == [2, 3]
+        assert report["imported_chores"] == 2
+
+    def test_ignores_unknown_keys(self, loaded):
+        document = {"version": 2, "meta": {"chores": [{"name": "not imported"}]}, "chores": [{"name": "a"}]}
+
+        feed_all(StreamingImport(None, None, batch_size=10), document)
+
+        assert loaded == [("chores", [{"name": "a"}])]
+
+    def test_truncated_document_raises(self, loaded):
+        importer = StreamingImport(None, None)
+        importer.feed(b'{"chores": [{"name": "a"')
+
+        with pytest.raises(ijson.JSONError):
+            importer.finish()
+
+
+class StreamConnection:
+    def __init__(self):
+        self.committed = False
+        self.rolled_back = False
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def make_client(monkeypatch, conn):
+    monkeypatch.setattr("app.api.import_endpoint.get_db_connection", lambda: conn)
+    monkeypatch.setattr("app.api.import_endpoint.log_action", lambda *a, **k: None)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app)
+
+
+class TestStreamImportEndpoint:
+    def test_imports_chunked_upload_in_one_transaction(self, loaded, monkeypatch):
+        conn = StreamConnection()
+        client = make_client(monkeypatch, conn)
+        body = json.dumps({"chores": [{"name": "a"}, {"id": 7, "name": "b"}], "logs": [{"chore_id": 7}]}).encode()
+
+        response = client.post("/api/import/stream", content=iter(chunked(body, 4)))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["created_chores"], data["updated_chores"], data["imported_logs"]) == (1, 1, 1)
+        assert conn.committed is True
+        assert conn.closed is True
+
+    def test_malformed_json_returns_400_and_rolls_back(self, loaded, monkeypatch):
+        conn = StreamConnection()
+        client = make_client(monkeypatch, conn)
+
+        response = client.post("/api/import/stream", content=b'{"chores": [{"name": ')
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Invalid import file")
+        assert conn.rolled_back is True
+        assert conn.committed is False
+
+    def test_requires_chores(self, loaded, monkeypatch):
+        conn = StreamConnection()
+        client = make_client(monkeypatch, conn)
+
+        response = client.post("/api/import/stream", content=b'{"logs": []}')
+
+        assert response.status_code == 400
+        assert conn.committed is False
@@ -0,0 +1,147 @@
+"""
+Tests for the bulk COPY import pipeline.
+
+Validation tests run anywhere; the merge tests need PostgreSQL and shadow the
+chores/chore_logs tables with temporary ones so real data is never touched.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from app.importer import ImportRowError, import_chore_batch, import_log_batch, prepare_chore, prepare_log
+
+
+@pytest.fixture
+def import_cursor(real_db_connection):
+    cur = real_db_connection.cursor()
+    cur.execute(
+        """
+        CREATE TEMP TABLE chores (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            interval_days INT NOT NULL,
+            due_date DATE NOT NULL,
+            done BOOLEAN DEFAULT FALSE,
+            done_by VARCHAR(255),
+            archived BOOLEAN DEFAULT FALSE,
+            owner_email VARCHAR(255),
+            is_private BOOLEAN DEFAULT FALSE,
+            last_done DATE
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TEMP TABLE chore_logs (
+            id SERIAL PRIMARY KEY,
+            chore_id INT REFERENCES pg_temp.chores (id) ON DELETE CASCADE,
+            done_by VARCHAR(255),
+            done_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            action_type VARCHAR(50) NOT NULL,
+            action_details JSON DEFAULT NULL
+        )
+        """
+    )
+    cur.execute(
+        "INSERT INTO pg_temp.chores (name, interval_days, due_date, archived) VALUES ('Existing', 3, '2025-01-01', TRUE)"
+    )
+    yield cur
+    cur.close()
+
+
+class TestPrepareRows:
+    def test_private_chore_is_owned_by_importer(self):
+        row = prepare_chore(
+            {"id": "7", "name": "Dishes", "interval_days": "2", "due_date": "2025-05-01", "is_private": True},
+            "user@example.com",
+        )
+        assert row == (7, "Dishes", 2, date(2025, 5, 1), False, "user@example.com", True, None)
+
+    @pytest.mark.parametrize(
+        "chore",
+        [
+            {"interval_days": 1, "due_date": "2025-05-01"},
+            {"name": "x", "due_date": "2025-05-01"},
+            {"name": "x", "interval_days": 1},
+            {"name": "x", "interval_days": 1, "due_date": "tomorrow"},
+            "not an object",
+        ],
+    )
+    def test_invalid_chores_are_rejected(self, chore):
+        with pytest.raises(ImportRowError):
+            prepare_chore(chore, "user@example.com")
+
+    def test_log_defaults_match_legacy_import(self):
+        chore_id, done_by, done_at, action_type, details = prepare_log(
+            {"chore_id": 1, "done_at": "not a date", "details": "raw text"}, "user@example.com"
+        )
+        assert (chore_id, done_by, action_type, details) == (1, "user@example.com", "imported", '"raw text"')
+        assert isinstance(done_at, datetime)
+
+
+class TestBulkImport:
+    def test_merges_chores_and_reports_in_input_order(self, import_cursor):
+        errors = []
+        report = import_chore_batch(
+            import_cursor,
+            [
+                {"name": "Brand new", "interval_days": 1, "due_date": "2025-05-02", "last_done": "2025-04-01"},
+                {"id": 1, "name": "Renamed, \"quoted\"", "interval_days": 5, "due_date": "2025-05-01", "is_private": True},
+                {"name": "Missing interval", "due_date": "2025-05-02"},
+                {"id": 999, "name": "Unknown id", "interval_days": 2, "due_date": "2025-05-03"},
+            ],
+            "user@example.com",
+            errors,
+        )
+
+        assert [entry["status"] for entry in report] == ["created", "updated", "created"]
+        assert report[1]["id"] == 1
+        # Unknown ids get a fresh id from the sequence rather than keeping 999
+        assert report[2]["id"] not in (1, 999)
+        assert errors == [{"index": 2, "name": "Missing interval", "error": "interval_days must be an integer"}]
+
+        import_cursor.execute("SELECT name, interval_days, archived, owner_email, is_private FROM chores WHERE id = 1")
+        # archived is not touched on update, matching the previous import
+        assert import_cursor.fetchone() == ('Renamed, "quoted"', 5, True, "user@example.com", True)
+        import_cursor.execute("SELECT last_done FROM chores WHERE id = %s", (report[0]["id"],))
+        assert import_cursor.fetchone() == (date(2025, 4, 1),)
+
+    def test_duplicate_existing_id_keeps_last_row(self, import_cursor):
+        report = import_chore_batch(
+            import_cursor,
+            [
+                {"id": 1, "name": "First", "interval_days": 1, "due_date": "2025-05-01"},
+                {"id": 1, "name": "Second", "interval_days": 2, "due_date": "2025-05-01"},
+            ],
+            None,
+        )
+
+        assert report == [{"id": 1, "status": "updated"}, {"id": 1, "status": "updated"}]
+        import_cursor.execute("SELECT name FROM chores WHERE id = 1")
+        assert import_cursor.fetchone() == ("Second",)
+
+    def test_logs_for_unknown_chores_are_skipped(self, import_cursor):
+        inserted = import_log_batch(
+            import_cursor,
+            [
+                {"chore_id": 1, "done_by": "tester", "done_at": "2025-04-01T00:00:00", "action_type": "marked_done",
+                 "action_details": {"x": 1}},
+                {"chore_id": 424242, "action_type": "marked_done"},
+                {"chore_id": None, "action_type": "note"},
+            ],
+            "user@example.com",
+        )
+
+        assert inserted == 2
+        import_cursor.execute("SELECT chore_id, done_by, done_at, action_details FROM chore_logs ORDER BY id")
+        rows = import_cursor.fetchall()
+        assert rows[0] == (1, "tester", datetime(2025, 4, 1), {"x": 1})
+        assert rows[1][0] is None and rows[1][1] == "user@example.com"
+
+    def test_batches_can_repeat_in_one_transaction(self, import_cursor):
+        first = import_chore_batch(import_cursor, [{"name": "a", "interval_days": 1, "due_date": "2025-01-01"}], None)
+        second = import_chore_batch(import_cursor, [{"name": "b", "interval_days": 1, "due_date": "2025-01-01"}], None)
+
+        assert len(first) == len(second) == 1
+        assert first[0]["id"] != second[0]["id"]
@@ -1,4 +1,6 @@
 ﻿import os
+from contextlib import asynccontextmanager
+
 import psycopg2
 from fastapi.testclient import TestClient
 from app.main import app
@@ -43,20 +45,21 @@ def test_migrations():
 
 def test_auth_flow(monkeypatch):
     # Simulate a user with a valid token and username
-    def fake_get_db_connection():
+    @asynccontextmanager
+    async def fake_async_db_connection():
         class DummyCursor:
-            def execute(self, *a, **k): pass
-            def fetchall(self):
+            async def execute(self, *a, **k): pass
+            async def fetchall(self):
                 return [
                     [1, "Shared Chore", 7, "2025-04-28", False, None, False, None, False, None],
                     [2, "Private Chore", 3, "2025-04-28", False, None, False, "user@example.com", True, None]
                 ]
-            def close(self): pass
+            async def __aenter__(self): return self
+            async def __aexit__(self, *exc_info): return False
         class DummyConn:
             def cursor(self): return DummyCursor()
-            def close(self): pass
-        return DummyConn()
-    monkeypatch.setattr("app.api.routes.get_db_connection", fake_get_db_connection)
+        yield DummyConn()
+    monkeypatch.setattr("app.api.routes.async_db_connection", fake_async_db_connection)
     client = TestClient(app)
     # Simulate auth by passing X-User-Email header
     response = client.get("/api/chores", headers={"X-User-Email": "user@example.com", "Authorization": "Bearer testtoken"})
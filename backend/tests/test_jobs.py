@@ -0,0 +1,407 @@
+"""
+Tests for background import/export jobs.
+
+Store and worker tests use the in-memory backend and fake handlers. The
+Postgres store tests need PostgreSQL and run in a scratch schema created by
+the migrations.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import psycopg2
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import jobs
+from app.api.jobs_endpoint import router
+from app.jobs import InMemoryJobStore, JobWorkerPool, PostgresJobStore, job_status
+from app.migrations import migrate
+
+
+def wait_for(store, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish: {store.get(job_id)}")
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestInMemoryJobStore:
+    def test_claims_oldest_queued_job_once(self):
+        store = InMemoryJobStore()
+        first = store.create("export", "a@example.com", {})
+        store.create("export", "a@example.com", {})
+
+        claimed = store.claim()
+
+        assert claimed["id"] == first["id"]
+        assert claimed["status"] == "running"
+        assert claimed["attempts"] == 1
+        assert store.claim()["id"] != first["id"]
+        assert store.claim() is None
+
+    def test_writes_need_the_current_claim(self):
+        store = InMemoryJobStore()
+        job = store.create("export", None, {})
+        claimed = store.claim()
+        stale = dict(claimed, attempts=claimed["attempts"] - 1)
+
+        assert store.heartbeat(stale) is False
+        assert store.complete(stale, {"rows": 1}) is False
+        assert store.get(job["id"])["status"] == "running"
+        assert store.complete(claimed, {"rows": 2}) is True
+        # Finished jobs are no longer claimed by anyone
+        assert store.fail(claimed, "late") is False
+        assert store.get(job["id"])["result"] == {"rows": 2}
+
+    def test_finished_jobs_are_pruned(self, tmp_path):
+        store = InMemoryJobStore(retention_seconds=3600, max_finished=1)
+        result = tmp_path / "old.ndjson"
+        result.write_bytes(b"{}")
+        old = store.create("export", None, {})
+        store.complete(store.claim(), {}, str(result))
+        newer = store.create("export", None, {})
+        store.complete(store.claim(), {})
+        expired = store.create("export", None, {})
+        store._jobs[expired["id"]].update(status="failed", finished_at=datetime.utcnow() - timedelta(hours=2))
+
+        queued = store.create("import", None, {})
+
+        assert store.get(old["id"]) is None
+        assert not result.exists()
+        assert store.get(expired["id"]) is None
+        assert store.get(newer["id"]) is not None
+        assert store.get(queued["id"])["status"] == "queued"
+
+
+class TestJobWorkerPool:
+    def test_runs_jobs_and_records_progress_and_result(self):
+        store = InMemoryJobStore()
+
+        def handler(job, reporter):
+            reporter.update(rows=10)
+            reporter.update(force=True, rows=20)
+            return {"rows": 20}, "/tmp/result"
+
+        pool = JobWorkerPool(store, workers=2, poll_interval=0.01, handlers={"export": handler})
+        job = store.create("export", "a@example.com", {})
+        pool.start()
+        try:
+            finished = wait_for(store, job["id"])
+        finally:
+            pool.stop(timeout=5)
+
+        assert finished["status"] == "succeeded"
+        assert finished["progress"] == {"rows": 20}
+        assert (finished["result"], finished["result_path"]) == ({"rows": 20}, "/tmp/result")
+
+    def test_handler_errors_fail_the_job(self):
+        store = InMemoryJobStore()
+
+        def handler(job, reporter):
+            raise ValueError("boom")
+
+        pool = JobWorkerPool(store, handlers={"import": handler})
+        job = store.create("import", None, {})
+        pool.run_job(store.claim())
+
+        failed = store.get(job["id"])
+        assert (failed["status"], failed["error"]) == ("failed", "boom")
+
+    def test_gives_up_after_max_attempts(self):
+        store = InMemoryJobStore()
+        pool = JobWorkerPool(store, handlers={"import": lambda job, reporter: ({}, None)}, max_attempts=1)
+        job = store.create("import", None, {})
+        store._jobs[job["id"]]["attempts"] = 1
+        claimed = store.claim()
+
+        pool.run_job(claimed)
+
+        assert store.get(job["id"])["status"] == "failed"
+
+    def test_heartbeat_keeps_the_lease_without_progress(self):
+        store = InMemoryJobStore()
+        beats = []
+        heartbeat = store.heartbeat
+        store.heartbeat = lambda job: beats.append(job["id"]) or heartbeat(job)
+
+        def slow_handler(job, reporter):
+            time.sleep(0.2)
+            return {}, None
+
+        pool = JobWorkerPool(store, handlers={"import": slow_handler}, heartbeat_interval=0.02)
+        job = store.create("import", None, {})
+        pool.run_job(store.claim())
+
+        assert len(beats) >= 3
+        assert store.get(job["id"])["status"] == "succeeded"
+
+    def test_upload_is_kept_for_the_new_claimant_when_the_claim_is_lost(self, tmp_path):
+        store = InMemoryJobStore()
+        upload = tmp_path / "upload.json"
+        upload.write_bytes(b"{}")
+
+        def handler(job, reporter):
+            store._jobs[job["id"]]["attempts"] += 1
+            raise RuntimeError("lease lapsed mid-import")
+
+        pool = JobWorkerPool(store, handlers={"import": handler})
+        store.create("import", None, {"path": str(upload)})
+        pool.run_job(store.claim())
+
+        assert upload.exists()
+
+    def test_giving_up_removes_the_upload(self, tmp_path):
+        store = InMemoryJobStore()
+        upload = tmp_path / "upload.json"
+        upload.write_bytes(b"{}")
+        pool = JobWorkerPool(store, handlers={"import": lambda job, reporter: ({}, None)}, max_attempts=1)
+        job = store.create("import", None, {"path": str(upload)})
+        store._jobs[job["id"]]["attempts"] = 1
+
+        pool.run_job(store.claim())
+
+        assert store.get(job["id"])["status"] == "failed"
+        assert not upload.exists()
+
+    def test_result_of_a_lost_claim_is_discarded(self, tmp_path):
+        store = InMemoryJobStore()
+        result = tmp_path / "stale.ndjson"
+
+        def handler(job, reporter):
+            # Another worker claims the job while this one is still running
+            store._jobs[job["id"]]["attempts"] += 1
+            result.write_bytes(b"{}")
+            return {"rows": 1}, str(result)
+
+        pool = JobWorkerPool(store, handlers={"export": handler})
+        job = store.create("export", None, {})
+        pool.run_job(store.claim())
+
+        assert store.get(job["id"])["status"] == "running"
+        assert not result.exists()
+
+
+def test_job_status_reports_throughput_and_result_url():
+    started = datetime(2025, 1, 1, 12, 0, 0)
+    job = jobs._new_job("export", "a@example.com", {})
+    job.update(
+        status="succeeded", started_at=started, finished_at=started + timedelta(seconds=4),
+        progress={"rows": 1000}, result_path="/tmp/x",
+    )
+
+    status = job_status(job)
+
+    assert status["rows_per_second"] == 250.0
+    assert status["elapsed_seconds"] == 4.0
+    assert status["result_url"] == f"/api/jobs/{job['id']}/result"
+    assert status["started_at"] == "2025-01-01T12:00:00"
+    assert "user_email" not in status
+
+
+class JobConnection:
+    def __init__(self):
+        self.committed = False
+
+    def cursor(self, name=None):
+        return self
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def job_client(monkeypatch, tmp_path):
+    """API client whose jobs run on an in-memory store with files under tmp_path."""
+    store = InMemoryJobStore()
+    pool = JobWorkerPool(store, workers=1, poll_interval=0.01)
+    conn = JobConnection()
+    monkeypatch.setattr(jobs, "JOBS_DIR", str(tmp_path))
+    monkeypatch.setattr("app.api.jobs_endpoint.JOBS_DIR", str(tmp_path))
+    monkeypatch.setattr(jobs, "_store", store)
+    monkeypatch.setattr(jobs, "_pool", pool)
+    monkeypatch.setattr(jobs, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(jobs, "log_action", lambda *a, **k: None)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    pool.start()
+    yield TestClient(app), store, conn
+    pool.stop(timeout=5)
+
+
+class TestJobEndpoints:
+    def test_import_job_runs_in_background(self, job_client, monkeypatch, tmp_path):
+        client, store, conn = job_client
+        monkeypatch.setattr(
+            "app.importer.import_chore_batch",
+            lambda cur, chores, user_email, errors=None: [{"id": n, "status": "created"} for n in range(len(chores))],
+        )
+        monkeypatch.setattr("app.importer.import_log_batch", lambda cur, logs, user_email, errors=None: len(logs))
+        body = json.dumps({"chores": [{"name": "a"}, {"name": "b"}], "logs": [{"chore_id": 1}]}).encode()
+
+        response = client.post("/api/import/jobs", content=body, headers={"X-User-Email": "a@example.com"})
+
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        wait_for(store, job_id)
+        status = client.get(f"/api/jobs/{job_id}", headers={"X-User-Email": "a@example.com"}).json()
+        assert status["status"] == "succeeded"
+        assert (status["result"]["created_chores"], status["result"]["imported_logs"]) == (2, 1)
+        assert status["progress"]["rows"] == 3
+        assert status["progress"]["bytes"] == status["progress"]["total_bytes"] == len(body)
+        assert conn.committed is True
+        # The spooled upload is removed once the job has finished
+        assert wait_until(lambda: os.listdir(tmp_path) == [])
+
+    def test_failed_import_reports_error(self, job_client, tmp_path):
+        client, store, conn = job_client
+
+        response = client.post("/api/import/jobs", content=b'{"logs": []}')
+
+        job = wait_for(store, response.json()["id"])
+        assert job["status"] == "failed"
+        assert "No chores data" in job["error"]
+        assert conn.committed is False
+        # The spooled upload is removed even though the import failed
+        assert wait_until(lambda: [name for name in os.listdir(tmp_path) if name.startswith("upload-")] == [])
+
+    def test_export_job_result_download(self, job_client, monkeypatch):
+        client, store, _ = job_client
+
+        def fake_export_stream(conn, user_email, dataset, fmt, compress, on_batch=None):
+            on_batch(2)
+            yield b'{"type": "chore", "id": 1}\n'
+            yield b'{"type": "chore", "id": 2}\n'
+
+        monkeypatch.setattr("app.api.export_endpoint.export_stream", fake_export_stream)
+        headers = {"X-User-Email": "a@example.com"}
+
+        job_id = client.post("/api/export/jobs?dataset=chores", headers=headers).json()["id"]
+        wait_for(store, job_id)
+
+        status = client.get(f"/api/jobs/{job_id}", headers=headers).json()
+        assert status["progress"]["rows"] == 2
+        download = client.get(status["result_url"], headers=headers)
+        assert download.status_code == 200
+        assert download.content.count(b"\n") == 2
+        assert 'filename="choremane-chores.ndjson"' in download.headers["content-disposition"]
+
+    def test_jobs_are_private_to_their_owner(self, job_client):
+        client, store, _ = job_client
+        job = store.create("export", "a@example.com", {"format": "ndjson", "dataset": "all"})
+
+        response = client.get(f"/api/jobs/{job['id']}", headers={"X-User-Email": "b@example.com"})
+
+        assert response.status_code == 404
+
+    def test_result_before_completion_is_conflict(self, job_client):
+        client, store, _ = job_client
+        job = store.create("export", None, {"format": "ndjson", "dataset": "all"})
+        store.claim()
+
+        assert client.get(f"/api/jobs/{job['id']}/result").status_code == 409
+
+    def test_csv_export_job_needs_single_dataset(self, job_client):
+        client, _, _ = job_client
+
+        assert client.post("/api/export/jobs?format=csv").status_code == 400
+
+
+@pytest.fixture
+def pg_job_store(real_db_connection):
+    cur = real_db_connection.cursor()
+    cur.execute("DROP SCHEMA IF EXISTS test_jobs CASCADE; CREATE SCHEMA test_jobs")
+    real_db_connection.commit()
+    params = real_db_connection.get_dsn_parameters()
+
+    def connect():
+        return psycopg2.connect(
+            host=params["host"], dbname=params["dbname"], user=params["user"],
+            password=os.getenv("POSTGRES_PASSWORD", "password"), options="-c search_path=test_jobs",
+        )
+
+    conn = connect()
+    migrate(conn)
+    conn.close()
+    store = PostgresJobStore(connect=connect, lease_seconds=60)
+    yield store
+    cur.execute("DROP SCHEMA IF EXISTS test_jobs CASCADE")
+    real_db_connection.commit()
+    cur.close()
+
+
+class TestPostgresJobStore:
+    def test_lifecycle_round_trips_json_fields(self, pg_job_store):
+        job = pg_job_store.create("export", "a@example.com", {"dataset": "logs"})
+
+        claimed = pg_job_store.claim()
+        assert pg_job_store.update_progress(claimed, {"rows": 5})
+        assert pg_job_store.complete(claimed, {"rows": 5}, "/tmp/out")
+
+        assert claimed["params"] == {"dataset": "logs"}
+        stored = pg_job_store.get(job["id"])
+        assert (stored["status"], stored["progress"], stored["result"]) == ("succeeded", {"rows": 5}, {"rows": 5})
+        assert pg_job_store.claim() is None
+
+    def test_running_jobs_are_not_claimed_until_their_lease_expires(self, pg_job_store):
+        job = pg_job_store.create("import", None, {})
+        assert pg_job_store.claim()["id"] == job["id"]
+        assert pg_job_store.claim() is None
+
+        # A worker that died mid-job stops heartbeating
+        pg_job_store._execute(
+            "UPDATE jobs SET heartbeat_at = %s WHERE id = %s", (datetime.utcnow() - timedelta(minutes=5), job["id"])
+        )
+
+        reclaimed = pg_job_store.claim()
+        assert (reclaimed["id"], reclaimed["attempts"]) == (job["id"], 2)
+
+    def test_stale_worker_cannot_overwrite_the_new_claim(self, pg_job_store):
+        pg_job_store.create("import", None, {})
+        stale = pg_job_store.claim()
+        pg_job_store._execute(
+            "UPDATE jobs SET heartbeat_at = %s WHERE id = %s", (datetime.utcnow() - timedelta(minutes=5), stale["id"])
+        )
+        current = pg_job_store.claim()
+
+        assert pg_job_store.heartbeat(stale) is False
+        assert pg_job_store.fail(stale, "timed out") is False
+        assert pg_job_store.heartbeat(current) is True
+        assert pg_job_store.complete(current, {"rows": 1}) is True
+        stored = pg_job_store.get(stale["id"])
+        assert (stored["status"], stored["error"], stored["result"]) == ("succeeded", None, {"rows": 1})
+
+    def test_concurrent_claims_skip_locked_rows(self, pg_job_store):
+        first = pg_job_store.create("import", None, {})
+        second = pg_job_store.create("import", None, {})
+        conn = pg_job_store._connect()
+        cur = conn.cursor()
+        # Hold a row lock on the oldest job as another worker's claim would
+        cur.execute("SELECT id FROM jobs WHERE id = %s FOR UPDATE", (first["id"],))
+
+        try:
+            assert pg_job_store.claim()["id"] == second["id"]
+        finally:
+            conn.rollback()
+            conn.close()
@@ -0,0 +1,71 @@
+"""
+Concurrency test for marking a chore done.
+
+Needs PostgreSQL; runs the handler against a scratch schema so real data is
+never touched.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import routes
+
+
+def test_parallel_completions_mark_done_exactly_once(scratch_db, monkeypatch):
+    today = date.today()
+    previous_due, previous_last_done = today - timedelta(days=1), today - timedelta(days=3)
+    conn = scratch_db()
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO chores (name, interval_days, due_date, last_done) VALUES ('Dishes', 3, %s, %s) RETURNING id",
+            (previous_due, previous_last_done),
+        )
+        chore_id = cur.fetchone()[0]
+    conn.commit()
+
+    logged = []
+    monkeypatch.setattr(routes, "get_db_connection", scratch_db)
+    monkeypatch.setattr(routes, "log_action", lambda *a, **k: logged.append(k["action_details"]))
+
+    workers = 8
+    barrier = threading.Barrier(workers)
+
+    def complete(n):
+        barrier.wait()
+        try:
+            return routes.mark_chore_done(chore_id, {"done_by": f"user{n}"})
+        except HTTPException as e:
+            return e.status_code
+
+    with ThreadPoolExecutor(workers) as pool:
+        results = list(pool.map(complete, range(workers)))
+
+    successes = [result for result in results if isinstance(result, dict)]
+    assert len(successes) == 1
+    assert results.count(409) == workers - 1
+    # The undo log captured the state from before the single completion
+    assert logged == [
+        {
+            "chore_id": chore_id,
+            "new_due_date": (today + timedelta(days=3)).isoformat(),
+            "previous_due_date": previous_due.isoformat(),
+            "previous_last_done": previous_last_done.isoformat(),
+        }
+    ]
+    with conn.cursor() as cur:
+        cur.execute("SELECT done, done_by, due_date, last_done FROM chores WHERE id = %s", (chore_id,))
+        assert cur.fetchone() == (True, successes[0]["done_by"], today + timedelta(days=3), today)
+    conn.close()
+
+
+def test_missing_chore_is_404(scratch_db, monkeypatch):
+    monkeypatch.setattr(routes, "get_db_connection", scratch_db)
+
+    with pytest.raises(HTTPException) as excinfo:
+        routes.mark_chore_done(424242, {"done_by": "tester"})
+
+    assert excinfo.value.status_code == 404
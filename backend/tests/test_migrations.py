@@ -0,0 +1,227 @@
+"""
+Tests for the versioned migration runner.
+
+Discovery tests run anywhere; the others need PostgreSQL and migrate a
+scratch schema.
+"""
+
+import os
+import threading
+
+import psycopg2
+import pytest
+
+from app.migrations import (
+    MigrationError,
+    check_schema_version,
+    current_version,
+    discover_migrations,
+    latest_version,
+    migrate,
+    pending_migrations,
+)
+
+SCHEMA = "test_migrations"
+
+
+def write_migrations(directory, files):
+    for filename, sql in files.items():
+        (directory / filename).write_text(sql)
+    return str(directory)
+
+
+@pytest.fixture
+def schema_connect(real_db_connection):
+    """Connection factory for an empty scratch schema."""
+    cur = real_db_connection.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+    real_db_connection.commit()
+    params = real_db_connection.get_dsn_parameters()
+
+    def connect():
+        return psycopg2.connect(
+            host=params["host"], dbname=params["dbname"], user=params["user"],
+            password=os.getenv("POSTGRES_PASSWORD", "password"), options=f"-c search_path={SCHEMA}",
+        )
+
+    yield connect
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    real_db_connection.commit()
+    cur.close()
+
+
+def table_names(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT tablename FROM pg_tables WHERE schemaname = %s ORDER BY tablename", (SCHEMA,))
+        names = [row[0] for row in cur.fetchall()]
+    conn.rollback()
+    return names
+
+
+class TestDiscovery:
+    def test_orders_by_version_and_ignores_other_files(self, tmp_path):
+        directory = write_migrations(
+            tmp_path, {"0010_later.sql": "", "0002_first.sql": "", "README.md": "", "3_bad_name.sql": ""}
+        )
+
+        assert [(m.version, m.name) for m in discover_migrations(directory)] == [(2, "first"), (10, "later")]
+        assert latest_version(directory) == 10
+
+    def test_rejects_duplicate_versions(self, tmp_path):
+        directory = write_migrations(tmp_path, {"0001_a.sql": "", "0001_b.sql": ""})
+
+        with pytest.raises(MigrationError):
+            discover_migrations(directory)
+
+    def test_bundled_migrations_start_at_one(self):
+        assert discover_migrations()[0].version == 1
+
+
+def index_validity(conn, name):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+            " WHERE c.relname = %s AND c.relnamespace = %s::regnamespace",
+            (name, SCHEMA),
+        )
+        row = cur.fetchone()
+    conn.rollback()
+    return row[0] if row else None
+
+
+class TestMigrate:
+    def test_applies_bundled_migrations_once(self, schema_connect):
+        conn = schema_connect()
+
+        applied = migrate(conn)
+
+        assert [m.version for m in applied] == [m.version for m in discover_migrations()]
+        assert current_version(conn) == latest_version()
+        assert {"chores", "chore_logs", "users", "jobs", "schema_migrations"} <= set(table_names(conn))
+        assert migrate(conn) == []
+        conn.close()
+
+    def test_baseline_applies_over_schema_from_startup_migrations(self, scratch_db):
+        # scratch_db already has chores and chore_logs but no schema_migrations,
+        # like a database set up by the old import-time run_migrations()
+        conn = scratch_db()
+
+        migrate(conn)
+
+        assert pending_migrations(conn) == []
+        conn.close()
+
+    def test_failed_migration_is_rolled_back_and_stops_the_run(self, schema_connect, tmp_path):
+        directory = write_migrations(
+            tmp_path,
+            {
+                "0001_ok.sql": "CREATE TABLE a (id INT);",
+                "0002_broken.sql": "CREATE TABLE b (id INT); SELECT * FROM missing_table;",
+                "0003_after.sql": "CREATE TABLE c (id INT);",
+            },
+        )
+        conn = schema_connect()
+
+        with pytest.raises(MigrationError, match="0002_broken"):
+            migrate(conn, directory)
+
+        assert current_version(conn) == 1
+        assert [m.version for m in pending_migrations(conn, directory)] == [2, 3]
+        assert "b" not in table_names(conn)
+        conn.close()
+
+    def test_no_transaction_migrations_can_create_indexes_concurrently(self, schema_connect, tmp_path):
+        directory = write_migrations(
+            tmp_path,
+            {
+                "0001_table.sql": "CREATE TABLE a (id INT);",
+                "0002_index.sql": "-- migrate: no-transaction\nCREATE INDEX CONCURRENTLY idx_a_id ON a (id);",
+            },
+        )
+        conn = schema_connect()
+
+        assert len(migrate(conn, directory)) == 2
+        assert current_version(conn) == 2
+        conn.close()
+
+    def test_invalid_index_from_a_failed_concurrent_build_is_rebuilt(self, schema_connect, tmp_path):
+        index = "-- migrate: no-transaction\nCREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_a_id ON a (id);"
+        directory = write_migrations(
+            tmp_path, {"0001_table.sql": "CREATE TABLE a (id INT); INSERT INTO a VALUES (1), (1);", "0002_index.sql": index}
+        )
+        conn = schema_connect()
+
+        # The duplicate makes the build fail, leaving an INVALID idx_a_id behind
+        with pytest.raises(MigrationError, match="0002_index"):
+            migrate(conn, directory)
+        assert index_validity(conn, "idx_a_id") is False
+        assert current_version(conn) == 1
+
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM a WHERE ctid = (SELECT max(ctid) FROM a)")
+        conn.commit()
+        assert [m.version for m in migrate(conn, directory)] == [2]
+        assert index_validity(conn, "idx_a_id") is True
+        conn.close()
+
+    @pytest.mark.parametrize(
+        "version, index", [(7, "idx_chores_change_seq"), (8, "idx_chore_logs_change_seq")]
+    )
+    def test_bundled_change_seq_index_is_rebuilt_when_left_invalid(self, schema_connect, version, index):
+        conn = schema_connect()
+        migrate(conn)
+        # What a failed CREATE INDEX CONCURRENTLY leaves: an INVALID index and no record
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE pg_index SET indisvalid = FALSE WHERE indexrelid = %s::regclass",
+                (f"{SCHEMA}.{index}",),
+            )
+            cur.execute("DELETE FROM schema_migrations WHERE version = %s", (version,))
+        conn.commit()
+        assert index_validity(conn, index) is False
+
+        assert [m.version for m in migrate(conn)] == [version]
+        assert index_validity(conn, index) is True
+        conn.close()
+
+    def test_concurrent_runners_apply_each_migration_once(self, schema_connect, tmp_path):
+        # Not idempotent: a second application would fail on the existing table
+        directory = write_migrations(
+            tmp_path, {"0001_a.sql": "CREATE TABLE a (id INT); SELECT pg_sleep(0.2);", "0002_b.sql": "CREATE TABLE b (id INT);"}
+        )
+        barrier = threading.Barrier(3)
+        applied, errors = [], []
+
+        def run():
+            conn = schema_connect()
+            try:
+                barrier.wait()
+                applied.extend(migration.version for migration in migrate(conn, directory))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert sorted(applied) == [1, 2]
+
+
+class TestCheckSchemaVersion:
+    def test_reports_current_and_expected(self, schema_connect, tmp_path):
+        directory = write_migrations(tmp_path, {"0001_a.sql": "CREATE TABLE a (id INT);", "0002_b.sql": "SELECT 1;"})
+
+        assert check_schema_version(schema_connect, directory) == (0, 2)
+        migrate(schema_connect(), directory)
+        assert check_schema_version(schema_connect, directory) == (2, 2)
+
+    def test_unreachable_database_does_not_raise(self):
+        def unreachable():
+            raise psycopg2.OperationalError("connection refused")
+
+        assert check_schema_version(unreachable) is None
@@ -0,0 +1,154 @@
+"""
+Query plan regression tests for the hot read paths.
+
+Migrates a scratch schema, seeds a 1M-row chores table (plus logs) shaped
+like a long-lived household: most chores archived, a tenth private across
+many owners. Each hot query must then be answered from indexes, never with a
+sequential scan of chores or chore_logs. Needs PostgreSQL.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import psycopg2
+import pytest
+
+from app.api.chore_counts_endpoint import CHORE_BUCKET_COUNTS_SQL, chore_bucket_params
+from app.api.household_health_endpoint import HOUSEHOLD_HEALTH_SQL
+from app.api.routes import DASHBOARD_SQL, _chore_page_query, _encode_cursor, _log_page_query
+from app.migrations import migrate
+
+SCHEMA = "test_query_plans"
+SEED_CHORES = 1_000_000
+SEED_LOGS = 200_000
+USER_EMAIL = "user9@example.com"
+
+
+def _connect(**options):
+    return psycopg2.connect(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        database=os.getenv("POSTGRES_DB", "choresdb"),
+        user=os.getenv("POSTGRES_USER", "admin"),
+        password=os.getenv("POSTGRES_PASSWORD", "password"),
+        connect_timeout=2,
+        **options,
+    )
+
+
+@pytest.fixture(scope="module")
+def seeded_cursor():
+    try:
+        admin = _connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    if not isinstance(admin, psycopg2.extensions.connection):
+        pytest.skip("PostgreSQL not available")
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+
+    conn = _connect(options=f"-c search_path={SCHEMA}")
+    migrate(conn)
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO chores (name, interval_days, due_date, archived, is_private, owner_email)
+        SELECT 'chore ' || n, 1 + n %% 60, CURRENT_DATE + (n %% 730 - 365), n %% 10 < 7, n %% 10 = 9,
+               CASE WHEN n %% 10 = 9 THEN 'user' || (n %% 1000) || '@example.com' END
+        FROM generate_series(1, %s) AS n
+        """,
+        (SEED_CHORES,),
+    )
+    cur.execute(
+        """
+        INSERT INTO chore_logs (chore_id, done_by, done_at, action_type, action_details)
+        SELECT 1 + (n::bigint * 7919) %% %s, 'user' || (n %% 50), now() - n * interval '1 minute',
+               (ARRAY['marked_done', 'created', 'updated', 'archived', 'unarchived'])[1 + n %% 5], '{}'
+        FROM generate_series(1, %s) AS n
+        """,
+        (SEED_CHORES, SEED_LOGS),
+    )
+    conn.commit()
+    conn.autocommit = True
+    # Rebuild the indexes filled row by row above, as a migration would build
+    # them on an existing table, then leave fresh statistics and a set
+    # visibility map as autovacuum would
+    cur.execute("REINDEX TABLE chores")
+    cur.execute("REINDEX TABLE chore_logs")
+    cur.execute("VACUUM ANALYZE chores, chore_logs, chore_due_counts")
+    conn.autocommit = False
+    yield cur
+    cur.close()
+    conn.close()
+    with admin.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    admin.close()
+
+
+def plan_nodes(cur, query, params):
+    cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    pending = [plan[0]["Plan"]]
+    while pending:
+        node = pending.pop()
+        yield node
+        pending.extend(node.get("Plans", []))
+
+
+def _hot_queries():
+    now = datetime.now()
+    return {
+        "chore page": _chore_page_query(False, USER_EMAIL, 1, 10, None),
+        "chore page after cursor": _chore_page_query(False, USER_EMAIL, 1, 10, _encode_cursor(now.date(), 5000)),
+        "archived chore page": _chore_page_query(True, USER_EMAIL, 1, 10, None),
+        "bucket counts": (CHORE_BUCKET_COUNTS_SQL, chore_bucket_params(USER_EMAIL)),
+        "household health": (HOUSEHOLD_HEALTH_SQL, {"user_email": USER_EMAIL, "now": now}),
+        "dashboard": (DASHBOARD_SQL, {**chore_bucket_params(USER_EMAIL), "now": now, "limit": 11}),
+        "logs": _log_page_query(USER_EMAIL, None, 50, None, None, None, None, None),
+        "logs by chore": _log_page_query(USER_EMAIL, None, 50, 12345, None, None, None, None),
+        "logs by action": _log_page_query(USER_EMAIL, None, 50, None, "archived", None, None, None),
+        "logs by actor": _log_page_query(USER_EMAIL, None, 50, None, None, "user7", None, None),
+    }
+
+
+@pytest.mark.parametrize("name", list(_hot_queries()))
+def test_hot_query_does_not_scan_tables_sequentially(seeded_cursor, name):
+    query, params = _hot_queries()[name]
+
+    seq_scans = [
+        node["Relation Name"]
+        for node in plan_nodes(seeded_cursor, query, params)
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in ("chores", "chore_logs")
+    ]
+
+    assert seq_scans == [], f"{name} scans {seq_scans} sequentially"
+
+
+def test_aggregates_are_index_only(seeded_cursor):
+    query, params = _hot_queries()["household health"]
+
+    scans = [
+        (node["Node Type"], node.get("Index Name"))
+        for node in plan_nodes(seeded_cursor, query, params)
+        if node.get("Relation Name") == "chores"
+    ]
+
+    assert scans == [("Index Only Scan", "idx_chores_active_due_date_id")]
+
+
+def test_bucket_counts_read_only_the_summary_table(seeded_cursor):
+    query, params = _hot_queries()["bucket counts"]
+
+    relations = {node["Relation Name"] for node in plan_nodes(seeded_cursor, query, params) if "Relation Name" in node}
+    index_scans = [
+        node.get("Index Name")
+        for node in plan_nodes(seeded_cursor, query, params)
+        if node["Node Type"] in ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+    ]
+
+    assert relations == {"chore_due_counts"}
+    # One scan for the shared scope and one for the caller's
+    assert index_scans == ["idx_chore_due_counts_scope_due_date"] * 2
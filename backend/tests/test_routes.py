@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from contextlib import asynccontextmanager
 from datetime import datetime, date, timedelta
 import json
-from app.api.routes import api_router
+import pytest
+from app.api.routes import MAX_PAGE_SIZE, api_router
 
 app = FastAPI()
 app.include_router(api_router)
@@ -47,16 +49,41 @@ class DummyConnection:
         pass
 
 
+class DummyAsyncCursor(DummyCursor):
+    async def execute(self, query, params=None):
+        DummyCursor.execute(self, query, params)
+
+    async def fetchone(self):
+        return DummyCursor.fetchone(self)
+
+    async def fetchall(self):
+        return DummyCursor.fetchall(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def dummy_async_db_connection(cursor):
+    @asynccontextmanager
+    async def _async_db_connection():
+        yield DummyConnection(cursor)
+
+    return _async_db_connection
+
+
 def dummy_get_db_connection_for_status():
     cursor = DummyCursor(rows=[[1]])
     return DummyConnection(cursor)
 
 
-def dummy_get_db_connection_for_logs():
+def dummy_async_db_connection_for_logs():
     # simulate one log entry: id, chore_id, done_by, done_at, action_details
     log_date = datetime.now()
     row = [1, 101, "tester", log_date, json.dumps({"action": "test log"})]
-    cursor = DummyCursor(
+    cursor = DummyAsyncCursor(
         rows=[row],
         description=[
             ("id",),
@@ -66,10 +93,10 @@ def dummy_get_db_connection_for_logs():
             ("action_details",),
         ],
     )
-    return DummyConnection(cursor)
+    return dummy_async_db_connection(cursor)
 
 
-def dummy_get_db_connection_for_chores():
+def dummy_async_db_connection_for_chores():
     # simulate two chore rows
     rows = [
         [1, "Test Chore", 7, date.today(), False, None, False, None, False, None],
@@ -86,7 +113,7 @@ def dummy_get_db_connection_for_chores():
             None,
         ],
     ]
-    cursor = DummyCursor(
+    cursor = DummyAsyncCursor(
         rows=rows,
         description=[
             ("id",),
@@ -101,7 +128,7 @@ def dummy_get_db_connection_for_chores():
             ("last_done",),
         ],
     )
-    return DummyConnection(cursor)
+    return dummy_async_db_connection(cursor)
 
 
 def dummy_get_db_connection_for_insert(chore_id=123):
@@ -139,9 +166,18 @@ def test_status_check(monkeypatch):
     assert "database is reachable" in data["message"]
 
 
+def test_metrics_reports_pool_stats(monkeypatch):
+    monkeypatch.setattr(
+        "app.api.routes.get_pool_stats", lambda: {"in_use": 1, "waiting": 0}
+    )
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.json()["db_pool"] == {"in_use": 1, "waiting": 0}
+
+
 def test_get_logs(monkeypatch):
     monkeypatch.setattr(
-        "app.api.routes.get_db_connection", dummy_get_db_connection_for_logs
+        "app.api.routes.async_db_connection", dummy_async_db_connection_for_logs()
     )
     response = client.get("/api/logs")
     assert response.status_code == 200
@@ -152,9 +188,72 @@ def test_get_logs(monkeypatch):
         assert log["id"] == 1
 
 
+def test_get_logs_cursor_pagination(monkeypatch):
+    now = datetime.now()
+    rows = [
+        [3, 101, "tester", now, None, "marked_done"],
+        [2, 101, "tester", now - timedelta(minutes=1), None, "updated"],
+    ]
+    cursor = DummyAsyncCursor(rows=rows)
+    monkeypatch.setattr("app.api.routes.async_db_connection", dummy_async_db_connection(cursor))
+    response = client.get("/api/logs?cursor=&limit=1")
+    assert response.status_code == 200
+    data = response.json()
+    assert [log["id"] for log in data["items"]] == [3]
+    assert data["next_cursor"] == response.headers["X-Next-Cursor"]
+    # limit + 1 rows are requested to detect the next page
+    assert cursor.params[-1] == 2
+
+    response = client.get(f"/api/logs?cursor={data['next_cursor']}&limit=1")
+    assert response.status_code == 200
+    assert "(l.done_at, l.id) < (%s, %s)" in cursor.query
+    assert cursor.params[-3:-1] == (now, 3)
+
+
+def test_get_logs_filters(monkeypatch):
+    cursor = DummyAsyncCursor(rows=[])
+    monkeypatch.setattr("app.api.routes.async_db_connection", dummy_async_db_connection(cursor))
+    response = client.get(
+        "/api/logs",
+        params={
+            "cursor": "",
+            "chore_id": 101,
+            "action_type": "marked_done",
+            "done_by": "tester",
+            "since": "2025-01-01T00:00:00",
+            "until": "2025-02-01T00:00:00",
+        },
+        headers={"X-User-Email": "user@example.com"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+    for clause in ("l.chore_id = %s", "l.action_type = %s", "l.done_by = %s", "l.done_at >= %s", "l.done_at < %s"):
+        assert clause in cursor.query
+    assert cursor.params == (
+        "user@example.com",
+        101,
+        "marked_done",
+        "tester",
+        datetime(2025, 1, 1),
+        datetime(2025, 2, 1),
+        51,
+    )
+
+
+@pytest.mark.parametrize("params", ["limit=0", "limit=-1", f"limit={MAX_PAGE_SIZE + 1}", "cursor=&limit=0"])
+def test_get_logs_rejects_out_of_range_limit(params):
+    response = client.get(f"/api/logs?{params}")
+    assert response.status_code == 422
+
+
+def test_get_logs_rejects_invalid_cursor():
+    response = client.get("/api/logs?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
 def test_get_chores(monkeypatch):
     monkeypatch.setattr(
-        "app.api.routes.get_db_connection", dummy_get_db_connection_for_chores
+        "app.api.routes.async_db_connection", dummy_async_db_connection_for_chores()
     )
     response = client.get("/api/chores")
     assert response.status_code == 200
@@ -163,6 +262,86 @@ def test_get_chores(monkeypatch):
     assert len(data) == 2
 
 
+def test_get_chores_cursor_pagination(monkeypatch):
+    monkeypatch.setattr(
+        "app.api.routes.async_db_connection", dummy_async_db_connection_for_chores()
+    )
+    response = client.get("/api/chores?cursor=&limit=1")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["items"][0]["id"] == 1
+    assert data["next_cursor"] == response.headers["X-Next-Cursor"]
+
+
+def test_get_chores_legacy_paging_sets_cursor_header(monkeypatch):
+    monkeypatch.setattr(
+        "app.api.routes.async_db_connection", dummy_async_db_connection_for_chores()
+    )
+    response = client.get("/api/chores?page=1&limit=1")
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+    assert len(response.json()) == 1
+    assert "X-Next-Cursor" in response.headers
+
+
+@pytest.mark.parametrize("path", ["/api/chores", "/api/chores/archived"])
+@pytest.mark.parametrize("params", ["limit=0", "limit=-1", f"limit={MAX_PAGE_SIZE + 1}", "page=0"])
+def test_chore_lists_reject_out_of_range_paging(path, params):
+    response = client.get(f"{path}?{params}")
+    assert response.status_code == 422
+
+
+def dummy_async_db_connection_for_dashboard(chore_rows):
+    # summary columns: six bucket counts, scored chore count, average score
+    summary = [3, 1, 1, 0, 1, 0, 2, 90.0]
+    rows = [summary + list(row) for row in chore_rows] or [summary + [None] * 10]
+    return dummy_async_db_connection(DummyAsyncCursor(rows=rows))
+
+
+def test_get_dashboard(monkeypatch):
+    chore_rows = [
+        [1, "Test Chore", 7, date.today(), False, None, False, None, False, None],
+        [2, "Another Chore", 3, date.today() + timedelta(days=3), False, None, False, None, False, None],
+    ]
+    monkeypatch.setattr(
+        "app.api.routes.async_db_connection", dummy_async_db_connection_for_dashboard(chore_rows)
+    )
+    response = client.get("/api/dashboard?limit=1", headers={"X-User-Email": "user@example.com"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [chore["id"] for chore in data["items"]] == [1]
+    assert data["next_cursor"]
+    assert data["counts"] == {"all": 3, "overdue": 1, "today": 1, "tomorrow": 0, "thisWeek": 1, "upcoming": 0}
+    assert data["household_health"] == 90
+
+
+def test_get_dashboard_without_chores(monkeypatch):
+    monkeypatch.setattr("app.api.routes.async_db_connection", dummy_async_db_connection_for_dashboard([]))
+    response = client.get("/api/dashboard")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == []
+    assert data["next_cursor"] is None
+    assert data["counts"]["all"] == 3
+
+
+def test_get_dashboard_uses_one_query(monkeypatch):
+    cursor = DummyAsyncCursor(rows=[[0, 0, 0, 0, 0, 0, 0, None] + [None] * 10])
+    monkeypatch.setattr("app.api.routes.async_db_connection", dummy_async_db_connection(cursor))
+    response = client.get("/api/dashboard?limit=5", headers={"X-User-Email": "user@example.com"})
+    assert response.status_code == 200
+    assert response.json()["household_health"] == 100
+    assert cursor.params["user_email"] == "user@example.com"
+    assert cursor.params["limit"] == 6
+
+
+@pytest.mark.parametrize("limit", [0, -1, MAX_PAGE_SIZE + 1])
+def test_get_dashboard_rejects_out_of_range_limit(limit):
+    response = client.get(f"/api/dashboard?limit={limit}")
+    assert response.status_code == 422
+
+
 def test_get_version_info(monkeypatch):
     monkeypatch.setenv("VERSION_TAG", "v1.2.3")
     monkeypatch.setenv("BACKEND_IMAGE", "backend:latest")
@@ -177,7 +356,7 @@ def test_get_version_info(monkeypatch):
 
 def test_private_and_shared_chores(monkeypatch):
     # Simulate DB returning both private and shared chores
-    def fake_get_db_connection():
+    def fake_async_db_connection():
         from datetime import date
 
         rows = [
@@ -196,26 +375,9 @@ def test_private_and_shared_chores(monkeypatch):
             ],
         ]
 
-        class DummyCursor:
-            def execute(self, *a, **k):
-                pass
-
-            def fetchall(self):
-                return rows
+        return dummy_async_db_connection(DummyAsyncCursor(rows=rows))
 
-            def close(self):
-                pass
-
-        class DummyConn:
-            def cursor(self):
-                return DummyCursor()
-
-            def close(self):
-                pass
-
-        return DummyConn()
-
-    monkeypatch.setattr("app.api.routes.get_db_connection", fake_get_db_connection)
+    monkeypatch.setattr("app.api.routes.async_db_connection", fake_async_db_connection())
     # Simulate user requesting chores
     from app.main import app as fastapi_app
 
@@ -281,20 +443,14 @@ def test_add_chore_with_privacy(monkeypatch):
 
 
 def test_mark_chore_done_prevents_duplicate_same_day(monkeypatch):
-    today = date.today()
-
     class DummyCursor:
         def __init__(self):
             self.calls = []
 
         def execute(self, query, params=None):
             self.calls.append(query)
-            if "SELECT interval_days" in query:
-                self._row = (
-                    3,
-                    today,
-                    today,
-                )  # interval_days, due_date, last_done=today
+            # last_done is already today, so the conditional UPDATE matches nothing
+            self._row = (1,) if query.strip().startswith("SELECT 1") else None
 
         def fetchone(self):
             return getattr(self, "_row", None)
@@ -0,0 +1,183 @@
+"""
+Tests for GET /api/sync against a migrated scratch schema, so the change_seq
+and tombstone triggers are exercised. Skips if PostgreSQL is unavailable.
+"""
+
+import os
+from contextlib import asynccontextmanager
+
+import psycopg
+import psycopg2
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import sync_endpoint
+from app.migrations import migrate
+
+SCHEMA = "test_sync"
+OWNER = {"X-User-Email": "a@example.com"}
+OTHER = {"X-User-Email": "b@example.com"}
+
+
+@pytest.fixture
+def sync_db(real_db_connection, monkeypatch):
+    """A psycopg2 connection to a migrated scratch schema that /api/sync reads."""
+    cur = real_db_connection.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+    real_db_connection.commit()
+    params = real_db_connection.get_dsn_parameters()
+    params = {
+        "host": params["host"], "dbname": params["dbname"], "user": params["user"],
+        "password": os.getenv("POSTGRES_PASSWORD", "password"), "options": f"-c search_path={SCHEMA}",
+    }
+
+    @asynccontextmanager
+    async def scratch_connection():
+        async with await psycopg.AsyncConnection.connect(**params) as conn:
+            yield conn
+
+    monkeypatch.setattr(sync_endpoint, "async_db_connection", scratch_connection)
+    conn = psycopg2.connect(**params)
+    migrate(conn)
+    yield conn
+    conn.close()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    real_db_connection.commit()
+    cur.close()
+
+
+@pytest.fixture
+def client(sync_db):
+    app = FastAPI()
+    app.include_router(sync_endpoint.router, prefix="/api")
+    with TestClient(app) as client:
+        yield client
+
+
+def run(conn, sql, params=None):
+    with conn.cursor() as cur:
+        cur.execute(sql, params)
+        row = cur.fetchone() if cur.description else None
+    conn.commit()
+    return row
+
+
+def add_chore(conn, name, is_private=False, owner_email=None):
+    return run(
+        conn,
+        "INSERT INTO chores (name, interval_days, due_date, is_private, owner_email)"
+        " VALUES (%s, 7, CURRENT_DATE, %s, %s) RETURNING id",
+        (name, is_private, owner_email),
+    )[0]
+
+
+def sync(client, since=None, headers=OTHER):
+    response = client.get("/api/sync", params={} if since is None else {"since": since}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_first_sync_is_a_snapshot_of_visible_chores(client, sync_db):
+    add_chore(sync_db, "Dishes")
+    add_chore(sync_db, "Diary", is_private=True, owner_email="a@example.com")
+    archived = add_chore(sync_db, "Old")
+    run(sync_db, "UPDATE chores SET archived = TRUE WHERE id = %s", (archived,))
+
+    body = sync(client)
+
+    assert body["snapshot"] is True and isinstance(body["cursor"], int)
+    assert sorted(c["name"] for c in body["chores"]) == ["Dishes", "Old"]
+    assert "change_seq" not in body["chores"][0]
+    assert sorted(c["name"] for c in sync(client, headers=OWNER)["chores"]) == ["Diary", "Dishes", "Old"]
+
+
+def test_delta_holds_only_changes_since_the_cursor(client, sync_db):
+    dishes = add_chore(sync_db, "Dishes")
+    add_chore(sync_db, "Laundry")
+    cursor = sync(client)["cursor"]
+
+    run(sync_db, "UPDATE chores SET archived = TRUE WHERE id = %s", (dishes,))
+    run(sync_db, "UPDATE chores SET name = name WHERE id = %s", (dishes + 1,))
+    bins = add_chore(sync_db, "Bins")
+    log_id = run(
+        sync_db,
+        "INSERT INTO chore_logs (chore_id, done_by, action_type, action_details)"
+        " VALUES (%s, 'b@example.com', 'marked_done', '{\"x\": 1}') RETURNING id",
+        (bins,),
+    )[0]
+    body = sync(client, cursor)
+
+    assert body["snapshot"] is False
+    assert [(c["id"], c["archived"]) for c in body["chores"]] == [(dishes, True), (bins, False)]
+    assert [(log["id"], log["action_details"]) for log in body["logs"]] == [(log_id, {"x": 1})]
+    assert body["removed"] == {"chores": [], "logs": []}
+
+    after = sync(client, body["cursor"])
+    assert (after["chores"], after["logs"]) == ([], [])
+
+
+def test_chores_made_private_are_removed_for_others(client, sync_db):
+    chore = add_chore(sync_db, "Diary", owner_email="a@example.com")
+    run(sync_db, "INSERT INTO chore_logs (chore_id, action_type) VALUES (%s, 'created')", (chore,))
+    cursor = sync(client)["cursor"]
+
+    run(sync_db, "UPDATE chores SET is_private = TRUE WHERE id = %s", (chore,))
+    run(sync_db, "INSERT INTO chore_logs (chore_id, action_type) VALUES (%s, 'updated')", (chore,))
+
+    other = sync(client, cursor)
+    assert (other["chores"], other["logs"], other["removed"]["chores"]) == ([], [], [chore])
+    owner = sync(client, cursor, headers=OWNER)
+    assert [c["id"] for c in owner["chores"]] == [chore] and len(owner["logs"]) == 1
+
+
+def test_deletes_are_sent_as_tombstones(client, sync_db):
+    chore = add_chore(sync_db, "Dishes")
+    log_id = run(sync_db, "INSERT INTO chore_logs (chore_id, action_type) VALUES (%s, 'created') RETURNING id", (chore,))[0]
+    cursor = sync(client)["cursor"]
+
+    run(sync_db, "DELETE FROM chores WHERE id = %s", (chore,))
+
+    assert sync(client, cursor)["removed"] == {"chores": [chore], "logs": [log_id]}
+
+
+def test_transactions_committing_late_are_not_missed(client, sync_db):
+    slow = psycopg2.connect(**sync_db.get_dsn_parameters(), password=os.getenv("POSTGRES_PASSWORD", "password"))
+    try:
+        with slow.cursor() as cur:
+            cur.execute(f"SET search_path = {SCHEMA}")
+            cur.execute("INSERT INTO chores (name, interval_days, due_date) VALUES ('Slow', 1, CURRENT_DATE)")
+        add_chore(sync_db, "Fast")
+        first = sync(client)
+        slow.commit()
+    finally:
+        slow.close()
+
+    assert [c["name"] for c in first["chores"]] == ["Fast"]
+    assert sorted(c["name"] for c in sync(client, first["cursor"])["chores"]) == ["Fast", "Slow"]
+
+
+def test_unusable_cursors_fall_back_to_a_snapshot(client, sync_db, monkeypatch):
+    add_chore(sync_db, "Dishes")
+    cursor = sync(client)["cursor"]
+    horizon = run(sync_db, "SELECT min_seq FROM sync_horizon")[0]
+
+    assert sync(client, horizon - 1)["snapshot"] is True
+    assert sync(client, cursor + 10**9)["snapshot"] is True
+
+    monkeypatch.setattr(sync_endpoint, "SYNC_MAX_CHANGES", 1)
+    add_chore(sync_db, "Laundry")
+    add_chore(sync_db, "Bins")
+    body = sync(client, cursor)
+    assert body["snapshot"] is True and len(body["chores"]) == 3
+
+
+def test_database_errors_are_500(client, monkeypatch):
+    @asynccontextmanager
+    async def broken():
+        raise RuntimeError("down")
+        yield
+
+    monkeypatch.setattr(sync_endpoint, "async_db_connection", broken)
+
+    assert client.get("/api/sync", headers=OTHER).status_code == 500
@@ -0,0 +1,190 @@
+"""
+Unit tests for the write-behind audit log writer.
+
+These tests use a fake connect function and do not require PostgreSQL.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from app.audit import AuditLogWriter
+from app.database import PooledConnection
+
+
+class FakeCursor:
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def inserted(monkeypatch):
+    """Capture the batches passed to execute_values instead of talking to Postgres."""
+    batches = []
+
+    def fake_execute_values(cur, sql, rows, page_size=None):
+        if any(row[2] == "bad" for row in rows):
+            raise Exception("insert or update on table chore_logs violates foreign key constraint")
+        batches.append(list(rows))
+
+    monkeypatch.setattr("app.audit.execute_values", fake_execute_values)
+    return batches
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def make_row(n, action_type="marked_done"):
+    return (n, "tester", action_type, "{}", datetime(2025, 1, 1))
+
+
+class TestAuditLogWriter:
+    def test_submit_rejected_when_not_running(self, inserted):
+        writer = AuditLogWriter(connect=FakeConnection)
+        assert writer.submit(make_row(1)) is False
+
+    def test_flushes_full_batches_and_drains_on_stop(self, inserted):
+        writer = AuditLogWriter(batch_size=3, flush_interval=60, connect=FakeConnection)
+        writer.start()
+        for n in range(7):
+            assert writer.submit(make_row(n)) is True
+        writer.stop(timeout=5)
+
+        assert [len(batch) for batch in inserted] == [3, 3, 1]
+        assert [row[0] for batch in inserted for row in batch] == list(range(7))
+        stats = writer.stats()
+        assert stats["written"] == 7
+        assert stats["batches"] == 3
+        assert stats["running"] is False
+
+    def test_flushes_partial_batch_after_interval(self, inserted):
+        writer = AuditLogWriter(batch_size=100, flush_interval=0.05, connect=FakeConnection)
+        writer.start()
+        try:
+            writer.submit(make_row(1))
+            assert wait_for(lambda: writer.stats()["written"] == 1)
+        finally:
+            writer.stop(timeout=5)
+
+    def test_full_queue_pushes_back_on_caller(self, inserted):
+        gate = threading.Event()
+
+        def blocking_connect():
+            gate.wait(5)
+            return FakeConnection()
+
+        writer = AuditLogWriter(
+            queue_size=1, batch_size=1, flush_interval=0, enqueue_timeout=0.01, connect=blocking_connect
+        )
+        writer.start()
+        try:
+            assert writer.submit(make_row(1)) is True
+            # The writer thread is now stuck flushing row 1, so row 2 fills the queue
+            assert wait_for(lambda: writer.stats()["queued"] == 0)
+            assert writer.submit(make_row(2)) is True
+            assert writer.submit(make_row(3)) is False
+            assert writer.stats()["rejected"] == 1
+        finally:
+            gate.set()
+            writer.stop(timeout=5)
+        assert writer.stats()["written"] == 2
+
+    def test_failed_batch_is_retried_row_by_row(self, inserted):
+        writer = AuditLogWriter(batch_size=3, flush_interval=60, connect=FakeConnection)
+        writer.start()
+        writer.submit(make_row(1))
+        writer.submit(make_row(2, action_type="bad"))
+        writer.submit(make_row(3))
+        writer.stop(timeout=5)
+
+        assert [row[0] for batch in inserted for row in batch] == [1, 3]
+        assert writer.stats()["failed"] == 1
+        assert writer.stats()["written"] == 2
+
+
+class FakePool:
+    def _release(self, conn, created_at):
+        pass
+
+
+class TestLogActionWriteBehind:
+    @pytest.fixture
+    def submitted(self, monkeypatch):
+        rows = []
+        monkeypatch.setattr("app.utils.audit_writer_running", lambda: True)
+        monkeypatch.setattr("app.utils.submit_audit_row", lambda row: rows.append(row) or True)
+        return rows
+
+    def test_row_is_queued_once_the_callers_transaction_commits(self, mock_db_connection, submitted):
+        conn = PooledConnection(FakePool(), mock_db_connection(), time.monotonic())
+        from app.utils import log_action
+
+        before = datetime.now()
+        log_action(1, "tester", "unarchived", action_details={"chore_id": 1}, conn=conn)
+        assert submitted == []
+        conn.commit()
+
+        [(chore_id, done_by, action_type, details, done_at)] = submitted
+        assert (chore_id, done_by, action_type, details) == (1, "tester", "unarchived", '{"chore_id": 1}')
+        # done_at is when the action was logged, not when the writer flushes it
+        assert before <= done_at <= datetime.now()
+        assert conn.cursor().queries == []
+
+    def test_rolled_back_change_leaves_no_audit_row(self, mock_db_connection, submitted):
+        conn = PooledConnection(FakePool(), mock_db_connection(), time.monotonic())
+        from app.utils import log_action
+
+        log_action(1, "tester", "unarchived", conn=conn)
+        conn.rollback()
+        conn.commit()
+
+        assert submitted == []
+
+    @pytest.mark.parametrize("action_type", ["created", "marked_done", "updated", "archived"])
+    def test_undoable_actions_use_callers_transaction_by_default(self, mock_db_connection, monkeypatch, action_type):
+        conn = PooledConnection(FakePool(), mock_db_connection(), time.monotonic())
+        monkeypatch.setattr("app.utils.audit_writer_running", lambda: True)
+        monkeypatch.setattr("app.utils.submit_audit_row", lambda row: pytest.fail("strict rows must not be queued"))
+        from app.utils import log_action
+
+        log_action(1, "tester", action_type, conn=conn)
+
+        [(query, params)] = conn.cursor().queries
+        assert "done_at" in query and isinstance(params[4], datetime)
+        # The caller commits the audit row together with its own change
+        assert conn.committed is False
+
+    def test_row_is_written_in_transaction_when_writer_is_stopped(self, mock_db_connection, monkeypatch):
+        conn = PooledConnection(FakePool(), mock_db_connection(), time.monotonic())
+        monkeypatch.setattr("app.utils.audit_writer_running", lambda: False)
+        from app.utils import log_action
+
+        log_action(1, "tester", "unarchived", conn=conn)
+
+        assert len(conn.cursor().queries) == 1
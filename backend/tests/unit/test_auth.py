@@ -0,0 +1,302 @@
+"""
+Unit tests for token verification and the JWKS cache.
+
+Keys are generated locally and served by a fake fetcher, so these tests
+make no network calls.
+"""
+
+import asyncio
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jwt.algorithms import RSAAlgorithm
+
+from app import auth
+from app.auth import JwksCache, TokenCache
+
+
+def make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update(kid=kid, use="sig", alg="RS256")
+    return private_key, jwk
+
+
+class FakeFetcher:
+    def __init__(self, *jwks, delay=0):
+        self.jwks = list(jwks)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return list(self.jwks)
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return make_key("key-1")
+
+
+def sign(private_key, kid, **claims):
+    payload = {
+        "iss": auth.DEX_ISSUER_URL,
+        "aud": auth.OAUTH_CLIENT_ID,
+        "email": "a@example.com",
+        "exp": int(time.time()) + 300,
+        **claims,
+    }
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class TestJwksCache:
+    def test_parses_keys_once_per_fetch(self, signing_key, monkeypatch):
+        fetcher = FakeFetcher(signing_key[1])
+        cache = JwksCache(fetch=fetcher)
+        parsed = []
+        from_jwk = RSAAlgorithm.from_jwk
+        monkeypatch.setattr(RSAAlgorithm, "from_jwk", lambda jwk: parsed.append(jwk) or from_jwk(jwk))
+
+        async def run():
+            return [await cache.get_key("key-1") for _ in range(5)]
+
+        keys = asyncio.run(run())
+
+        assert len(parsed) == 1
+        assert fetcher.calls == 1
+        assert all(key is keys[0] for key in keys)
+
+    def test_concurrent_misses_share_one_fetch(self, signing_key):
+        fetcher = FakeFetcher(signing_key[1], delay=0.05)
+        cache = JwksCache(fetch=fetcher)
+
+        async def run():
+            return await asyncio.gather(*(cache.get_key("key-1") for _ in range(20)))
+
+        asyncio.run(run())
+
+        assert fetcher.calls == 1
+
+    def test_concurrent_waiters_share_a_failed_fetch(self):
+        async def failing_fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            raise HTTPException(status_code=503, detail="Could not retrieve JWKS from Dex")
+
+        calls = []
+        cache = JwksCache(fetch=failing_fetch)
+
+        async def run():
+            return await asyncio.gather(*(cache.get_key("key-1") for _ in range(5)), return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(isinstance(result, HTTPException) and result.status_code == 503 for result in results)
+
+    def test_unknown_kid_refetches_at_most_once_per_interval(self, signing_key):
+        _, rotated = make_key("key-2")
+        fetcher = FakeFetcher(signing_key[1])
+        cache = JwksCache(fetch=fetcher, min_refresh_interval=60)
+
+        async def run():
+            await cache.get_key("key-1")
+            cache._last_fetch_started -= 60
+            # The issuer rotates to a new key
+            fetcher.jwks.append(rotated)
+            rotated_key = await cache.get_key("key-2")
+            with pytest.raises(HTTPException) as missing:
+                await cache.get_key("unknown")
+            return rotated_key, missing.value
+
+        rotated_key, missing = asyncio.run(run())
+
+        assert rotated_key is not None
+        assert fetcher.calls == 2
+        assert (missing.status_code, missing.detail) == (401, "Key not found")
+
+    def test_version_changes_only_when_keys_are_dropped_or_replaced(self, signing_key):
+        _, added = make_key("key-2")
+        fetcher = FakeFetcher(signing_key[1])
+        cache = JwksCache(fetch=fetcher)
+
+        async def run():
+            versions = []
+            for jwks in ([signing_key[1]], [signing_key[1], added], [added]):
+                fetcher.jwks = jwks
+                cache._generation += 1
+                await cache.refresh()
+                versions.append(cache.version)
+            return versions
+
+        assert asyncio.run(run()) == [0, 0, 1]
+
+    def test_non_rsa_keys_are_rejected(self):
+        cache = JwksCache(fetch=FakeFetcher({"kid": "ec", "kty": "EC"}))
+
+        with pytest.raises(HTTPException, match="Key is not RSA"):
+            asyncio.run(cache.get_key("ec"))
+
+    def test_stale_keys_are_kept_when_refresh_fails(self, signing_key):
+        fetcher = FakeFetcher(signing_key[1])
+        cache = JwksCache(fetch=fetcher, max_age=60)
+
+        async def run():
+            first = await cache.get_key("key-1")
+            cache.last_updated -= 120
+            fetcher.jwks = None  # the next fetch raises TypeError
+            return first, await cache.get_key("key-1")
+
+        first, second = asyncio.run(run())
+
+        assert first is second
+
+    def test_refresh_loop_only_refreshes_loaded_caches(self, signing_key):
+        fetcher = FakeFetcher(signing_key[1])
+        cache = JwksCache(fetch=fetcher)
+
+        async def run():
+            task = asyncio.create_task(cache.run_refresh_loop(interval=0.01))
+            await asyncio.sleep(0.05)
+            idle_calls = fetcher.calls
+            await cache.get_key("key-1")
+            await asyncio.sleep(0.05)
+            task.cancel()
+            return idle_calls
+
+        assert asyncio.run(run()) == 0
+        assert fetcher.calls > 1
+
+
+class TestTokenCache:
+    def test_hits_until_expiry(self, monkeypatch):
+        cache = TokenCache(max_size=10)
+        now = time.time()
+        cache.put("token", {"email": "a@example.com", "exp": now + 60}, key_set_version=0)
+
+        assert cache.get("token", 0) == {"email": "a@example.com", "exp": now + 60}
+        monkeypatch.setattr(auth.time, "time", lambda: now + 61)
+        assert cache.get("token", 0) is None
+        assert cache.stats() == {
+            "size": 0, "max_size": 10, "hits": 1, "misses": 1, "hit_ratio": 0.5, "evictions": 0, "invalidations": 0,
+        }
+
+    def test_evicts_least_recently_used(self):
+        cache = TokenCache(max_size=2)
+        exp = time.time() + 60
+        for token in ("a", "b"):
+            cache.put(token, {"exp": exp}, 0)
+        cache.get("a", 0)
+
+        cache.put("c", {"exp": exp}, 0)
+
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) is not None and cache.get("c", 0) is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_key_rotation_invalidates_entries(self):
+        cache = TokenCache()
+        cache.put("token", {"exp": time.time() + 60}, key_set_version=0)
+
+        assert cache.get("token", 1) is None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_tokens_without_expiry_are_not_cached(self):
+        cache = TokenCache()
+        cache.put("token", {"email": "a@example.com"}, 0)
+
+        assert cache.stats()["size"] == 0
+
+    def test_keys_by_token_hash(self):
+        cache = TokenCache()
+        cache.put("secret-token", {"exp": time.time() + 60}, 0)
+
+        assert "secret-token" not in cache._entries
+
+
+class TestVerifyToken:
+    @pytest.fixture(autouse=True)
+    def cache(self, signing_key, monkeypatch):
+        cache = JwksCache(fetch=FakeFetcher(signing_key[1]))
+        monkeypatch.setattr(auth, "jwks_cache", cache)
+        monkeypatch.setattr(auth, "token_cache", TokenCache())
+        return cache
+
+    def test_repeated_tokens_skip_signature_verification(self, signing_key, monkeypatch):
+        token = sign(signing_key[0], "key-1")
+        asyncio.run(auth.verify_token(token))
+        decode = jwt.decode
+        decodes = []
+        monkeypatch.setattr(auth.jwt, "decode", lambda *a, **k: decodes.append(1) or decode(*a, **k))
+
+        for _ in range(3):
+            assert asyncio.run(auth.verify_token(token))["email"] == "a@example.com"
+
+        assert decodes == []
+        assert auth.get_auth_stats()["token_cache"]["hits"] == 3
+
+    def test_rotated_keys_force_reverification(self, signing_key, cache):
+        token = sign(signing_key[0], "key-1")
+        asyncio.run(auth.verify_token(token))
+        # key-1 is withdrawn by the issuer
+        cache._fetch.jwks = [make_key("key-2")[1]]
+        cache._generation += 1
+        asyncio.run(cache.refresh())
+
+        with pytest.raises(HTTPException, match="Key not found"):
+            asyncio.run(auth.verify_token(token))
+
+    def test_valid_token_returns_claims(self, signing_key):
+        token = sign(signing_key[0], "key-1")
+
+        assert asyncio.run(auth.verify_token(token))["email"] == "a@example.com"
+
+    @pytest.mark.parametrize(
+        "token_factory, detail",
+        [
+            (lambda key: sign(key, "key-1", exp=int(time.time()) - 10), "Token has expired"),
+            (lambda key: sign(key, "key-1", aud="someone-else"), "Incorrect claims"),
+            (lambda key: sign(key, "key-1", iss="https://evil.example.com"), "Incorrect claims"),
+            (lambda key: sign(make_key("key-1")[0], "key-1"), "Could not validate token"),
+            (lambda key: "not-a-jwt", "Invalid token header"),
+        ],
+    )
+    def test_invalid_tokens_are_unauthorized(self, signing_key, token_factory, detail):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(auth.verify_token(token_factory(signing_key[0])))
+
+        assert error.value.status_code == 401
+        assert detail in error.value.detail
+
+
+class TestVerifyIdToken:
+    @pytest.fixture(autouse=True)
+    def cache(self, signing_key, monkeypatch):
+        cache = JwksCache(fetch=FakeFetcher(signing_key[1]))
+        monkeypatch.setattr(auth, "jwks_cache", cache)
+        return cache
+
+    def test_logins_reuse_the_cached_key_set(self, signing_key, cache):
+        for _ in range(3):
+            token = sign(signing_key[0], "key-1", nonce="n-1")
+            assert asyncio.run(auth.verify_id_token(token, nonce="n-1"))["email"] == "a@example.com"
+
+        assert cache.fetches == 1
+
+    @pytest.mark.parametrize(
+        "claims, nonce",
+        [
+            ({"nonce": "other"}, "n-1"),
+            ({"aud": "someone-else"}, None),
+            ({"exp": int(time.time()) - 10}, None),
+        ],
+    )
+    def test_invalid_id_tokens_are_rejected(self, signing_key, claims, nonce):
+        token = sign(signing_key[0], "key-1", **claims)
+
+        with pytest.raises(jwt.InvalidTokenError):
+            asyncio.run(auth.verify_id_token(token, nonce=nonce))
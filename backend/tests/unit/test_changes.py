@@ -0,0 +1,117 @@
+"""
+Unit tests for change feed fan-out and visibility filtering.
+"""
+
+import asyncio
+import json
+
+from app import data_version
+from app.changes import RESYNC, ChangeHub, ChangeListener, message_for
+
+SHARED_CHORE = {"type": "chore", "action": "updated", "id": 1, "name": "Dishes", "is_private": False, "owner_email": None}
+PRIVATE_CHORE = {"type": "chore", "action": "created", "id": 2, "name": "Diary", "is_private": True, "owner_email": "a@example.com"}
+
+
+def drain(subscriber):
+    messages = []
+    while not subscriber.queue.empty():
+        messages.append(json.loads(subscriber.queue.get_nowait()))
+    return messages
+
+
+class TestMessageFor:
+    def test_shared_changes_reach_everyone(self):
+        assert message_for(SHARED_CHORE, None) == SHARED_CHORE
+        assert message_for(SHARED_CHORE, "b@example.com") == SHARED_CHORE
+
+    def test_private_changes_reach_only_the_owner(self):
+        assert message_for(PRIVATE_CHORE, "a@example.com") == PRIVATE_CHORE
+        assert message_for(PRIVATE_CHORE, "b@example.com") is None
+        assert message_for(PRIVATE_CHORE, None) is None
+
+    def test_chore_made_private_is_removed_for_others(self):
+        event = {**PRIVATE_CHORE, "action": "updated", "was_private": False, "previous_owner_email": None}
+
+        assert message_for(event, "b@example.com") == {"type": "chore", "action": "removed", "id": 2}
+        owner_message = message_for(event, "a@example.com")
+        assert owner_message["name"] == "Diary" and "was_private" not in owner_message
+
+    def test_logs_follow_their_chore_and_drop_routing_fields(self):
+        shared_log = {"type": "log", "action": "marked_done", "id": 5, "chore_id": 1, "is_private": False, "owner_email": None}
+        private_log = {**shared_log, "is_private": True, "owner_email": "a@example.com"}
+        system_log = {**shared_log, "chore_id": None, "is_private": None}
+
+        assert message_for(shared_log, "b@example.com") == {"type": "log", "action": "marked_done", "id": 5, "chore_id": 1}
+        assert message_for(private_log, "b@example.com") is None
+        assert message_for(private_log, "a@example.com") is not None
+        assert message_for(system_log, None) is not None
+
+    def test_null_privacy_is_hidden_like_the_rest_queries(self):
+        chore = {**SHARED_CHORE, "is_private": None, "owner_email": "a@example.com"}
+        log = {"type": "log", "action": "marked_done", "id": 6, "chore_id": 1, "is_private": None, "owner_email": None}
+
+        assert message_for(chore, "b@example.com") is None
+        assert message_for(chore, "a@example.com") is None
+        assert message_for(log, "b@example.com") is None
+
+    def test_bulk_events_reach_everyone(self):
+        event = {"type": "chore", "action": "bulk", "count": 5000}
+
+        assert message_for(event, "b@example.com") == event
+
+
+class TestChangeHub:
+    def test_publish_filters_per_subscriber(self):
+        hub = ChangeHub()
+        owner, other, other_tab = hub.subscribe("a@example.com"), hub.subscribe("b@example.com"), hub.subscribe("b@example.com")
+
+        hub.publish(PRIVATE_CHORE)
+        hub.publish(SHARED_CHORE)
+
+        assert [m["id"] for m in drain(owner)] == [2, 1]
+        assert [m["id"] for m in drain(other)] == [1]
+        assert [m["id"] for m in drain(other_tab)] == [1]
+        assert hub.stats() == {"subscribers": 3, "events": 2, "messages": 4, "overflows": 0}
+
+    def test_slow_subscriber_is_told_to_resync(self):
+        hub = ChangeHub(buffer_size=3)
+        slow = hub.subscribe(None)
+
+        for n in range(5):
+            hub.publish({**SHARED_CHORE, "id": n})
+
+        # The backlog was replaced by a resync; later events queue after it
+        assert [m.get("id") for m in drain(slow)] == [None, 4]
+        assert hub.stats()["overflows"] == 1
+
+    def test_unsubscribed_clients_get_nothing(self):
+        hub = ChangeHub()
+        subscriber = hub.subscribe(None)
+        hub.unsubscribe(subscriber)
+
+        hub.publish(SHARED_CHORE)
+
+        assert subscriber.queue.empty()
+
+
+def test_listener_publishes_notifications_and_bumps_the_data_version():
+    hub = ChangeHub()
+    subscriber = hub.subscribe(None)
+    listener = ChangeListener(hub, conninfo="host=unused")
+    before = data_version.current_data_version()
+
+    listener.handle(json.dumps(SHARED_CHORE))
+    listener.handle("not json")
+
+    assert drain(subscriber) == [SHARED_CHORE]
+    assert data_version.current_data_version() == before + 1
+
+
+def test_broadcast_reaches_every_subscriber():
+    async def run():
+        hub = ChangeHub()
+        subscribers = [hub.subscribe(email) for email in ("a@example.com", None)]
+        hub.broadcast(RESYNC)
+        return [await subscriber.queue.get() for subscriber in subscribers]
+
+    assert asyncio.run(run()) == [RESYNC, RESYNC]
@@ -0,0 +1,256 @@
+"""
+Unit tests for the pooled database connection manager.
+
+These tests use a fake connect function and do not require PostgreSQL.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.database import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, query, params=None):
+        if self._conn.broken:
+            raise Exception("server closed the connection unexpectedly")
+        self._conn.queries.append(query)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.queries = []
+        self.rollbacks = 0
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    # Same semantics as psycopg2: end the transaction, keep the connection open
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeConnector:
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        conn = FakeConnection()
+        self.created.append(conn)
+        return conn
+
+
+def make_pool(**kwargs):
+    connector = FakeConnector()
+    options = {"min_size": 0, "max_size": 2, "max_lifetime": 3600, "timeout": 1, "health_check_interval": 60}
+    options.update(kwargs)
+    return ConnectionPool(connect=connector, **options), connector
+
+
+class TestConnectionPool:
+    """Tests for ConnectionPool checkout, release and recycling."""
+
+    def test_released_connection_is_reused(self):
+        """close() on a pooled connection returns it instead of disconnecting."""
+        pool, connector = make_pool()
+
+        first = pool.getconn()
+        raw = first.raw_connection
+        first.close()
+        second = pool.getconn()
+
+        assert second.raw_connection is raw
+        assert raw.closed == 0
+        assert len(connector.created) == 1
+
+    def test_release_rolls_back_open_transaction(self):
+        """Released connections are reset so no transaction leaks to the next user."""
+        pool, _ = make_pool()
+
+        conn = pool.getconn()
+        conn.close()
+
+        assert conn.raw_connection.rollbacks == 1
+
+    def test_transaction_context_commits_or_rolls_back_and_keeps_the_connection(self):
+        """with conn: works on a pooled connection like on a raw psycopg2 one."""
+        pool, _ = make_pool()
+        conn = pool.getconn()
+        raw = conn.raw_connection
+
+        with conn as entered:
+            assert entered is conn
+        with pytest.raises(RuntimeError):
+            with conn:
+                raise RuntimeError("boom")
+
+        assert (raw.commits, raw.rollbacks, raw.closed) == (1, 1, 0)
+        assert pool.stats()["in_use"] == 1
+        conn.close()
+        assert pool.stats()["in_use"] == 0
+
+    def test_after_commit_callbacks_run_only_when_the_transaction_commits(self):
+        """Callbacks fire after commit and are dropped by rollback or close."""
+        pool, _ = make_pool()
+        conn = pool.getconn()
+        ran = []
+
+        conn.after_commit(lambda: ran.append("rolled back"))
+        conn.rollback()
+        conn.after_commit(lambda: ran.append("committed"))
+        conn.commit()
+        with conn:
+            conn.after_commit(lambda: ran.append("context"))
+        with pytest.raises(RuntimeError):
+            with conn:
+                conn.after_commit(lambda: ran.append("context failed"))
+                raise RuntimeError("boom")
+        conn.after_commit(lambda: ran.append("closed"))
+        conn.close()
+
+        assert ran == ["committed", "context"]
+
+    def test_double_close_is_ignored(self):
+        """Closing the proxy twice must not release the slot twice."""
+        pool, _ = make_pool()
+
+        conn = pool.getconn()
+        conn.close()
+        conn.close()
+
+        assert pool.stats()["idle"] == 1
+        assert pool.stats()["in_use"] == 0
+
+    def test_open_prefills_min_size(self):
+        """open() creates min_size idle connections up front."""
+        pool, connector = make_pool(min_size=2)
+
+        pool.open()
+
+        assert len(connector.created) == 2
+        assert pool.stats()["idle"] == 2
+
+    def test_checkout_times_out_when_exhausted(self):
+        """getconn() raises PoolTimeout once max_size connections are in use."""
+        pool, _ = make_pool(max_size=1, timeout=0.05)
+
+        held = pool.getconn()
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+
+        assert pool.stats()["timeouts"] == 1
+        held.close()
+
+    def test_waiter_receives_released_connection(self):
+        """A blocked checkout is woken up when another caller releases."""
+        pool, _ = make_pool(max_size=1, timeout=2)
+        held = pool.getconn()
+        result = {}
+
+        def waiter():
+            result["conn"] = pool.getconn()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.05)
+        assert pool.stats()["waiting"] == 1
+        held.close()
+        thread.join(timeout=2)
+
+        assert result["conn"].raw_connection is held.raw_connection
+        assert pool.stats()["checkout_latency_max_ms"] > 0
+
+    def test_connection_past_max_lifetime_is_replaced(self):
+        """Connections older than max_lifetime are closed rather than reused."""
+        pool, connector = make_pool(max_lifetime=0.01)
+
+        first = pool.getconn()
+        raw = first.raw_connection
+        time.sleep(0.02)
+        first.close()
+        second = pool.getconn()
+
+        assert raw.closed == 1
+        assert second.raw_connection is not raw
+        assert len(connector.created) == 2
+
+    def test_broken_idle_connection_fails_health_check(self):
+        """Idle connections are probed and replaced when the probe fails."""
+        pool, connector = make_pool(health_check_interval=0)
+
+        first = pool.getconn()
+        raw = first.raw_connection
+        first.close()
+        raw.broken = True
+        second = pool.getconn()
+
+        assert second.raw_connection is not raw
+        assert pool.stats()["health_check_failures"] == 1
+        assert pool.stats()["size"] == 1
+
+    def test_connect_failure_frees_slot(self):
+        """A failed connect must not permanently consume pool capacity."""
+        calls = {"count": 0}
+
+        def flaky_connect():
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise Exception("connection refused")
+            return FakeConnection()
+
+        pool = ConnectionPool(min_size=0, max_size=1, timeout=0.1, connect=flaky_connect)
+
+        with pytest.raises(Exception, match="connection refused"):
+            pool.getconn()
+        conn = pool.getconn()
+
+        assert pool.stats()["size"] == 1
+        conn.close()
+
+    def test_stats_report_usage(self):
+        """stats() exposes in-use, idle and checkout counters."""
+        pool, _ = make_pool()
+
+        a = pool.getconn()
+        b = pool.getconn()
+        stats = pool.stats()
+        assert stats["in_use"] == 2
+        assert stats["checkouts"] == 2
+        a.close()
+        b.close()
+
+        stats = pool.stats()
+        assert stats["in_use"] == 0
+        assert stats["idle"] == 2
+        assert stats["size"] == 2
+
+    def test_invalid_sizes_rejected(self):
+        """min_size above max_size is a configuration error."""
+        with pytest.raises(ValueError):
+            ConnectionPool(min_size=3, max_size=2, connect=FakeConnector())
@@ -0,0 +1,103 @@
+"""
+Unit tests for the shared outbound HTTP client.
+
+Requests are answered by httpx.MockTransport, so no network is needed.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import http_client
+from app.api.auth_routes import auth_router
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_RETRY_BACKOFF", 0)
+
+
+def mock_client(responses):
+    """A client that replays responses (ints are status codes, exceptions are raised) and records requests."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        outcome = responses[min(len(requests), len(responses)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"n": len(requests)})
+
+    return http_client.create_http_client(transport=httpx.MockTransport(handler)), requests
+
+
+def send(client, method, retries=2):
+    async def run():
+        async with client:
+            return await http_client.request(method, "https://dex.example.com/x", retries=retries, client=client)
+
+    return asyncio.run(run())
+
+
+def test_idempotent_requests_retry_server_errors():
+    client, requests = mock_client([503, 502, 200])
+
+    response = send(client, "GET")
+
+    assert (response.status_code, len(requests)) == (200, 3)
+
+
+def test_gives_up_after_retries_and_returns_last_response():
+    client, requests = mock_client([503])
+
+    assert send(client, "GET", retries=1).status_code == 503
+    assert len(requests) == 2
+
+
+def test_posts_are_not_retried_once_sent():
+    client, requests = mock_client([503])
+    assert send(client, "POST").status_code == 503
+    assert len(requests) == 1
+
+    client, requests = mock_client([httpx.ReadTimeout("timed out")])
+    with pytest.raises(httpx.ReadTimeout):
+        send(client, "POST")
+    assert len(requests) == 1
+
+
+def test_posts_retry_when_the_request_was_never_sent():
+    client, requests = mock_client([httpx.ConnectError("refused"), 200])
+
+    assert send(client, "POST").status_code == 200
+    assert len(requests) == 2
+
+
+def test_shared_client_is_reused_until_closed():
+    async def run():
+        first = http_client.get_http_client()
+        assert http_client.get_http_client() is first
+        await http_client.close_http_client()
+        assert first.is_closed
+        second = http_client.get_http_client()
+        await http_client.close_http_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is not second
+
+
+def test_refresh_endpoint_uses_shared_client(monkeypatch):
+    client, requests = mock_client([200])
+    monkeypatch.setattr(http_client, "_client", client)
+    app = FastAPI()
+    app.include_router(auth_router, prefix="/api")
+
+    response = TestClient(app).post("/api/auth/refresh", json={"refresh_token": "r1"})
+
+    assert response.status_code == 200
+    assert requests[0].url.path == "/token"
+    assert b"refresh_token=r1" in requests[0].content
@@ -0,0 +1,38 @@
+"""
+Unit tests for the chore list fast serialization path.
+"""
+
+import json
+from datetime import date
+
+from app import serialization
+from app.models import Chore
+from app.serialization import FastJSONResponse, chore_to_dict, dumps, fast_json_response
+
+ROW = (7, "Dishes ✓", 3, date(2025, 1, 2), True, "a@example.com", False, None, False, date(2024, 12, 30))
+
+
+def test_rows_encode_like_the_chore_model(monkeypatch):
+    expected = json.loads(Chore(**{**chore_to_dict(ROW), "due_date": "2025-01-02", "last_done": "2024-12-30"}).model_dump_json())
+
+    assert json.loads(dumps([chore_to_dict(ROW)])) == [expected]
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert json.loads(dumps([chore_to_dict(ROW)])) == [expected]
+
+
+def test_standard_library_fallback_is_compact_utf8(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert dumps({"name": "Dishes ✓", "due": date(2025, 1, 2)}) == '{"name":"Dishes ✓","due":"2025-01-02"}'.encode()
+
+
+def test_fast_response_keeps_headers_set_by_the_endpoint():
+    endpoint_response = FastJSONResponse()
+    endpoint_response.headers["ETag"] = 'W/"1"'
+    del endpoint_response.headers["content-length"]
+
+    response = fast_json_response({"items": [chore_to_dict(ROW)], "next_cursor": None}, endpoint_response)
+
+    assert response.headers["ETag"] == 'W/"1"'
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body)["items"][0]["due_date"] == "2025-01-02"
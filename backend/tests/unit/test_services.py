@@ -220,6 +220,115 @@ class TestHouseholdHealthScore:
         assert score == 100
 
 
+class TestBatchScoring:
+    """Tests for the vectorized batch scorers."""
+
+    def test_to_epoch_days(self):
+        """Dates map to whole days, datetimes to fractional days since 1970-01-01."""
+        from app.services import to_epoch_days
+
+        assert to_epoch_days(date(1970, 1, 2)) == 1.0
+        assert to_epoch_days(datetime(1970, 1, 2, 12, 0, 0)) == 1.5
+        assert to_epoch_days("1970-01-03") == 2.0
+
+    def test_chore_scores_match_single_chore_score(self):
+        """Per-chore batch scores should equal calculate_single_chore_score row by row."""
+        import random
+
+        from app.services import calculate_chore_scores_batch, calculate_single_chore_score, to_epoch_days
+
+        rng = random.Random(42)
+        now = datetime(2025, 1, 10, 13, 37, 12)
+        due_dates = [date(2025, 1, 10) + timedelta(days=rng.randint(-60, 60)) for _ in range(500)]
+        intervals = [rng.randint(1, 30) for _ in range(500)]
+
+        scores = calculate_chore_scores_batch([to_epoch_days(d) for d in due_dates], intervals, now)
+
+        expected = [
+            calculate_single_chore_score(datetime.combine(d, datetime.min.time()), i, now)
+            for d, i in zip(due_dates, intervals)
+        ]
+        assert scores.tolist() == pytest.approx(expected, abs=1e-9)
+
+    def test_invalid_intervals_score_nan(self):
+        """Non-positive or missing intervals are masked out with NaN."""
+        import math
+
+        from app.services import calculate_chore_scores_batch
+
+        scores = calculate_chore_scores_batch([0.0, 0.0, 0.0], [0, -1, float("nan")], datetime(1970, 1, 1))
+
+        assert all(math.isnan(score) for score in scores)
+
+    def test_missing_due_dates_are_skipped(self):
+        """A None due date scores NaN per chore and is left out of the household average."""
+        import math
+
+        from app.services import (
+            calculate_chore_scores_batch,
+            calculate_household_health_score,
+            calculate_household_health_scores_batch,
+            to_epoch_days,
+        )
+
+        now = datetime(2025, 1, 10, 12, 0, 0)
+        rows = [(datetime(2025, 1, 5, 12, 0, 0), 10), (None, 7)]
+        due = [to_epoch_days(d) for d, _ in rows]
+        intervals = [i for _, i in rows]
+
+        scores = calculate_chore_scores_batch(due, intervals, now)
+        _, household = calculate_household_health_scores_batch(due, intervals, now=now)
+
+        assert scores[0] == pytest.approx(40.0)
+        assert math.isnan(scores[1])
+        assert household.tolist() == [calculate_household_health_score(rows, now)] == [40]
+
+    def test_household_scores_per_group(self):
+        """Each group is averaged independently, matching calculate_household_health_score."""
+        from app.services import (
+            calculate_household_health_score,
+            calculate_household_health_scores_batch,
+            to_epoch_days,
+        )
+
+        now = datetime(2025, 1, 10, 12, 0, 0)
+        chores = {
+            "alice": [(datetime(2025, 1, 20, 12, 0, 0), 7), (datetime(2025, 1, 5, 12, 0, 0), 10)],
+            "bob": [(datetime(2025, 1, 5, 12, 0, 0), 10)],
+            "carol": [(datetime(2025, 1, 5, 12, 0, 0), 0)],  # only invalid chores
+        }
+        rows = [(owner, due, interval) for owner, items in chores.items() for due, interval in items]
+
+        groups, scores = calculate_household_health_scores_batch(
+            [to_epoch_days(due) for _, due, _ in rows],
+            [interval for _, _, interval in rows],
+            [owner for owner, _, _ in rows],
+            now,
+        )
+
+        assert groups.tolist() == ["alice", "bob", "carol"]
+        assert scores.tolist() == [calculate_household_health_score(chores[g], now) for g in groups]
+        assert scores.tolist() == [70, 40, 100]
+
+    def test_household_scores_default_to_single_group(self):
+        """Without group ids every chore is scored as one household."""
+        from app.services import calculate_household_health_scores_batch
+
+        groups, scores = calculate_household_health_scores_batch([100.0], [7], now=datetime(1970, 1, 1))
+
+        assert groups.tolist() == [0]
+        assert scores.tolist() == [100]
+
+    def test_mismatched_lengths_raise(self):
+        """Columns of different lengths are rejected."""
+        from app.services import calculate_chore_scores_batch, calculate_household_health_scores_batch
+
+        with pytest.raises(ValueError):
+            calculate_chore_scores_batch([1.0, 2.0], [7])
+        with pytest.raises(ValueError):
+            calculate_household_health_scores_batch([1.0, 2.0], [7, 7], [1])
+
+
 # =============================================================================
 # Date Utility Tests
 # =============================================================================
@@ -14,6 +14,9 @@ export const useChoreStore = defineStore('chores', () => {
   const pageSize = ref(10); // Number of items per page
   const hasMoreChores = ref(true); // Whether there are more chores to load
   const hasMoreArchivedChores = ref(true); // Whether there are more archived chores to load
+  // Keyset cursors returned by the API; null once the last page has been loaded
+  const nextChoresCursor = ref(null);
+  const nextArchivedCursor = ref(null);
 
 
   // New state for total counts from server
@@ -115,8 +118,6 @@ export const useChoreStore = defineStore('chores', () => {
       // Reset for first page load
       chores.value = [];
       hasMoreChores.value = true;
-      // Also fetch counts on initial load
-      fetchChoreCounts();
     }
 
     if (!hasMoreChores.value && page > 1) return;
@@ -124,15 +125,24 @@ export const useChoreStore = defineStore('chores', () => {
     loading.value = true;
     error.value = null;
     try {
-      // Fetch active chores with pagination
-      const response = await api.get('/chores', {
-        params: {
-          page,
-          limit: pageSize.value
-        }
-      });
+      // The first page comes from /dashboard together with the counts and
+      // health score; later pages use keyset pagination on /chores
+      const response = page === 1
+        ? await api.get('/dashboard', { params: { limit: pageSize.value } })
+        : await api.get('/chores', {
+          params: {
+            cursor: nextChoresCursor.value,
+            limit: pageSize.value
+          }
+        });
+
+      if (page === 1) {
+        totalCounts.value = response.data.counts;
+        householdHealth.value = response.data.household_health;
+      }
 
-      const newChores = response.data.map(chore => ({
+      nextChoresCursor.value = response.data.next_cursor;
+      const newChores = response.data.items.map(chore => ({
         ...chore,
         disabled: isChoreDisabledToday(chore)
       }));
@@ -148,7 +158,7 @@ export const useChoreStore = defineStore('chores', () => {
       }
 
       // Check if there are more chores to load
-      if (newChores.length < pageSize.value) {
+      if (!nextChoresCursor.value) {
         hasMoreChores.value = false;
       }
 
@@ -172,15 +182,16 @@ export const useChoreStore = defineStore('chores', () => {
     loading.value = true;
     error.value = null;
     try {
-      // Fetch archived chores with pagination
+      // Fetch archived chores with keyset pagination (empty cursor = first page)
       const archivedResponse = await api.get('/chores/archived', {
         params: {
-          page,
+          cursor: page === 1 ? '' : nextArchivedCursor.value,
           limit: pageSize.value
         }
       });
 
-      const newArchivedChores = archivedResponse.data.map(chore => ({
+      nextArchivedCursor.value = archivedResponse.data.next_cursor;
+      const newArchivedChores = archivedResponse.data.items.map(chore => ({
         ...chore,
         disabled: isChoreDisabledToday(chore)
       }));
@@ -196,7 +207,7 @@ export const useChoreStore = defineStore('chores', () => {
       }
 
       // Check if there are more archived chores to load
-      if (newArchivedChores.length < pageSize.value) {
+      if (!nextArchivedCursor.value) {
         hasMoreArchivedChores.value = false;
       }
 
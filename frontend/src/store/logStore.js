@@ -83,8 +83,9 @@ export const useLogStore = defineStore('logs', () => {
     loading.value = true;
     error.value = null;
     try {
-      const { data } = await api.get('/logs');
-      logEntries.value = (data || []).map(normalizeEntry).slice(0, MAX_ENTRIES);
+      // Only the newest page is needed; the server pages by (done_at, id)
+      const { data } = await api.get('/logs', { params: { cursor: '', limit: MAX_ENTRIES } });
+      logEntries.value = (data?.items || []).map(normalizeEntry).slice(0, MAX_ENTRIES);
     } catch (err) {
       console.error('Error fetching logs from server:', err);
       error.value = 'Unable to load activity logs right now.';